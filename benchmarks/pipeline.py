@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the app's own overhead around inference.
+
+Stub ``whisper-cli``, ``ffprobe`` and ``ffmpeg`` executables stand in for
+whisper.cpp and FFmpeg: they write realistic model-loading noise,
+``progress =`` lines, timestamped segments at a configurable rate and
+the ``-oj`` JSON file, so what is measured is the queue, stdout
+filtering, stderr progress parsing, ``GLib.idle_add`` traffic and
+transcript saving.  The real
+``_start_transcription`` / ``_worker`` run on a headless host object
+with a GLib main loop; widgets are cheap stand-ins (no display needed),
+queue entries are the app's own.
+
+    python3 benchmarks/pipeline.py [--files 50] [--segments 300] [--rate 0]
+                                   [--jobs 1] [--flush segment] [--json]
+
+Reports files/s, segment lines/s, main-loop callbacks per file (and how
+many UI updates they carried), CPU seconds of the app process per file,
+memory per queued file (RSS growth while the queue is built – use a few
+thousand ``--files`` for a steady figure) and peak RSS.  ``--json`` prints one line to keep between releases.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import gi  # noqa: E402
+gi.require_version('Gtk', '4.0')
+from gi.repository import GLib  # noqa: E402
+
+from audio_to_text_transcriber import transcribe, ui  # noqa: E402
+from audio_to_text_transcriber.filequeue import FileQueue  # noqa: E402
+from audio_to_text_transcriber.governor import rss_mb  # noqa: E402
+from audio_to_text_transcriber.journal import JobJournal  # noqa: E402
+from audio_to_text_transcriber.probe import MediaProber  # noqa: E402
+from audio_to_text_transcriber.speed import SpeedModel  # noqa: E402
+from audio_to_text_transcriber.transcript_index import TranscriptIndex  # noqa: E402
+from audio_to_text_transcriber.updates import UiUpdates  # noqa: E402
+
+WHISPER_CLI = r"""
+import json, os, sys, time
+a = sys.argv
+path = a[a.index("-f") + 1]
+segments = int(os.environ["BENCH_SEGMENTS"])
+rate = float(os.environ["BENCH_RATE"])          # segments per second, 0 = flat out
+no_ts = "-nt" in a
+found = []
+out, err = sys.stdout, sys.stderr
+for i in range(40):
+    err.write(f"whisper_model_load: layer {i:2d} loaded, buffer size = {i * 3.1:7.2f} MB\n")
+err.write("system_info: n_threads = 4 / 8 | AVX = 1 | AVX2 = 1 | FMA = 1 |\n")
+out.write(f"main: processing '{path}' (960000 samples, 60.0 sec), 4 threads, 1 processors, lang = en, task = transcribe, timestamps = {int(not no_ts)} ...\n\n")
+out.flush()
+step = max(1, segments // 20)
+for i in range(segments):
+    s = i * 2
+    text = " the quick brown fox jumps over the lazy dog and keeps on running"
+    if no_ts:
+        out.write(text + "\n")
+    else:
+        out.write(f"[{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}.000 --> "
+                  f"{(s + 2) // 3600:02d}:{(s + 2) // 60 % 60:02d}:{(s + 2) % 60:02d}.000]  {text}\n")
+    if i % step == 0:
+        err.write(f"whisper_print_progress_callback: progress = {i * 100 // segments:3d}%\n")
+        err.flush()
+    out.flush()
+    found.append({"offsets": {"from": s * 1000, "to": (s + 2) * 1000}, "text": text})
+    if rate:
+        time.sleep(1 / rate)
+if "-oj" in a:
+    with open(a[a.index("-of") + 1] + ".json", "w") as f:
+        json.dump({"result": {"language": "en"}, "transcription": found}, f)
+err.write("whisper_print_progress_callback: progress = 100%\n")
+err.write("\nwhisper_print_timings:     load time =   120.00 ms\n")
+err.write("whisper_print_timings:    total time =  1234.56 ms\n")
+"""
+
+FFPROBE = r"""
+import json, os, sys
+print(json.dumps({"streams": [{"codec_name": "mp3", "channels": 2, "sample_rate": "44100"}],
+                  "format": {"duration": os.environ["BENCH_DURATION"]}}))
+"""
+
+FFMPEG = r"""
+import sys
+with open(sys.argv[-1], "wb") as f:
+    f.write(b"RIFF" + bytes(40))
+"""
+
+
+class _Widget:
+    """Accepts any widget call; counts them."""
+    calls = 0
+
+    def __getattr__(self, name):
+        def _call(*args, **kwargs):
+            _Widget.calls += 1
+        return _call
+
+
+def _write_stub(bin_dir, name, body):
+    path = os.path.join(bin_dir, name)
+    with open(path, "w") as f:
+        f.write(f"#!{sys.executable}\n{body}")
+    os.chmod(path, 0o755)
+    return path
+
+
+def _host(tmp, args):
+    """An object with the transcribe/ui methods bound, like WhisperApp."""
+    app = types.SimpleNamespace()
+    for mod in (ui, transcribe):
+        for name, fn in vars(mod).items():
+            if isinstance(fn, types.FunctionType) and fn.__code__.co_varnames[:1] == ("self",):
+                setattr(app, name, fn.__get__(app))
+
+    app.add_transcript_to_list = lambda filename, path: None
+    app._unlock_settings_now = lambda: setattr(app, 'is_transcribing', False)
+    app._error = lambda msg: app.errors.append(msg)
+    app.lookup_action = lambda name: None
+    app._update_model_btn = lambda: True
+
+    app.errors = []
+    app.bin_path = os.path.join(tmp, "bin", "whisper-cli")
+    app.server_bin_path = None
+    app.engine = "cli"
+    app.ts_enabled = not args.no_timestamps
+    app.parallel_jobs = args.jobs
+    app.prefetch_files = args.prefetch
+    app.queue_order = "listed"
+    app.chunking_enabled = False
+    app.flush_policy = args.flush
+    app.cache_enabled = False
+    app.tuning = {}
+    app.is_tuning = False
+    app.cancel_flag = False
+    app.current_procs, app._procs_lock = set(), threading.Lock()
+    app._progress_lock = threading.Lock()
+    app._servers, app._chunk_jobs, app._prefetch = {}, {}, None
+    app._pending, app._batch, app._started, app._added_secs = None, {}, set(), 0.0
+    app._processors = 1
+    app.settings_dialog = None
+    for name in ("trans_btn", "reset_btn", "add_more_button", "status_lbl", "progress_lbl"):
+        setattr(app, name, _Widget())
+    app.journal = JobJournal(os.path.join(tmp, "data", "Jobs.sqlite3"))
+    app.media = MediaProber(os.path.join(tmp, "data", "Media.sqlite3"))
+    app.speed = SpeedModel(os.path.join(tmp, "data", "Speed.sqlite3"))
+    app.transcript_cache = None
+    app.transcript_index = TranscriptIndex(os.path.join(tmp, "data", "Search.sqlite3"))
+    app.ui_updates = UiUpdates(app.add_log_text, app.update_file_status, app.set_file_subtitle,
+                               lambda markup: app.progress_lbl.set_markup(markup))
+    return app
+
+
+def run(args) -> dict:
+    tmp = tempfile.mkdtemp(prefix="audio-to-text-bench-")
+    try:
+        bin_dir = os.path.join(tmp, "bin")
+        os.makedirs(bin_dir)
+        os.makedirs(os.path.join(tmp, "audio"))
+        os.makedirs(os.path.join(tmp, "out"))
+        _write_stub(bin_dir, "whisper-cli", WHISPER_CLI)
+        _write_stub(bin_dir, "ffprobe", FFPROBE)
+        _write_stub(bin_dir, "ffmpeg", FFMPEG)
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+        os.environ.update(BENCH_SEGMENTS=str(args.segments), BENCH_RATE=str(args.rate),
+                          BENCH_DURATION=str(args.segments * 2.0))
+
+        files = []
+        for n in range(args.files):
+            path = os.path.join(tmp, "audio", f"clip{n:05d}.mp3")
+            with open(path, "wb") as f:
+                f.write(os.urandom(1024))
+            files.append(path)
+
+        app = _host(tmp, args)
+        rss0 = rss_mb(os.getpid())
+        app.progress_items = FileQueue()
+        app.progress_items.extend(app._new_file_data(p) for p in files)
+        queue_kib = (rss_mb(os.getpid()) - rss0) * 1024 / max(1, args.files)
+        # every row bound, as if the whole queue were on screen
+        for fd in app.progress_items:
+            fd['widgets'] = {name: _Widget() for name in
+                             ('row', 'info_lbl', 'spinner', 'icon', 'urgent_btn')}
+        app.journal.add(files)
+        app.media.probe_async(files)
+
+        loop = GLib.MainLoop()
+        callbacks = [0]
+        real_idle_add, real_timeout_add = GLib.idle_add, GLib.timeout_add
+
+        def counting_idle_add(fn, *a, **kw):
+            callbacks[0] += 1
+            return real_idle_add(fn, *a, **kw)
+
+        def counting_timeout_add(ms, fn, *a, **kw):
+            callbacks[0] += 1
+            return real_timeout_add(ms, fn, *a, **kw)
+
+        worker = app._worker
+
+        def _worker_then_quit(*a):
+            worker(*a)
+            real_idle_add(loop.quit)          # after everything the worker queued
+
+        app._worker = _worker_then_quit
+        GLib.idle_add, GLib.timeout_add = counting_idle_add, counting_timeout_add
+        cpu0, t0 = time.process_time(), time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):   # the app's own console output
+                app._start_transcription(files, "bench-model.bin",
+                                         os.path.join(tmp, "out"), "bench")
+                loop.run()
+        finally:
+            GLib.idle_add, GLib.timeout_add = real_idle_add, real_timeout_add
+        wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+
+        posted, _ = app.ui_updates.take_stats()
+        done = sum(1 for fd in app.progress_items if fd['status'] == 'completed')
+        app.media.close()
+        app.speed.close()
+        app.journal.close()
+        app.transcript_index.close()
+        return {
+            "files": args.files,
+            "completed": done,
+            "segments_per_file": args.segments,
+            "jobs": args.jobs,
+            "flush": args.flush,
+            "wall_secs": round(wall, 3),
+            "files_per_sec": round(done / wall, 2),
+            "lines_per_sec": round(done * args.segments / wall, 1),
+            "callbacks_per_file": round(callbacks[0] / max(1, args.files), 1),
+            "ui_updates_per_file": round(posted / max(1, args.files), 1),
+            "widget_calls_per_file": round(_Widget.calls / max(1, args.files), 1),
+            "app_cpu_ms_per_file": round(cpu * 1000 / max(1, args.files), 2),
+            "queue_kib_per_file": round(queue_kib, 2),
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+            "errors": app.errors[:5],
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--files", type=int, default=50)
+    ap.add_argument("--segments", type=int, default=300, help="segment lines per file")
+    ap.add_argument("--rate", type=float, default=0,
+                    help="segments per second from each stub run (0 = as fast as possible)")
+    ap.add_argument("--jobs", type=int, default=1)
+    ap.add_argument("--flush", choices=("segment", "interval", "end"), default="segment")
+    ap.add_argument("--prefetch", type=int, default=0, help="decode-ahead files")
+    ap.add_argument("--no-timestamps", action="store_true")
+    ap.add_argument("--json", action="store_true", help="one JSON line instead of a table")
+    args = ap.parse_args()
+
+    res = run(args)
+    if args.json:
+        print(json.dumps(res))
+        return
+    print(f"{res['completed']}/{res['files']} files × {args.segments} segments, "
+          f"{args.jobs} job(s), flush={args.flush}")
+    for key in ("wall_secs", "files_per_sec", "lines_per_sec", "callbacks_per_file",
+                "ui_updates_per_file", "widget_calls_per_file", "app_cpu_ms_per_file", "queue_kib_per_file", "peak_rss_mb",
+                "peak_child_rss_mb"):
+        print(f"  {key:<22} {res[key]:>10}")
+    for err in res["errors"]:
+        print(f"  error: {err}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time from launch to the first painted frame.
+
+Starts the app with ``--startup-time`` (it prints its own phase timings
+as JSON after the first frame and quits) several times and reports the
+median of each phase plus the wall time from spawn, which also counts
+interpreter start-up.  Needs a display (use ``xvfb-run`` on CI).
+
+    python3 benchmarks/startup_time.py [--runs 5] [--max-ms 1500]
+
+With ``--max-ms`` the exit status is 1 when the median first frame is
+slower, so the script can guard against start-up regressions.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def run_once():
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-m", "audio_to_text_transcriber.main", "--startup-time"],
+        env=env, capture_output=True, text=True, timeout=60,
+    )
+    wall = (time.perf_counter() - t0) * 1000
+    for line in out.stdout.splitlines():
+        if line.startswith("{"):
+            phases = json.loads(line)
+            phases["spawn_to_exit_ms"] = round(wall, 1)
+            return phases
+    raise RuntimeError(f"no timing line (exit {out.returncode}):\n{out.stderr[-2000:]}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--max-ms", type=float, default=None,
+                    help="fail when the median first frame is slower than this")
+    args = ap.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    print(f"{args.runs} cold starts (median / min)")
+    for key in runs[0]:
+        vals = [r[key] for r in runs]
+        print(f"  {key:<18} {statistics.median(vals):8.1f} ms  {min(vals):8.1f} ms")
+
+    first = statistics.median(r["first_frame_ms"] for r in runs)
+    if args.max_ms is not None and first > args.max_ms:
+        print(f"  first frame {first:.1f} ms > {args.max_ms:.1f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: GUI-process CPU spent reading one whisper-cli run.
+
+Compares the old reader (stderr read one character at a time in an extra
+thread, stdout iterated line by line, regex on every stderr line) with
+``streams.ProcessReader``.  A tiny Python child stands in for whisper-cli
+and writes progress to stderr and segments to stdout as fast as it can.
+
+    python3 benchmarks/stream_reader.py [--files 20] [--segments 2000]
+"""
+import argparse
+import os
+import re
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from audio_to_text_transcriber.streams import ProcessReader, keep_line  # noqa: E402
+
+CHILD = r"""
+import sys
+n = int(sys.argv[1])
+out, err = sys.stdout, sys.stderr
+out.write("whisper_init_from_file_with_params_no_state: loading model\n")
+for i in range(n):
+    s = i * 2
+    out.write(f"[00:{s // 60 % 60:02d}:{s % 60:02d}.000 --> 00:{(s + 2) // 60 % 60:02d}:{(s + 2) % 60:02d}.000]"
+              "   the quick brown fox jumps over the lazy dog again and again\n")
+    err.write(f"whisper_print_progress_callback: progress = {i * 100 // n:3d}%\r")
+    err.write("whisper_full_with_state: decoder stats and some other log noise here\n")
+out.write("whisper_print_timings:     total time = 1234.56 ms\n")
+"""
+
+
+def _spawn(segments, binary):
+    return subprocess.Popen(
+        [sys.executable, "-c", CHILD, str(segments)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        **({"bufsize": 0} if binary else {"text": True, "bufsize": 1, "errors": "replace"}),
+    )
+
+
+def legacy(segments):
+    """The reader that shipped before streams.py (minus the GLib calls)."""
+    proc = _spawn(segments, binary=False)
+    pct_re = re.compile(r"progress\s*=\s*([\d.]+)%")
+
+    def _watch_stderr():
+        buf = ""
+        while True:
+            ch = proc.stderr.read(1)
+            if not ch:
+                pct_re.search(buf)
+                break
+            if ch in ("\r", "\n"):
+                pct_re.search(buf)
+                buf = ""
+            else:
+                buf += ch
+
+    t = threading.Thread(target=_watch_stderr, daemon=True)
+    t.start()
+    kept = sum(1 for line in proc.stdout if keep_line(line, True))
+    proc.wait()
+    t.join()
+    return kept
+
+
+def multiplexed(segments):
+    proc = _spawn(segments, binary=True)
+    reader = ProcessReader(proc, timestamps=True)
+    kept = sum(1 for kind, _ in reader.events() if kind == "segment")
+    proc.wait()
+    return kept
+
+
+def _cpu():
+    # children are excluded: only the GUI-side reading cost is measured
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    return ru.ru_utime + ru.ru_stime
+
+
+def bench(fn, files, segments):
+    cpu0, wall0 = _cpu(), time.perf_counter()
+    for _ in range(files):
+        kept = fn(segments)
+        assert kept == segments, (fn.__name__, kept)
+    return (_cpu() - cpu0) / files, (time.perf_counter() - wall0) / files
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--files", type=int, default=20)
+    ap.add_argument("--segments", type=int, default=2000)
+    args = ap.parse_args()
+
+    print(f"{args.files} files × {args.segments} segments")
+    results = {}
+    for fn in (legacy, multiplexed):
+        cpu, wall = bench(fn, args.files, args.segments)
+        results[fn.__name__] = cpu
+        print(f"  {fn.__name__:<12} {cpu * 1000:8.2f} ms CPU/file  {wall * 1000:8.2f} ms wall/file")
+    if results["multiplexed"]:
+        print(f"  speed-up     {results['legacy'] / results['multiplexed']:8.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# autotune.py
+"""
+Per-machine tuning of whisper's ``-t`` (threads) and ``-p`` (processors).
+
+whisper.cpp's defaults (4 threads, 1 processor) fit no machine in
+particular.  ``tune`` runs a short reference clip through whisper-cli
+once per candidate layout – as many copies at the same time as there
+are parallel jobs, because that is how a batch runs – and keeps the
+layout with the highest throughput in audio seconds per wall second.
+"""
+import os
+import subprocess
+import time
+
+CLIP_SECS = 60              # reference clip cut from a queued file
+GIVE_UP = 1.5               # stop a trial once it is this much slower than the best
+
+
+def candidates(cores: int, jobs: int = 1) -> list[tuple[int, int]]:
+    """
+    ``(threads, processors)`` layouts worth trying for one of *jobs*
+    parallel runs: powers of two within the per-job share of the cores,
+    using at least half of that share.  Most promising first.
+    """
+    budget = max(1, cores // max(1, jobs))
+    threads = {t for t in (1, 2, 4, 8, 16, 32, 64) if t <= budget} | {budget}
+    layouts = [(t, p) for t in threads for p in (1, 2, 4)
+               if t * p <= budget and 2 * t * p >= budget]
+    return sorted(layouts, key=lambda tp: (-tp[0] * tp[1], tp[1]))
+
+
+def make_clip(src: str, dest: str, secs: int = CLIP_SECS) -> float:
+    """
+    Cut the first *secs* of *src* into 16 kHz mono WAV at *dest*.
+    Returns the clip length in seconds, 0.0 on failure.
+    """
+    try:
+        rc = subprocess.run(
+            ["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", src, "-t", str(secs),
+             "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le", dest],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=300,
+        ).returncode
+    except (OSError, subprocess.SubprocessError):
+        return 0.0
+    if rc != 0 or not os.path.isfile(dest):
+        return 0.0
+    return max(0.0, (os.path.getsize(dest) - 44) / 32000)   # 16 kHz s16le
+
+
+def run_trial(bin_path, model_path, wav, threads, processors, copies=1,
+              limit=None, cancelled=None) -> float | None:
+    """
+    Wall seconds for *copies* simultaneous whisper-cli runs on *wav*.
+    None when a run fails, is cancelled or takes longer than *limit*.
+    """
+    cmd = [bin_path, "-m", model_path, "-f", wav, "-nt", "-np",
+           "-t", str(threads), "-p", str(processors)]
+    start = time.monotonic()
+    try:
+        procs = [subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                 for _ in range(copies)]
+    except OSError:
+        return None
+    try:
+        while any(p.poll() is None for p in procs):
+            if (cancelled and cancelled()) or (limit and time.monotonic() - start > limit):
+                return None
+            time.sleep(0.05)
+        if any(p.returncode != 0 for p in procs):
+            return None
+        return time.monotonic() - start
+    finally:
+        for p in procs:
+            if p.poll() is None:
+                p.kill()
+                p.wait()
+
+
+def tune(bin_path, model_path, wav, clip_secs, jobs=1, cores=None,
+         on_trial=None, cancelled=None) -> dict | None:
+    """
+    Try every candidate layout on *wav* and return the best as
+    ``{'jobs', 'threads', 'processors', 'rate'}`` (rate = audio seconds per
+    wall second for one job), or None if nothing ran.  *on_trial(n, total,
+    threads, processors, rate)* is called after each trial, rate None for
+    failed or abandoned ones.
+    """
+    layouts = candidates(cores or os.cpu_count() or 1, jobs)
+    best, best_wall = None, None
+    for n, (threads, processors) in enumerate(layouts, 1):
+        if cancelled and cancelled():
+            return None
+        wall = run_trial(bin_path, model_path, wav, threads, processors, jobs,
+                         best_wall * GIVE_UP if best_wall else None, cancelled)
+        rate = clip_secs / wall if wall else None
+        if wall and (best_wall is None or wall < best_wall):
+            best_wall = wall
+            best = {"jobs": jobs, "threads": threads, "processors": processors,
+                    "rate": round(rate, 2)}
+        if on_trial:
+            on_trial(n, len(layouts), threads, processors, rate)
+    return best
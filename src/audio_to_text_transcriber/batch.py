@@ -0,0 +1,439 @@
+# batch.py
+"""
+Headless batch transcription – no GTK, no display.
+
+    audio-to-text-transcriber-batch [options] PATH... [--manifest FILE]
+
+PATHs are audio files or folders (searched recursively); a manifest is a
+JSONL (``{"path": ...}`` or a JSON string per line) or CSV file (a
+``path`` column, else the first column), read as a stream so it can list
+any number of files.  Models, transcript names, the transcript cache and
+the whisper-cli output filtering are the same as in the app, and the
+defaults come from its Settings.yaml.
+
+Progress goes to stdout as one JSON object per line (``--progress text``
+for people).  ``--plan`` only measures the inputs and prints how long the
+run is expected to take, from the speed learned on earlier runs.  Exit status: 0 all transcribed or skipped, 1 some files
+failed, 2 bad arguments, 3 whisper-cli / model / output folder missing,
+130 interrupted.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import sys
+import threading
+import time
+
+import yaml
+
+from .cache import TranscriptCache
+from .chunking import strip_timestamps
+from .helpers import (AUDIO_EXTS, default_data_dir, find_cli_bin, model_file,
+                      transcript_dest, whisper_layout)
+from .priority import command_prefix, usable_cpus
+from .probe import MediaProber
+from .segments import json_args, read_json, render
+from .speed import SpeedModel, plan
+from .streams import ProcessReader, SEGMENT
+from .transcript_writer import TranscriptWriter
+
+EXIT_OK, EXIT_FAILED, EXIT_USAGE, EXIT_SETUP, EXIT_INTERRUPTED = 0, 1, 2, 3, 130
+
+
+# ── inputs: files, folders and manifests, all lazily ────────────────────────
+def _walk(folder):
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for f in sorted(files):
+            if f.lower().endswith(AUDIO_EXTS):
+                yield os.path.join(root, f)
+
+
+def _manifest_paths(fh, fmt):
+    if fmt == "csv":
+        rows = csv.reader(fh)
+        header = next(rows, None)
+        if header is None:
+            return
+        names = [h.strip().lower() for h in header]
+        col = names.index("path") if "path" in names else 0
+        if "path" not in names and header:
+            yield header[0]                  # no header row – first row is data
+        for row in rows:
+            if len(row) > col:
+                yield row[col]
+        return
+    for line in fh:
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] in '{"':
+            rec = json.loads(line)
+            yield rec if isinstance(rec, str) else rec.get("path") or ""
+        else:
+            yield line                       # plain path per line
+
+
+def iter_inputs(paths, manifests):
+    """Yield every audio path once, in the order given."""
+    seen = set()
+
+    def _new(path):
+        path = os.path.abspath(os.path.expanduser(path))
+        if path in seen:
+            return None
+        seen.add(path)
+        return path
+
+    for p in paths:
+        if os.path.isdir(p):
+            for f in _walk(p):
+                if (f := _new(f)):
+                    yield f
+        elif (p := _new(p)):
+            yield p
+    for m in manifests:
+        fmt = "csv" if m.lower().endswith(".csv") else "jsonl"
+        fh = (io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8") if m == "-"
+              else open(m, encoding="utf-8", newline=""))
+        with fh:
+            for p in _manifest_paths(fh, fmt):
+                if p and (p := _new(p)):
+                    yield p
+
+
+# ── progress output ─────────────────────────────────────────────────────────
+class Reporter:
+    """Thread-safe progress printer: JSON lines, short text, or nothing."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self._lock = threading.Lock()
+
+    def __call__(self, event, **fields):
+        if self.mode == "none":
+            return
+        with self._lock:
+            if self.mode == "jsonl":
+                sys.stdout.write(json.dumps({"event": event, **fields}) + "\n")
+                sys.stdout.flush()
+            elif event in ("done", "summary", "error"):
+                sys.stderr.write(self._text(event, fields) + "\n")
+
+    @staticmethod
+    def _text(event, f):
+        if event == "done":
+            extra = f" – {f['error']}" if f.get("error") else ""
+            return f"[{f['n']}] {f['status']}: {f['path']}{extra}"
+        if event == "summary":
+            return ("{completed} completed, {cached} from cache, {skipped} skipped, "
+                    "{failed} failed in {elapsed:.1f}s").format(**f)
+        return f"error: {f.get('message')}"
+
+
+# ── the runner ──────────────────────────────────────────────────────────────
+class BatchRunner:
+    def __init__(self, bin_path, model_path, core, out_dir, jobs, threads,
+                 timestamps, overwrite, flush_policy, cache, report,
+                 media=None, speed=None, processors=1, launch=()):
+        self.bin_path = bin_path
+        self.model_path = model_path
+        self.core = core
+        self.out_dir = out_dir
+        self.jobs = jobs
+        self.threads = threads
+        self.timestamps = timestamps
+        self.overwrite = overwrite
+        self.flush_policy = flush_policy
+        self.cache = cache
+        self.report = report
+        self.media = media
+        self.speed = speed
+        self.processors = processors
+        self.launch = list(launch)                      # nice / ionice / taskset
+        self.flags = [] if timestamps else ["-nt"]      # cache key, as in the app
+        self.cancel = threading.Event()
+        self.counts = dict.fromkeys(("completed", "cached", "skipped", "failed"), 0)
+        self._lock = threading.Lock()
+        self._procs = set()
+
+    def run(self, paths) -> int:
+        start = time.monotonic()
+        pending = queue.Queue(maxsize=self.jobs * 4)     # bounded: manifests stream
+        pool = [threading.Thread(target=self._worker_loop, args=(pending,), daemon=True)
+                for _ in range(self.jobs)]
+        for t in pool:
+            t.start()
+        try:
+            for n, path in enumerate(paths, 1):
+                self._put(pending, (n, path))
+                if self.cancel.is_set():
+                    break
+            for _ in pool:
+                self._put(pending, None)
+            for t in pool:
+                while t.is_alive():
+                    t.join(0.2)
+        except KeyboardInterrupt:
+            self.cancel.set()
+            self._stop_procs()
+            for t in pool:
+                t.join(2)
+        except (OSError, ValueError, csv.Error) as e:     # unreadable manifest
+            self.cancel.set()
+            self._stop_procs()
+            self.report("error", message=str(e))
+            return EXIT_USAGE
+
+        self.report("summary", elapsed=round(time.monotonic() - start, 3),
+                    cancelled=self.cancel.is_set(), **self.counts)
+        if self.cancel.is_set():
+            return EXIT_INTERRUPTED
+        return EXIT_FAILED if self.counts["failed"] else EXIT_OK
+
+    def _put(self, pending, item):
+        while True:
+            try:
+                pending.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                if self.cancel.is_set() and item is not None:
+                    return
+
+    def _worker_loop(self, pending):
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            if self.cancel.is_set():
+                continue
+            n, path = item
+            status, fields = self._transcribe(n, path)
+            with self._lock:
+                self.counts[status] += 1
+            self.report("done", n=n, path=path, status=status, **fields)
+
+    def _transcribe(self, n, path):
+        """One file; returns ``(status, extra fields)`` for the done event."""
+        if not os.path.isfile(path):
+            return "failed", {"error": "no such file"}
+        dest = transcript_dest(self.out_dir, path)
+        if not self.overwrite and os.path.isfile(dest) and os.path.getsize(dest) > 0:
+            return "skipped", {"output": dest}
+
+        key = None
+        if self.cache:
+            try:
+                key = self.cache.key(path, self.core, self.flags)
+                if self.cache.restore(key, dest):
+                    return "cached", {"output": dest}
+            except OSError:
+                key = None
+
+        self.report("start", n=n, path=path)
+        try:
+            writer = TranscriptWriter(dest, self.flush_policy)
+        except OSError as e:
+            return "failed", {"error": str(e)}
+        started = time.monotonic()
+        returncode, err_msg, lines = self._run_cli(n, path, writer.write)
+        if self.cancel.is_set() or returncode != 0:
+            writer.abort()
+            return "failed", {"error": err_msg or f"whisper-cli exited with code {returncode}",
+                              "returncode": returncode}
+        try:
+            writer.replace(lines)                    # live lines were a crash backup
+            writer.commit()
+        except OSError as e:
+            writer.abort()
+            return "failed", {"error": str(e)}
+        if key and writer.lines:
+            try:
+                self.cache.store(key, dest)
+            except OSError:
+                pass
+        if self.speed and self.media:
+            self.speed.record(self.core, self.threads, self.media.duration(path),
+                              time.monotonic() - started)
+        return "completed", {"output": dest, "lines": writer.lines}
+
+    def _run_cli(self, n, path, on_line):
+        """
+        Same command line as the app's ``_run_cli``: the transcript comes
+        from whisper-cli's JSON file, stdout lines only go to *on_line*.
+        Returns ``(returncode, error message, lines)``.
+        """
+        tmpdir = tempfile.mkdtemp(prefix="audio-to-text-json-")
+        try:
+            return self._run_cli_in(n, path, on_line, os.path.join(tmpdir, "out"))
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def _run_cli_in(self, n, path, on_line, prefix):
+        cmd = [*self.launch, self.bin_path, "-m", self.model_path, "-f", path, "-pp",
+               *json_args(prefix)]
+        if self.threads:
+            cmd += ["-t", str(self.threads)]
+        if self.processors > 1:
+            cmd += ["-p", str(self.processors)]
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, bufsize=0)
+        except OSError as e:
+            return 1, str(e), []
+        with self._lock:
+            self._procs.add(proc)
+
+        reader = ProcessReader(proc, True)
+        for kind, value in reader.events(cancelled=self.cancel.is_set):
+            if kind == SEGMENT:
+                on_line(value if self.timestamps else strip_timestamps(value))
+            else:                                    # PROGRESS
+                self.report("progress", n=n, path=path, pct=value)
+        if self.cancel.is_set() and proc.poll() is None:
+            proc.terminate()
+        proc.stdout.close()
+        proc.stderr.close()
+        proc.wait()
+        with self._lock:
+            self._procs.discard(proc)
+        if proc.returncode != 0:
+            return proc.returncode, reader.error_text(), []
+        if self.cancel.is_set():
+            return proc.returncode, "", []
+        try:
+            return 0, "", render(read_json(prefix + ".json"), self.timestamps)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return 1, f"cannot read whisper-cli's JSON output: {e}", []
+
+    def _stop_procs(self):
+        with self._lock:
+            procs = list(self._procs)
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+
+
+# ── entry point ─────────────────────────────────────────────────────────────
+def _app_settings(data_dir):
+    """The GUI's Settings.yaml, so both front ends share their defaults."""
+    try:
+        with open(os.path.join(data_dir, "Settings.yaml")) as f:
+            return yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError):
+        return {}
+
+
+def _parser(settings):
+    ap = argparse.ArgumentParser(
+        prog="audio-to-text-transcriber-batch",
+        description="Transcribe audio files with whisper.cpp without the GUI.",
+    )
+    ap.add_argument("paths", nargs="*", metavar="PATH",
+                    help="audio file or folder (searched recursively)")
+    ap.add_argument("--manifest", action="append", default=[], metavar="FILE",
+                    help="JSONL or CSV list of paths ('-' = stdin); repeatable")
+    ap.add_argument("-m", "--model", default=settings.get("model") or None,
+                    help="model name (e.g. base.en) or path to a ggml .bin file")
+    ap.add_argument("-o", "--output", default=settings.get("output_directory")
+                    or os.path.expanduser("~/Downloads"), help="transcript folder")
+    ap.add_argument("-j", "--jobs", type=int, default=int(settings.get("parallel_jobs", 1)),
+                    help="files transcribed at the same time")
+    ap.add_argument("-t", "--threads", type=int, default=None,
+                    help="threads per whisper-cli (default: the app's speed tuning, "
+                         "else cores / jobs)")
+    ts = ap.add_mutually_exclusive_group()
+    ts.add_argument("--timestamps", dest="timestamps", action="store_true",
+                    default=settings.get("include_timestamps", True))
+    ts.add_argument("--no-timestamps", dest="timestamps", action="store_false")
+    ap.add_argument("--overwrite", action="store_true",
+                    help="redo files that already have a transcript (default: skip)")
+    ap.add_argument("--no-cache", action="store_true", help="don't use the transcript cache")
+    ap.add_argument("--progress", choices=("jsonl", "text", "none"), default="jsonl")
+    ap.add_argument("--plan", action="store_true",
+                    help="only print the expected run time as JSON, transcribe nothing")
+    return ap
+
+
+def main(argv=None) -> int:
+    data_dir = default_data_dir()
+    settings = _app_settings(data_dir)
+    ap = _parser(settings)
+    args = ap.parse_args(argv)
+    if not args.paths and not args.manifest:
+        ap.error("give at least one PATH or --manifest")
+    if args.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    report = Reporter(args.progress)
+
+    bin_path = find_cli_bin()
+    if not bin_path:
+        report("error", message="cannot find 'whisper-cli', run ./build.sh")
+        return EXIT_SETUP
+    if not args.model:
+        report("error", message="no model given and none selected in the app (--model)")
+        return EXIT_SETUP
+    if os.path.isfile(args.model):
+        model_path = args.model
+        core = os.path.basename(args.model).removeprefix("ggml-").removesuffix(".bin")
+    else:
+        core, model_path = args.model, model_file(os.path.join(data_dir, "models"), args.model)
+    if not os.path.isfile(model_path):
+        report("error", message=f"model not installed: {model_path}")
+        return EXIT_SETUP
+    if not os.path.isdir(args.output):
+        report("error", message=f"output folder does not exist: {args.output}")
+        return EXIT_SETUP
+
+    cache = None
+    if not args.no_cache and settings.get("transcript_cache", True):
+        cache = TranscriptCache(os.path.join(data_dir, "cache"),
+                                int(settings.get("transcript_cache_mb", 500)) * 1024 * 1024)
+
+    # the app's System Load settings, except the core kept for its UI
+    cpus = usable_cpus(str(settings.get("worker_cpus") or ""))
+    limited = len(cpus) < (os.cpu_count() or 1)
+    launch = command_prefix(int(settings.get("worker_nice", 0)),
+                            settings.get("worker_io_class", "normal"),
+                            cpus if limited else None)
+    threads, processors = whisper_layout(args.jobs, (settings.get("whisper_tuning") or {}).get(core),
+                                         len(cpus) if limited else None)
+    if args.threads:
+        threads, processors = args.threads, 1
+    media = MediaProber(os.path.join(data_dir, "Media.sqlite3"))
+    speed = SpeedModel(os.path.join(data_dir, "Speed.sqlite3"))
+    try:
+        if args.plan:
+            return _print_plan(iter_inputs(args.paths, args.manifest), media,
+                               speed.rate(core, threads), args.jobs, report)
+        runner = BatchRunner(bin_path, model_path, core, args.output, args.jobs, threads,
+                             args.timestamps, args.overwrite,
+                             settings.get("transcript_flush", "segment"), cache, report,
+                             media, speed, processors, launch)
+        return runner.run(iter_inputs(args.paths, args.manifest))
+    finally:
+        media.close()
+        speed.close()
+
+
+def _print_plan(paths, media, rate, jobs, report) -> int:
+    try:
+        paths = list(paths)
+    except (OSError, ValueError, csv.Error) as e:
+        report("error", message=str(e))
+        return EXIT_USAGE
+    media.probe_async(paths)                     # measure them all in parallel
+    est = plan((media.duration(p) for p in paths), rate, jobs)
+    print(json.dumps({"event": "plan", **est}))
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
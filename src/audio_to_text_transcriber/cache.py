@@ -0,0 +1,150 @@
+# cache.py
+"""
+Content-addressed transcript cache.
+
+Finished transcripts are stored under a key made of the BLAKE2 hash of
+the audio *content* plus the model core name and the whisper flags, so
+the same recording re-submitted under another name or folder is served
+from disk instead of being transcribed again.  The cache is bounded in
+size and evicts the least recently used entries first.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+READ_SIZE = 1 << 20
+HASH_MEMO = 50_000          # remembered (path, size, mtime) → digest pairs
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key       TEXT PRIMARY KEY,
+    size      INTEGER NOT NULL,
+    last_used REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class TranscriptCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"),
+                                   check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._hashes = {}                # (path, size, mtime_ns) → digest
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    # ── keys ─────────────────────────────────────────────────────
+    def content_hash(self, path: str) -> str:
+        st = os.stat(path)
+        memo = (path, st.st_size, st.st_mtime_ns)
+        digest = self._hashes.get(memo)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=20)
+            with open(path, "rb") as fh:
+                while chunk := fh.read(READ_SIZE):
+                    h.update(chunk)
+            if len(self._hashes) >= HASH_MEMO:
+                self._hashes.clear()
+            digest = self._hashes[memo] = h.hexdigest()
+        return digest
+
+    def key(self, audio_path: str, model: str, flags) -> str:
+        tag = f"{self.content_hash(audio_path)}|{model}|{' '.join(sorted(flags))}"
+        return hashlib.blake2b(tag.encode(), digest_size=20).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".txt")
+
+    # ── lookups ──────────────────────────────────────────────────
+    def restore(self, key: str, dest: str) -> bool:
+        """Copy the cached transcript for *key* to *dest*; counts hit/miss."""
+        src = self._file(key)
+        with self._lock:
+            known = self._db.execute(
+                "SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        if known and os.path.isfile(src):
+            tmp = dest + ".partial"
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+            with self._lock:
+                self._db.execute("UPDATE entries SET last_used = ? WHERE key = ?",
+                                 (time.time(), key))
+                self._bump("hits")
+            return True
+        with self._lock:
+            if known:                            # file vanished behind our back
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._bump("misses")
+        return False
+
+    def store(self, key: str, transcript: str) -> None:
+        dest = self._file(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = dest + ".tmp"
+        shutil.copyfile(transcript, tmp)
+        os.replace(tmp, dest)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, size, last_used) VALUES (?, ?, ?)",
+                (key, os.path.getsize(dest), time.time()))
+        self.evict()
+
+    # ── housekeeping ─────────────────────────────────────────────
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache fits."""
+        with self._lock:
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, size in self._db.execute(
+                    "SELECT key, size FROM entries ORDER BY last_used"):
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+            self._db.executemany("DELETE FROM entries WHERE key = ?",
+                                 ((k,) for k in victims))
+        for key in victims:
+            try:
+                os.remove(self._file(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = [k for (k,) in self._db.execute("SELECT key FROM entries")]
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("DELETE FROM counters")
+        for key in keys:
+            try:
+                os.remove(self._file(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            counters = dict(self._db.execute("SELECT name, value FROM counters"))
+        return {"entries": entries, "bytes": size,
+                "hits": counters.get("hits", 0), "misses": counters.get("misses", 0)}
+
+    def _bump(self, name: str) -> None:
+        # caller holds self._lock
+        self._db.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
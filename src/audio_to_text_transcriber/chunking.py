@@ -0,0 +1,139 @@
+# chunking.py
+"""
+Split long recordings at silences so the pieces can be transcribed in
+parallel, then stitch the per-chunk transcripts back onto one timeline.
+
+Neighbouring chunks overlap by a few seconds so words at a cut are heard
+whole by both sides; when stitching, every segment belongs to the chunk
+whose ``[keep_from, keep_to)`` window contains its start time.
+"""
+import re
+import subprocess
+from typing import NamedTuple
+
+from .helpers import whisper_ts, parse_whisper_ts
+
+SILENCE_DB  = -35          # dBFS below which audio counts as silence
+SILENCE_MIN = 0.5          # shortest gap (s) worth cutting at
+SEARCH      = 0.25         # look for a silence within ±25 % of the target cut
+
+_TS_LINE = re.compile(r"^\[(\d+:\d\d:\d\d\.\d{3}) --> (\d+:\d\d:\d\d\.\d{3})\]")
+_SIL_RE  = re.compile(r"silence_(start|end):\s*(-?[\d.]+)")
+
+
+class Chunk(NamedTuple):
+    start: float           # where ffmpeg starts cutting (includes overlap)
+    end: float             # where ffmpeg stops cutting (includes overlap)
+    keep_from: float       # this chunk owns segments starting in
+    keep_to: float         #   [keep_from, keep_to)
+
+    @property
+    def owned(self) -> float:
+        return min(self.keep_to, self.end) - self.keep_from
+
+
+def detect_silences(path: str, noise_db: int = SILENCE_DB,
+                    min_silence: float = SILENCE_MIN,
+                    duration: float = 0.0) -> list[tuple[float, float]]:
+    """
+    Return ``(start, end)`` of every silence ffmpeg's silencedetect finds.
+    Older ffmpeg never ends a silence that runs to the end of the file;
+    with *duration* known, such a silence ends there.
+    """
+    try:
+        proc = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-nostats", "-i", path,
+             "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+             "-f", "null", "-"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+        )
+    except OSError:
+        return []
+
+    silences, start = [], None
+    for kind, val in _SIL_RE.findall(proc.stderr):
+        if kind == "start":
+            start = max(0.0, float(val))
+        elif start is not None:
+            silences.append((start, float(val)))
+            start = None
+    if start is not None and duration > start:
+        silences.append((start, duration))
+    return silences
+
+
+def plan_chunks(duration: float, silences, chunk_secs: float,
+                overlap: float = 0.0) -> list[Chunk]:
+    """
+    Cut *duration* seconds into pieces of roughly *chunk_secs*, preferring
+    the middle of a nearby silence over a hard cut.  A tail shorter than
+    half a chunk is folded into the last piece.
+    """
+    if chunk_secs <= 0 or duration <= chunk_secs * 1.5:
+        return [Chunk(0.0, duration, 0.0, float("inf"))]
+
+    mids   = sorted((s + e) / 2 for s, e in silences)
+    window = chunk_secs * SEARCH
+    cuts   = [0.0]
+    while duration - cuts[-1] > chunk_secs * 1.5:
+        target = cuts[-1] + chunk_secs
+        near   = [m for m in mids if abs(m - target) <= window]
+        cuts.append(min(near, key=lambda m: abs(m - target)) if near else target)
+    cuts.append(duration)
+
+    chunks = []
+    for i in range(len(cuts) - 1):
+        last = i == len(cuts) - 2
+        chunks.append(Chunk(
+            start=max(0.0, cuts[i] - overlap),
+            end=min(duration, cuts[i + 1] + overlap),
+            keep_from=cuts[i],
+            keep_to=float("inf") if last else cuts[i + 1],
+        ))
+    return chunks
+
+
+def extract_chunk(path: str, chunk: Chunk, dest: str) -> None:
+    """Cut *chunk* out of *path* as 16 kHz mono WAV (whisper's native input)."""
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y",
+         "-ss", f"{chunk.start:.3f}", "-t", f"{chunk.end - chunk.start:.3f}",
+         "-i", path, "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le", dest],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+
+
+def strip_timestamps(line: str) -> str:
+    """``[a --> b]  text`` → `` text`` (what whisper-cli prints with -nt)."""
+    m = _TS_LINE.match(line)
+    if not m:
+        return line
+    rest = line[m.end():]
+    return rest[2:] if rest.startswith("  ") else rest
+
+
+def stitch(chunks: list[Chunk], outputs: list[list[str]],
+           timestamps: bool = True) -> list[str]:
+    """
+    Merge per-chunk transcript lines (timestamps relative to each chunk)
+    into one transcript on the original timeline, dropping the duplicate
+    segments that fall into another chunk's overlap.
+    """
+    merged = []
+    for chunk, lines in zip(chunks, outputs):
+        for line in lines:
+            m = _TS_LINE.match(line)
+            if not m:
+                continue
+            start = parse_whisper_ts(m.group(1)) + chunk.start
+            end   = parse_whisper_ts(m.group(2)) + chunk.start
+            if not (chunk.keep_from <= start + 0.001 and start < chunk.keep_to):
+                continue
+            shifted = f"[{whisper_ts(start)} --> {whisper_ts(end)}]{line[m.end():]}"
+            merged.append(shifted if timestamps else strip_timestamps(shifted))
+    return merged
@@ -0,0 +1,102 @@
+# filequeue.py
+"""
+The queue of audio files, as a path-indexed ``Gio.ListModel``.
+
+Each queued file is still the plain ``file_data`` dict the rest of the
+app passes around; ``FileQueue`` keeps them in order, finds one by path
+through a dict, and tells a ``Gtk.ListView`` what changed with a single
+``items-changed`` per add or remove.  The list view only builds widgets
+for the rows on screen and recycles them while scrolling, so a queue of
+tens of thousands of files costs one small dict per file, not one
+``Adw.ActionRow`` each.
+
+Iterating the queue yields the ``file_data`` dicts; ``in`` and ``get``
+take a path.  Adding and finding files is O(1); removing one is a C-level
+O(n) list operation (see ``FileQueue.remove``).
+"""
+from gi.repository import GObject, Gio
+
+
+class QueueEntry(GObject.Object):
+    """What the list model hands to the list view: one ``file_data``."""
+    __gtype_name__ = "AudioToTextQueueEntry"
+
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+
+
+class FileQueue(GObject.Object, Gio.ListModel):
+    __gtype_name__ = "AudioToTextFileQueue"
+
+    def __init__(self):
+        super().__init__()
+        self._entries = []              # QueueEntry, in queue order
+        self._by_path = {}              # path → QueueEntry
+
+    # ── Gio.ListModel ────────────────────────────────────────────
+    def do_get_item_type(self):
+        return QueueEntry.__gtype__
+
+    def do_get_n_items(self):
+        return len(self._entries)
+
+    def do_get_item(self, position):
+        return self._entries[position] if position < len(self._entries) else None
+
+    # ── file_data access ─────────────────────────────────────────
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __iter__(self):
+        return (entry.data for entry in list(self._entries))
+
+    def __contains__(self, path):
+        return path in self._by_path
+
+    def get(self, path):
+        """The ``file_data`` queued for *path*, or None."""
+        entry = self._by_path.get(path)
+        return entry.data if entry else None
+
+    def paths(self) -> list[str]:
+        return [entry.data['path'] for entry in self._entries]
+
+    # ── changes ──────────────────────────────────────────────────
+    def extend(self, items):
+        """Append ``file_data`` dicts whose path is not queued yet."""
+        start = len(self._entries)
+        for data in items:
+            if data['path'] not in self._by_path:
+                entry = QueueEntry(data)
+                self._by_path[data['path']] = entry
+                self._entries.append(entry)
+        if len(self._entries) > start:
+            self.items_changed(start, 0, len(self._entries) - start)
+
+    def remove(self, path):
+        """
+        Drop *path* from the queue.  Finding it is O(1), but taking it out
+        is O(n): the list has to close the gap whatever its position is
+        stored as, and ``items-changed`` needs that position.  Both steps
+        are one scan and one memmove in C – about a millisecond for 50k
+        files – and only happen when the user removes a single file, so
+        positions that stay valid across removals are not worth keeping.
+        ``clear`` empties the whole queue at once.
+        """
+        entry = self._by_path.pop(path, None)
+        if entry is None:
+            return
+        position = self._entries.index(entry)
+        del self._entries[position]
+        self.items_changed(position, 1, 0)
+
+    def clear(self):
+        removed = len(self._entries)
+        self._entries.clear()
+        self._by_path.clear()
+        if removed:
+            self.items_changed(0, removed, 0)
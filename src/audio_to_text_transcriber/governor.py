@@ -0,0 +1,134 @@
+# governor.py
+"""
+Memory-aware admission for the worker pool.
+
+Every whisper run holds the whole model plus its working buffers, so a
+large model with several parallel jobs can push a small machine into
+the OOM killer.  Before a slot starts a run it asks ``MemoryGovernor``,
+which compares ``MemAvailable`` from ``/proc/meminfo`` – minus memory
+already promised to runs that have not grown to their full size yet –
+with what one run needs, and holds the slot back while the kernel
+reports memory pressure (``/proc/pressure/memory``).  What one run needs
+starts as an estimate from the model file and is raised to the largest
+resident set seen on a running whisper process.
+
+One run is always admitted, so a batch can never stall; without
+``/proc`` (not Linux) every run is.
+"""
+import os
+import threading
+
+RESERVE_MB = 512            # left for the desktop and the app itself
+OVERHEAD   = 1.2            # weights in memory vs. on disk …
+BUFFERS_MB = 200            # … plus whisper's compute buffers
+PSI_SOME   = 10.0           # % of the last 10 s in which a task stalled on memory
+POLL_SECS  = 0.5
+
+
+def meminfo() -> dict[str, float]:
+    """``/proc/meminfo`` in MB; empty when it cannot be read."""
+    info = {}
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                fields = rest.split()
+                if fields:
+                    info[key] = int(fields[0]) / 1024
+    except (OSError, ValueError):
+        return {}
+    return info
+
+
+def pressure() -> float | None:
+    """``some avg10`` of ``/proc/pressure/memory``; None without PSI."""
+    try:
+        with open("/proc/pressure/memory") as f:
+            for line in f:
+                if line.startswith("some "):
+                    return float(line.split()[1].partition("=")[2])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def rss_mb(pid: int) -> float:
+    """Resident set of *pid* in MB, 0.0 once it has exited."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0.0
+
+
+def run_footprint_mb(model_path: str, fallback_mb: float = 0.0) -> float:
+    """Estimated memory of one whisper run of *model_path*."""
+    try:
+        size = os.path.getsize(model_path) / (1 << 20)
+    except OSError:
+        size = fallback_mb
+    return size * OVERHEAD + BUFFERS_MB
+
+
+class MemoryGovernor:
+    def __init__(self, need_mb: float, pids=None):
+        """
+        *need_mb* is the first estimate for one run; *pids()* lists the
+        whisper processes currently running (sampled for their RSS).
+        """
+        self.need_mb = need_mb
+        self._pids = pids or (lambda: ())
+        self._cond = threading.Condition()
+        self._admitted = {}             # slot → MB promised to its run
+
+    def check(self, need: float | None = None) -> str | None:
+        """None when one more run may start now, otherwise why not."""
+        info = meminfo()
+        if "MemAvailable" not in info:
+            return None
+        sizes = [rss_mb(pid) for pid in self._pids()]
+        if sizes:
+            self.need_mb = max(self.need_mb, max(sizes))
+        need = self.need_mb if need is None else need
+        # admitted runs still loading their model will take more than they hold now
+        promised = max(0.0, sum(self._admitted.values()) - sum(sizes))
+        free = info["MemAvailable"] - promised - RESERVE_MB
+        if need > free:
+            return f"{max(0, free):.0f} MB free, a job needs about {need:.0f} MB"
+        psi = pressure()
+        if psi is not None and psi > PSI_SOME:
+            return f"the system is short of memory ({psi:.0f}% stalled)"
+        return None
+
+    def capacity(self, jobs: int) -> int:
+        """How many of *jobs* parallel runs fit in memory right now (at least 1)."""
+        info = meminfo()
+        if "MemAvailable" not in info:
+            return jobs
+        fit = int((info["MemAvailable"] - RESERVE_MB) // max(1.0, self.need_mb))
+        return max(1, min(jobs, fit))
+
+    def admit(self, slot, need: float | None = None, cancelled=None, on_wait=None) -> bool:
+        """
+        Block until *slot* may start a run; *on_wait(reason)* is called
+        while it waits.  False when *cancelled()* turned true first.
+        """
+        while True:
+            with self._cond:
+                reason = self.check(need) if self._admitted else None
+                if reason is None:
+                    self._admitted[slot] = self.need_mb if need is None else need
+                    return True
+                if cancelled and cancelled():
+                    return False
+                if on_wait:
+                    on_wait(reason)
+                self._cond.wait(POLL_SECS)
+
+    def release(self, slot):
+        with self._cond:
+            self._admitted.pop(slot, None)
+            self._cond.notify_all()
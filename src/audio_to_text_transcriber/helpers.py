@@ -1,7 +1,10 @@
 import os
+import shutil
 from pathlib import Path
 
 HOME_DIR = str(Path.home())
+TRANSCRIPT_SUFFIX = "_transcribed.txt"
+AUDIO_EXTS = (".mp3", ".wav", ".flac", ".m4a", ".ogg", ".opus")
 
 def human_path(path: str) -> str:
     if not path:
@@ -12,3 +15,81 @@ def human_path(path: str) -> str:
     if path.startswith(HOME_DIR + os.sep):
         return "~" + path[len(HOME_DIR):]
     return path
+
+def whisper_ts(secs: float) -> str:
+    """Seconds → ``hh:mm:ss.mmm``, the timestamp format whisper-cli prints."""
+    ms = max(0, int(round(secs * 1000)))
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+def fmt_secs(secs: float) -> str:
+    """Seconds → ``m:ss`` or ``h:mm:ss``."""
+    secs   = max(0, int(round(secs)))
+    h, rem = divmod(secs, 3600)
+    m, s   = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+def parse_whisper_ts(ts: str) -> float:
+    """``hh:mm:ss.mmm`` → seconds."""
+    h, m, s = ts.split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+def transcript_dest(out_dir: str, audio_path: str) -> str:
+    """``<out_dir>/<audio basename without extension>_transcribed.txt``"""
+    stem = os.path.splitext(os.path.basename(audio_path))[0]
+    return os.path.join(out_dir, stem + TRANSCRIPT_SUFFIX)
+
+def model_file(models_dir: str, core: str) -> str:
+    """Where the ggml model *core* (e.g. ``base.en``) is installed."""
+    return os.path.join(models_dir, f"ggml-{core}.bin")
+
+def default_data_dir() -> str:
+    """The app's data folder, resolved like ``GLib.get_user_data_dir()``."""
+    return os.getenv(
+        "AUDIO_TO_TEXT_TRANSCRIBER_DATA_DIR",
+        os.path.join(os.getenv("XDG_DATA_HOME") or os.path.join(HOME_DIR, ".local", "share"),
+                     "AudioToTextTranscriber")
+    )
+
+def find_cli_bin() -> str | None:
+    """``whisper-cli`` on $PATH, else the copy built by ./build.sh."""
+    found = shutil.which("whisper-cli")
+    if found:
+        return found
+    sd = os.path.abspath(os.path.dirname(__file__))
+    for cand in (os.path.join(sd, "..", "..", "build-dir", "files", "bin", "whisper-cli"),
+                 os.path.join(sd, "whisper.cpp", "build", "bin", "whisper-cli")):
+        if os.path.isfile(cand) and os.access(cand, os.X_OK):
+            return os.path.normpath(cand)
+    return None
+
+def threads_per_job(jobs: int, cores: int | None = None) -> int:
+    """Split *cores* (default: the machine's) evenly across *jobs* whisper-cli processes."""
+    return max(1, (cores or os.cpu_count() or 1) // max(1, jobs))
+
+def whisper_layout(jobs: int, tuned: dict | None = None,
+                   cores: int | None = None) -> tuple[int | None, int]:
+    """
+    ``(-t, -p)`` for each of *jobs* parallel whisper runs: the autotuned
+    layout when it was measured for this many jobs, else an even share of
+    the cores (None keeps whisper's own thread default) and 1 processor.
+    *cores* limits the share when whisper may only use some of them.
+    """
+    if tuned and tuned.get("jobs") == jobs:
+        return tuned["threads"], tuned.get("processors", 1)
+    share = threads_per_job(jobs, cores)
+    # whisper's default is min(4, cores) of the whole machine
+    return (share if jobs > 1 or (cores and share < 4) else None), 1
+
+def find_server_bin(cli_path: str | None) -> str | None:
+    """Locate ``whisper-server`` on $PATH or next to ``whisper-cli``."""
+    found = shutil.which("whisper-server")
+    if found:
+        return found
+    if cli_path:
+        sibling = os.path.join(os.path.dirname(cli_path), "whisper-server")
+        if os.path.isfile(sibling) and os.access(sibling, os.X_OK):
+            return sibling
+    return None
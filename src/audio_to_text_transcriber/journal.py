@@ -0,0 +1,116 @@
+# journal.py
+"""
+Durable record of the transcription queue.
+
+Every queued path, its status, and the model / flags / output folder it
+was (last) started with live in a small SQLite database next to
+Settings.yaml, so a batch interrupted by a crash or by closing the app
+can be restored and continued on the next start.
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# statuses whose work is finished – not restored
+DONE_STATUSES = ("completed", "skipped")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id      INTEGER PRIMARY KEY,          -- queue order
+    path    TEXT    NOT NULL UNIQUE,
+    status  TEXT    NOT NULL DEFAULT 'waiting',
+    model   TEXT,
+    flags   TEXT,
+    output  TEXT,
+    updated REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class JobJournal:
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False,
+                                   isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _tx(self):
+        """One locked write transaction (autocommit is on otherwise)."""
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    # ── queue edits ──────────────────────────────────────────────
+    def add(self, paths):
+        now = time.time()
+        with self._tx():
+            self._db.executemany(
+                "INSERT OR IGNORE INTO jobs (path, updated) VALUES (?, ?)",
+                ((p, now) for p in paths),
+            )
+
+    def remove(self, path):
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE path = ?", (path,))
+
+    def clear(self):
+        with self._tx():
+            self._db.execute("DELETE FROM jobs")
+            self._db.execute("DELETE FROM meta")
+
+    def set_status(self, path, status):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE path = ?",
+                (status, time.time(), path),
+            )
+
+    def start_batch(self, paths, model, flags, output):
+        """Remember what *paths* are being transcribed with."""
+        flags_json = json.dumps(list(flags))
+        with self._tx():
+            self._db.executemany(
+                "UPDATE jobs SET model = ?, flags = ?, output = ? WHERE path = ?",
+                ((model, flags_json, output, p) for p in paths),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('batch', ?)",
+                (json.dumps({"model": model, "flags": list(flags), "output": output}),),
+            )
+
+    # ── restore ──────────────────────────────────────────────────
+    def unfinished(self) -> list[tuple[str, str]]:
+        """``(path, status)`` of every entry not yet done, in queue order."""
+        marks = ",".join("?" * len(DONE_STATUSES))
+        with self._lock:
+            return self._db.execute(
+                f"SELECT path, status FROM jobs WHERE status NOT IN ({marks}) ORDER BY id",
+                DONE_STATUSES,
+            ).fetchall()
+
+    def last_batch(self) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = 'batch'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,4 +1,7 @@
 # main.py
+import time
+_T0 = time.perf_counter()          # --startup-time measures from here
+
 import gi
 import os
 # ── Work‑around: if the IBus daemon is absent or hung, every key‑press
@@ -6,10 +9,9 @@ import os
 #    the ultra‑light ‘simple’ IM module we bypass IBus entirely.
 os.environ.setdefault("GTK_IM_MODULE", "gtk-im-context-simple")
 
-import glob
-import subprocess
+import importlib
+import json
 import threading
-import yaml
 import shutil
 import weakref  
 from pathlib import Path
@@ -27,13 +29,17 @@ if os.path.dirname(__file__) not in sys.path:
 try:
     from . import ui
     from . import model
-    from . import transcribe
-    from . import view_transcripts
     from . import settings
+    from .helpers import find_server_bin
+    from .journal import JobJournal
+    from .updates import UiUpdates
+    from .filequeue import FileQueue
 except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
 
+_T_IMPORTED = time.perf_counter()
+
 class WhisperApp(Adw.Application):
     def __init__(self):
         super().__init__(application_id="io.github.JaredTweed.AudioToTextTranscriber")
@@ -41,6 +47,7 @@ class WhisperApp(Adw.Application):
         self._highlight_buffers: weakref.WeakSet = weakref.WeakSet()
         self.title = "Audio-To-Text Transcriber"
         self.settings_file = Path(GLib.get_user_data_dir()) / "AudioToTextTranscriber" / "Settings.yaml"
+        self.journal = JobJournal(self.settings_file.parent / "Jobs.sqlite3")
         
         Adw.StyleManager.get_default().connect(
             "notify::dark",
@@ -55,6 +62,7 @@ class WhisperApp(Adw.Application):
         # print(f"ls of source directory parent: {os.listdir(os.path.dirname(sd))}")
         # print(f"ls of source directory parent parent: {os.listdir(os.path.dirname(os.path.dirname(sd)))}")
         self.bin_path = shutil.which("whisper-cli") or os.path.join(sd, "..", "..", "build-dir", "files", "bin", "whisper-cli") or os.path.join(self.repo_dir, "build", "bin", "whisper-cli")
+        self.server_bin_path = find_server_bin(self.bin_path)
         self.download_script = "/app/bin/download-ggml-model.sh" or os.path.join(self.repo_dir, "models", "download-ggml-model.sh")
         print(f"Binary path: {self.bin_path}\nDownload script path: {self.download_script}")
 
@@ -71,25 +79,57 @@ class WhisperApp(Adw.Application):
         )
 
         os.makedirs(data_dir, exist_ok=True)
+        self.data_dir = data_dir
         self.models_dir = os.path.join(data_dir, "models")
         os.makedirs(self.models_dir, exist_ok=True)
         self.display_to_core = {}
         self.dl_info = None
         self.cancel_flag = False
-        self.current_proc = None
+        self.current_procs = set()          # whisper-cli processes in flight
+        self._procs_lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+        # worker → main-loop traffic, applied at most once per frame
+        self.ui_updates = UiUpdates(
+            lambda fd, text: self.add_log_text(fd, text),
+            lambda fd, status, msg: self.update_file_status(fd, status, msg),
+            lambda fd, text: self.set_file_subtitle(fd, text),
+            lambda markup: self.progress_lbl.set_markup(markup),
+        )
+        self._servers = {}                  # worker slot → resident WhisperServer
+        self._chunk_jobs = {}               # path → state of a file split in parts
+        self._prefetch = None               # decode-ahead stage of the running batch
+        self._pending = None                # task queue of the running batch
+        self._processors = 1                # whisper -p of the running batch
+        self._batch = {}                    # path → number shown, for the running batch
+        self._started = set()
+        self._added_secs = 0.0              # audio added to the running batch
+        self.is_tuning = False
+        self._tune_cancel = None
+        self._watcher = None                # monitors of the watched folders
+        self._watch_backlog = []            # watched files waiting for a batch
+        self._watch_retry = 0               # source-id while one is still running
+        self._transcript_cache = None       # opened on first use
+        self._media = None                  # background ffprobe, on first use
+        self._speed = None                  # learned audio-secs per wall-sec
+        self._transcript_index = None       # full-text search, on first use
+        self._index_monitor = None          # (output folder, its Gio.FileMonitor)
+        self._index_sync = None             # Thread indexing the output folder
+        self._index_pending = set()         # transcripts changed on disk, to re-index
+        self._index_flush = 0               # source-id of the pending re-index
+        self._cache_lock = threading.Lock()
+        self.measure_startup = False        # main(): --startup-time
         self.desired_models = ["tiny", "tiny.en", "base", "base.en", "small", "small.en",
                               "medium", "medium.en", "large-v1", "large-v2", "large-v3",
                               "large-v3-turbo"]
-        self.audio_store = Gtk.StringList()
-        self.progress_items = []
-        self.transcript_items = []
+        self.progress_items = FileQueue()   # path-indexed, backs the queue's list view
+        self.transcript_items = {}          # path → row data, shown in transcripts_list
         self._scan_handle = 0          # source-id of the debounce timer
         self._scan_thread = None       # background Thread object
         self._scan_cancel = threading.Event() 
-        self.transcript_paths  = set()      #  <-- NEW
         self.no_transcripts_row = None      #  <-- NEW
         self.files_group = None
         self.transcripts_group = None
+        self.transcripts_list = None
         self.search_entry = None
         self.stack = None
         self.view_switcher = None
@@ -99,27 +139,41 @@ class WhisperApp(Adw.Application):
         self.output_value_label = None
         self.connect('startup', self.do_startup)
         self.connect('activate', self.do_activate)
+        self.connect('shutdown', self._on_shutdown)
 
         # Bind methods from imported modules
         module_methods = {
             ui: [
                 'create_view_switcher_ui',
+                '_build_transcripts_pane',
                 '_on_view_switched',
                 '_on_reset_clicked',
                 '_on_dnd_drop',
-                'add_file_to_list',
+                '_new_file_data',
+                '_on_queue_row_setup',
+                '_on_queue_row_bind',
+                '_on_queue_row_unbind',
+                '_on_queue_row_activated',
+                '_sync_row',
+                'set_file_subtitle',
+                '_on_urgent_toggled',
                 '_on_remove_file',
                 '_on_remove_file_response',
                 '_remove_single_file',
                 '_show_no_files_message',
                 'show_file_details',
+                '_show_media_info',
+                '_schedule_queue_total',
+                '_update_queue_total',
                 '_show_text_buffer_window',
+                '_new_source_buffer',
                 '_show_file_content',
                 '_ensure_highlight_tag',
                 '_refresh_highlight_tags',
                 '_highlight_text',
                 'create_output_widget',
                 'update_file_status',
+                '_log_buffer',
                 'add_log_text',
                 'on_about',
                 'on_toggle_timestamps',
@@ -150,8 +204,48 @@ class WhisperApp(Adw.Application):
                 '_on_download_done',
                 '_refresh_model_menu',
             ],
-            transcribe: [
+            settings: [
+                'load_settings',
+                'save_settings',
+                '_on_timestamps_toggled',
+                '_on_parallel_jobs_changed',
+                '_on_prefetch_changed',
+                '_on_queue_order_changed',
+                '_on_autotune_clicked',
+                '_autotune_thread',
+                '_on_autotune_done',
+                '_update_autotune_row',
+                '_on_engine_changed',
+                '_on_chunking_toggled',
+                '_on_chunk_minutes_changed',
+                '_on_chunk_overlap_changed',
+                '_on_vad_toggled',
+                '_on_worker_nice_changed',
+                '_on_io_class_changed',
+                '_on_split_cpus_toggled',
+                '_on_reserve_ui_core_toggled',
+                '_on_worker_cpus_applied',
+                '_on_add_watch_folder',
+                '_on_add_watch_folder_response',
+                '_on_remove_watch_folder',
+                '_refresh_watch_rows',
+                '_on_flush_policy_changed',
+                '_on_cache_toggled',
+                '_on_cache_size_changed',
+                '_on_clear_cache',
+                '_update_cache_stats',
+                'on_settings',
+                '_set_settings_lock',
+                '_unlock_settings_now',
+            ]
+        }
+
+        # Bound on first call, so their imports (and GtkSource) stay off the
+        # startup path – see _bind_deferred
+        deferred_methods = {
+            'transcribe': [
                 'on_add_audio',
+                '_enqueue_paths',
                 '_on_add_choice_response',
                 '_select_audio_files',
                 '_select_audio_folders',
@@ -162,14 +256,57 @@ class WhisperApp(Adw.Application):
                 '_on_remove_all_response',
                 '_remove_all_files',
                 'on_transcribe',
+                'on_plan',
                 '_reset_rows_if_needed',
                 '_on_conflict_response',
                 '_start_transcription',
+                '_queue_task',
+                '_queue_weight',
+                '_queue_file',
+                '_promote_file',
+                '_join_running_batch',
+                '_grow_total',
                 '_worker',
+                '_settle_total',
+                '_worker_loop',
+                '_task_failed',
+                '_admit',
+                '_prefetch_size',
+                '_transcribe_file',
+                '_open_writer',
+                '_whisper_flags',
+                '_cache_key',
+                '_serve_from_cache',
+                '_finish_file',
+                '_index_transcript',
+                '_recover_partials',
+                '_on_recover_partials_response',
+                '_offer_restore_queue',
+                '_on_restore_queue_response',
+                '_resume_batch',
+                '_start_watching',
+                '_on_watched_files',
+                '_start_watch_backlog',
+                '_should_chunk',
+                '_split_into_chunks',
+                '_split_at_speech',
+                '_queue_chunks',
+                '_transcribe_chunk',
+                '_discard_chunk_jobs',
+                '_run_engine',
+                '_show_overall',
+                '_record_progress',
+                '_procs_running',
+                '_whisper_pids',
+                '_stop_all_procs',
+                '_launch_prefix',
+                '_run_cli',
+                '_use_server',
+                '_run_server',
+                '_stop_servers',
                 '_update_eta',
-                '_audio_seconds',
             ],
-            view_transcripts: [
+            'view_transcripts': [
                 'add_transcript_to_list',
                 '_show_transcript_content',
                 '_clear_listbox',
@@ -178,26 +315,96 @@ class WhisperApp(Adw.Application):
                 '_open_transcript_file',
                 'on_search_changed',
                 '_spawn_scan_thread',
+                '_sync_transcript_index',
+                '_on_output_dir_changed',
+                '_flush_index_updates',
                 '_update_transcripts_list',
-                '_rebuild_transcript_rows',
+                '_scan_transcripts',
+                '_show_transcript_matches',
             ],
-            settings: [
-                'load_settings',
-                'save_settings',
-                '_on_timestamps_toggled',
-                'on_settings',
-                '_set_settings_lock',
-                '_unlock_settings_now',
-            ]
         }
 
         for module, methods in module_methods.items():
             for method_name in methods:
                 if hasattr(module, method_name):
                     setattr(self, method_name, getattr(module, method_name).__get__(self, WhisperApp))
+        for module_name, methods in deferred_methods.items():
+            self._bind_deferred(module_name, methods)
         self.load_settings()
         self.create_action("settings", self.on_settings)
-        self.setup_transcripts_listbox()
+        self._t_init_done = time.perf_counter()
+
+    def _bind_deferred(self, module_name, method_names):
+        """
+        Bind stand-ins for *method_names* that import *module_name* on the
+        first call and then replace themselves with the real methods.
+        """
+        loaded = []
+
+        def _load():
+            if not loaded:
+                module = importlib.import_module(f".{module_name}", __package__)
+                for name in method_names:
+                    setattr(self, name, getattr(module, name).__get__(self, WhisperApp))
+                loaded.append(module)
+
+        def _stand_in(name):
+            def call(*args, **kwargs):
+                _load()
+                return getattr(self, name)(*args, **kwargs)
+            call.__name__ = name
+            return call
+
+        for name in method_names:
+            setattr(self, name, _stand_in(name))
+
+    @property
+    def transcript_cache(self):
+        with self._cache_lock:
+            if self._transcript_cache is None:
+                from .cache import TranscriptCache
+                self._transcript_cache = TranscriptCache(
+                    os.path.join(self.data_dir, "cache"), self.cache_size_mb * 1024 * 1024)
+            return self._transcript_cache
+
+    @property
+    def media(self):
+        """Audio metadata (duration, codec, …) probed in the background."""
+        with self._cache_lock:
+            if self._media is None:
+                from .probe import MediaProber
+                self._media = MediaProber(os.path.join(self.data_dir, "Media.sqlite3"))
+            return self._media
+
+    @property
+    def speed(self):
+        with self._cache_lock:
+            if self._speed is None:
+                from .speed import SpeedModel
+                self._speed = SpeedModel(os.path.join(self.data_dir, "Speed.sqlite3"))
+            return self._speed
+
+    @property
+    def transcript_index(self):
+        """Full-text index of the transcripts (see transcript_index.py)."""
+        with self._cache_lock:
+            if self._transcript_index is None:
+                from .transcript_index import TranscriptIndex
+                self._transcript_index = TranscriptIndex(
+                    os.path.join(self.data_dir, "Search.sqlite3"))
+            return self._transcript_index
+
+    def _on_shutdown(self, *args):
+        if self._servers:
+            self._stop_servers()
+        if self._media:
+            self._media.close()             # drop probes still queued
+        if self._tune_cancel:
+            self._tune_cancel.set()         # kills the running trial
+        if self._watcher:
+            self._watcher.stop()
+        if self._index_monitor:
+            self._index_monitor[1].cancel()
 
     def do_startup(self, *args):
         Adw.Application.do_startup(self)
@@ -207,9 +414,37 @@ class WhisperApp(Adw.Application):
         self._build_ui()
         self._setup_dnd()
         self._update_model_btn()
+        self._t_ui_built = time.perf_counter()
+        GLib.idle_add(self._recover_partials)
+        GLib.idle_add(self._offer_restore_queue)
+        GLib.idle_add(self._start_watching)
 
     def do_activate(self, *args):
         self.window.present()
+        if self.measure_startup:
+            self._report_first_frame()
+
+    # ── --startup-time: print how long the first frame took, then quit ──
+    def _report_first_frame(self):
+        clock = self.window.get_frame_clock()
+
+        def _painted(*_):
+            if handler:
+                clock.disconnect(handler)
+            now = time.perf_counter()
+            ms = lambda a, b: round((b - a) * 1000, 1)
+            print(json.dumps({
+                "imports_ms":     ms(_T0, _T_IMPORTED),
+                "init_ms":        ms(_T_IMPORTED, self._t_init_done),
+                "ui_ms":          ms(self._t_init_done, self._t_ui_built),
+                "first_frame_ms": ms(_T0, now),
+            }), flush=True)
+            self.quit()
+            return False
+
+        handler = clock.connect("after-paint", _painted) if clock else None
+        if not handler:
+            GLib.idle_add(_painted)
 
     def create_action(self, name, callback):
         action = Gio.SimpleAction.new(name, None)
@@ -220,6 +455,7 @@ class WhisperApp(Adw.Application):
 # Add this main function
 def main():
     app = WhisperApp()
+    app.measure_startup = "--startup-time" in sys.argv
     app.run()
 
 if __name__ == "__main__":
@@ -3,14 +3,11 @@ import gi
 import os
 import subprocess
 import threading
-import yaml
-import shutil
-from pathlib import Path
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, GLib, Gio, Gdk, Adw, GObject
 
-from .helpers import human_path as _hp
+from .helpers import human_path as _hp, model_file
 
 MB = 1024 * 1024
 
@@ -25,9 +22,10 @@ MODEL_SIZE_MB = {
 def _on_model_combo_changed(self, dropdown, _):
     self.save_settings()
     self._update_model_btn()
+    self._update_autotune_row()
 
 def _model_target_path(self, core):
-    return os.path.join(self.models_dir, f"ggml-{core}.bin")
+    return model_file(self.models_dir, core)
 
 def _display_name(self, core: str) -> str:
     return next((
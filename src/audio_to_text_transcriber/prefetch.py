@@ -0,0 +1,136 @@
+# prefetch.py
+"""
+Decode-ahead stage in front of the worker pool.
+
+whisper-cli decodes and resamples compressed audio itself, serially, at
+the start of every run.  ``Prefetcher`` converts the next few queued
+files to 16 kHz mono PCM WAV with ffmpeg while the current ones are
+being transcribed, so each run starts on ready-to-use audio.  At most
+*ahead* files (and roughly *max_bytes* of WAV) sit in the temp folder at
+once; ``close`` kills a running conversion and removes the folder.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+WAV_BYTES_PER_SEC = 16000 * 2           # 16 kHz, mono, s16le
+MAX_BYTES = 2 << 30                     # temp-disk budget for converted files
+
+_CONVERTING, _FAILED, _CLAIMED = "converting", "failed", "claimed"
+
+
+class Prefetcher:
+    def __init__(self, paths, ahead: int = 2, sizer=None, max_bytes: int = MAX_BYTES):
+        """
+        *paths* in the order the workers will ask for them.  *sizer(path)*
+        returns the expected WAV size in bytes, or None when the file
+        should be left alone (e.g. it is split into parts anyway).
+        """
+        self.ahead = max(1, ahead)
+        self.max_bytes = max_bytes
+        self._paths = list(paths)
+        self._sizer = sizer or (lambda p: 0)
+        self._cond = threading.Condition()
+        self._state = {}                # path → wav path | _CONVERTING | _FAILED | _CLAIMED
+        self._sizes = {}                # path → reserved bytes while held
+        self._held = 0                  # converting + converted, not yet released
+        self._bytes = 0
+        self._proc = None
+        self._closed = False
+        self._tmpdir = tempfile.mkdtemp(prefix="audio-to-text-prefetch-")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # ── producer ─────────────────────────────────────────────────
+    def _run(self):
+        for n, path in enumerate(self._paths):
+            size = self._sizer(path)
+            with self._cond:
+                if size is None or path in self._state:
+                    continue            # not wanted, or a worker got there first
+                while not self._closed and self._held and (
+                        self._held >= self.ahead or self._bytes + size > self.max_bytes):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                if path in self._state:
+                    continue
+                self._state[path] = _CONVERTING
+                self._sizes[path] = size
+                self._held += 1
+                self._bytes += size
+            wav = os.path.join(self._tmpdir, f"{n:06d}.wav")
+            ok = self._convert(path, wav)
+            with self._cond:
+                if ok and not self._closed:
+                    self._state[path] = wav
+                else:
+                    self._state[path] = _FAILED
+                    self._unhold(path)
+                self._cond.notify_all()
+
+    def _convert(self, path, wav) -> bool:
+        cmd = ["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", path,
+               "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le", wav]
+        try:
+            with self._cond:
+                if self._closed:
+                    return False
+                self._proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL)
+            ok = self._proc.wait() == 0
+        except OSError:
+            ok = False
+        finally:
+            self._proc = None
+        if not ok and os.path.exists(wav):
+            os.remove(wav)
+        return ok
+
+    def _unhold(self, path):
+        # caller holds self._cond
+        self._held -= 1
+        self._bytes -= self._sizes.pop(path, 0)
+
+    # ── consumers ────────────────────────────────────────────────
+    def take(self, path: str) -> str | None:
+        """
+        The converted WAV for *path*, waiting if it is being converted right
+        now; None when it was not (or could not be) prefetched – the caller
+        then uses the original file.
+        """
+        with self._cond:
+            while self._state.get(path) == _CONVERTING and not self._closed:
+                self._cond.wait()
+            st = self._state.get(path)
+            if st is None:
+                self._state[path] = _CLAIMED    # too late now – don't convert it
+                return None
+            return st if st not in (_FAILED, _CLAIMED) and not self._closed else None
+
+    def release(self, path: str) -> None:
+        """The run on *path* is over: delete its WAV and make room."""
+        with self._cond:
+            st = self._state.get(path)
+            if st in (None, _CONVERTING, _FAILED, _CLAIMED):
+                return
+            self._state[path] = _CLAIMED
+            self._unhold(path)
+            self._cond.notify_all()
+        try:
+            os.remove(st)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Stop converting and remove every temp file (cancel / batch end)."""
+        with self._cond:
+            self._closed = True
+            proc = self._proc
+            self._cond.notify_all()
+        if proc and proc.poll() is None:
+            proc.terminate()
+        self._thread.join(timeout=5)
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
@@ -0,0 +1,88 @@
+# priority.py
+"""
+Scheduling of whisper processes: nice level, I/O class and CPU affinity.
+
+They are applied by prefixing the command with ``nice``, ``ionice`` and
+``taskset``, which each exec the next program in place.  whisper keeps
+the pid Popen returned and starts with the limits already set, before
+it spawns its compute threads, which inherit them.  A tool that is not
+installed is simply left out.
+"""
+import os
+import shutil
+
+IO_CLASSES = {
+    "normal": None,
+    "low":    ["-c", "2", "-n", "7"],   # best effort, lowest priority
+    "idle":   ["-c", "3"],              # only when no one else needs the disk
+}
+
+
+def parse_cpus(text: str) -> set[int]:
+    """``"0-3,6"`` → ``{0, 1, 2, 3, 6}``; raises ValueError on bad input."""
+    cpus = set()
+    for part in (text or "").replace(" ", "").split(","):
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        first, last = int(lo), int(hi) if sep else int(lo)
+        if first < 0 or last < first:
+            raise ValueError(f"bad CPU range: {part}")
+        cpus.update(range(first, last + 1))
+    return cpus
+
+
+def format_cpus(cpus) -> str:
+    """``[0, 1, 2, 3, 6]`` → ``"0-3,6"`` (taskset's list syntax)."""
+    ranges, cpus = [], sorted(cpus)
+    for cpu in cpus:
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(f"{a}-{b}" if b > a else str(a) for a, b in ranges)
+
+
+def usable_cpus(allowed: str = "", reserve_ui: bool = False) -> list[int]:
+    """
+    CPUs whisper may run on: those this process may use, limited to
+    *allowed* (empty = all) and, with *reserve_ui*, without the first one,
+    which is left to the GTK main loop.  Never empty.
+    """
+    try:
+        own = os.sched_getaffinity(0)
+    except (AttributeError, OSError):
+        own = set(range(os.cpu_count() or 1))
+    try:
+        cpus = sorted(own & parse_cpus(allowed)) if allowed else sorted(own)
+    except ValueError:
+        cpus = sorted(own)
+    if reserve_ui and len(cpus) > 1:
+        cpus = cpus[1:]
+    return cpus or sorted(own)
+
+
+def partition(cpus: list[int], jobs: int, slot: int) -> list[int]:
+    """*slot*'s contiguous share when *cpus* are split across *jobs* runs."""
+    if jobs <= 1 or not cpus:
+        return list(cpus)
+    if jobs >= len(cpus):
+        return [cpus[slot % len(cpus)]]
+    base, extra = divmod(len(cpus), jobs)
+    start = slot * base + min(slot, extra)
+    return cpus[start:start + base + (slot < extra)]
+
+
+def command_prefix(nice: int = 0, io_class: str = "normal", cpus=None) -> list[str]:
+    """
+    Arguments to put in front of a command so it runs at *nice*, in I/O
+    class *io_class* (see ``IO_CLASSES``) and only on *cpus* (None = any).
+    """
+    prefix = []
+    if nice and shutil.which("nice"):
+        prefix += ["nice", "-n", str(nice)]
+    if IO_CLASSES.get(io_class) and shutil.which("ionice"):
+        prefix += ["ionice", *IO_CLASSES[io_class]]
+    if cpus and shutil.which("taskset"):
+        prefix += ["taskset", "-c", format_cpus(cpus)]
+    return prefix
@@ -0,0 +1,177 @@
+# probe.py
+"""
+Background audio metadata probing.
+
+Duration, codec, channel count and sample rate come from one ``ffprobe``
+per file, run in a small thread pool as soon as files are queued.  The
+results are kept in SQLite keyed by path + size + mtime, so re-adding the
+same library needs no ffprobe at all and the queue total / ETA are known
+before a batch starts.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+# ffprobe mostly waits on the disk, so a few more slots than cores pay off
+PROBE_WORKERS = min(8, max(4, 2 * (os.cpu_count() or 1)))
+PROBE_TIMEOUT = 60          # seconds – a stuck network mount must not hang a slot
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    duration    REAL    NOT NULL,
+    codec       TEXT,
+    channels    INTEGER,
+    sample_rate INTEGER
+);
+"""
+
+
+class MediaInfo(NamedTuple):
+    duration:    float          # seconds, 0.0 when unknown
+    codec:       str | None = None
+    channels:    int | None = None
+    sample_rate: int | None = None
+
+    def describe(self) -> str:
+        """``mp3 · stereo · 44.1 kHz`` (whatever is known)."""
+        parts = []
+        if self.codec:
+            parts.append(self.codec)
+        if self.channels:
+            parts.append({1: "mono", 2: "stereo"}.get(self.channels, f"{self.channels} ch"))
+        if self.sample_rate:
+            parts.append(f"{self.sample_rate / 1000:g} kHz")
+        return " · ".join(parts)
+
+
+UNKNOWN = MediaInfo(0.0)
+
+
+def probe_media(path: str) -> MediaInfo:
+    """Run ffprobe on *path*; ``UNKNOWN`` when it cannot be read."""
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "format=duration:stream=codec_name,channels,sample_rate",
+             "-of", "json", path],
+            capture_output=True, text=True, timeout=PROBE_TIMEOUT,
+        )
+        data = json.loads(out.stdout or "{}")
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return UNKNOWN
+    stream = (data.get("streams") or [{}])[0]
+    try:
+        duration = max(0.0, float(data.get("format", {}).get("duration", 0.0)))
+    except (TypeError, ValueError):
+        duration = 0.0
+    rate = stream.get("sample_rate")
+    return MediaInfo(
+        duration,
+        stream.get("codec_name"),
+        stream.get("channels"),
+        int(rate) if str(rate or "").isdigit() else None,
+    )
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class MediaProber:
+    def __init__(self, db_path: str):
+        self._db = sqlite3.connect(db_path, check_same_thread=False,
+                                   isolation_level=None)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(PROBE_WORKERS, thread_name_prefix="probe")
+        self._inflight = {}             # path → Future
+        self._closed = False            # probes still running then skip the database
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    # ── lookups ──────────────────────────────────────────────────
+    def cached(self, path: str) -> MediaInfo | None:
+        """The stored info if *path* has not changed since; never probes."""
+        try:
+            size, mtime = _stamp(path)
+        except OSError:
+            return None
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._db.execute(
+                "SELECT size, mtime_ns, duration, codec, channels, sample_rate "
+                "FROM media WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == size and row[1] == mtime:
+            return MediaInfo(*row[2:])
+        return None
+
+    def get(self, path: str) -> MediaInfo:
+        """Blocking: stored info, else wait for / run the probe."""
+        with self._lock:
+            fut = self._inflight.get(path)
+        if fut:
+            return fut.result()
+        info = self.cached(path)
+        return info if info is not None else self._probe(path)
+
+    def duration(self, path: str) -> float:
+        return self.get(path).duration
+
+    # ── background probing ───────────────────────────────────────
+    def probe_async(self, paths, on_info=None) -> None:
+        """
+        Probe every path that is not cached yet in the pool.  *on_info(path,
+        info)* is called for each path – right away for cached ones, from a
+        pool thread for the rest.
+        """
+        for path in paths:
+            info = self.cached(path)
+            if info is not None:
+                if on_info:
+                    on_info(path, info)
+                continue
+            with self._lock:
+                fut = self._inflight.get(path)
+                if fut is None:
+                    fut = self._inflight[path] = self._pool.submit(self._probe, path)
+            if on_info:
+                fut.add_done_callback(lambda f, p=path: on_info(p, f.result()))
+
+    def _probe(self, path: str) -> MediaInfo:
+        try:
+            stamp = _stamp(path)
+            info = probe_media(path)
+            if info.duration > 0:           # failures are retried next time
+                with self._lock:
+                    if self._closed:
+                        return info
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (path, *stamp, *info))
+            return info
+        except OSError:
+            return UNKNOWN
+        finally:
+            with self._lock:
+                self._inflight.pop(path, None)
+
+    def close(self) -> None:
+        """
+        Drop queued probes and close the database.  Probes already running
+        (in the pool or in a caller of ``get``) are not waited for – a stuck
+        ffprobe would hold up shutdown – they finish without storing.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._closed = True
+            self._db.close()
@@ -0,0 +1,54 @@
+# segments.py
+"""
+whisper-cli's JSON output → transcript lines.
+
+With ``-oj -of PREFIX`` whisper-cli writes every segment with its start
+and end offsets to ``PREFIX.json``.  That file, not the text printed on
+stdout, is what the saved transcript is made from: it is read in one
+pass into ``Segment`` tuples and rendered in the same
+``[hh:mm:ss.mmm --> hh:mm:ss.mmm]  text`` layout whisper-cli prints.
+"""
+import json
+from typing import NamedTuple
+
+from .helpers import whisper_ts
+
+
+class Segment(NamedTuple):
+    start: float            # seconds
+    end:   float
+    text:  str
+
+
+def json_args(prefix: str) -> list[str]:
+    """whisper-cli flags that write the segments to ``prefix + '.json'``."""
+    return ["-oj", "-of", prefix]
+
+
+def read_json(path: str) -> list[Segment]:
+    """
+    Segments of a whisper-cli ``-oj`` file.  Token text can end in the
+    middle of a UTF-8 sequence, so undecodable bytes are replaced rather
+    than failing the whole file.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        data = json.load(f)
+    return [
+        Segment(seg["offsets"]["from"] / 1000, seg["offsets"]["to"] / 1000, seg.get("text") or "")
+        for seg in data.get("transcription", ())
+    ]
+
+
+def render(segments, timestamps: bool = True) -> list[str]:
+    """Transcript lines for *segments*, skipping empty ones."""
+    lines = []
+    for seg in segments:
+        text = seg.text.rstrip()
+        if not text.strip():
+            continue
+        if timestamps:
+            lines.append(f"[{whisper_ts(seg.start)} --> {whisper_ts(seg.end)}]  {text}")
+        else:
+            lines.append(text)
+    return lines
+
@@ -6,18 +6,39 @@ import subprocess
 import threading
 import yaml
 import shutil
+import tempfile
 from pathlib import Path
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, GLib, Gio, Gdk, Adw, GObject
 
 from .helpers import human_path as _hp
+from .autotune import make_clip, tune
+from .priority import parse_cpus
 
 def load_settings(self):
     self.theme_index = 0
     self.output_directory = os.path.expanduser("~/Downloads")
     self.ts_enabled = True
     self.selected_model = ''
+    self.parallel_jobs = 1
+    self.prefetch_files = 2
+    self.queue_order = 'listed'
+    self.engine = 'cli'
+    self.chunking_enabled = False
+    self.chunk_minutes = 10
+    self.chunk_overlap = 2
+    self.vad_enabled = False
+    self.worker_nice = 0
+    self.worker_io_class = 'normal'
+    self.split_cpus = False
+    self.reserve_ui_core = False
+    self.worker_cpus = ''            # taskset list, '' = every core
+    self.watch_folders = []
+    self.flush_policy = 'segment'
+    self.cache_enabled = True
+    self.cache_size_mb = 500
+    self.tuning = {}                 # model → best {jobs, threads, processors, rate}
 
     if self.settings_file.exists():
         try:
@@ -27,6 +48,24 @@ def load_settings(self):
             self.output_directory = settings.get('output_directory', os.path.expanduser("~/Downloads"))
             self.ts_enabled = settings.get('include_timestamps', True)
             self.selected_model = settings.get('model', '')
+            self.parallel_jobs = max(1, int(settings.get('parallel_jobs', 1)))
+            self.prefetch_files = max(0, int(settings.get('decode_ahead_files', 2)))
+            self.queue_order = settings.get('queue_order', 'listed')
+            self.engine = settings.get('engine', 'cli')
+            self.chunking_enabled = settings.get('split_long_files', False)
+            self.chunk_minutes = max(1, int(settings.get('chunk_minutes', 10)))
+            self.chunk_overlap = max(0, int(settings.get('chunk_overlap_seconds', 2)))
+            self.vad_enabled = settings.get('skip_silence', False)
+            self.worker_nice = min(19, max(0, int(settings.get('worker_nice', 0))))
+            self.worker_io_class = settings.get('worker_io_class', 'normal')
+            self.split_cpus = settings.get('split_cpus_across_jobs', False)
+            self.reserve_ui_core = settings.get('reserve_ui_core', False)
+            self.worker_cpus = str(settings.get('worker_cpus') or '')
+            self.watch_folders = list(settings.get('watch_folders') or [])
+            self.flush_policy = settings.get('transcript_flush', 'segment')
+            self.cache_enabled = settings.get('transcript_cache', True)
+            self.cache_size_mb = max(1, int(settings.get('transcript_cache_mb', 500)))
+            self.tuning = settings.get('whisper_tuning') or {}
         except Exception as e:
             self._error(f"Error loading settings: {e}")
 
@@ -39,7 +78,25 @@ def save_settings(self):
         'theme': self.theme_index,
         'model': self.display_to_core.get(self.model_strings.get_string(self.model_combo.get_selected()), ''),
         'output_directory': self.output_directory or os.path.expanduser("~/Downloads"),
-        'include_timestamps': self.ts_enabled
+        'include_timestamps': self.ts_enabled,
+        'parallel_jobs': self.parallel_jobs,
+        'decode_ahead_files': self.prefetch_files,
+        'queue_order': self.queue_order,
+        'engine': self.engine,
+        'split_long_files': self.chunking_enabled,
+        'chunk_minutes': self.chunk_minutes,
+        'chunk_overlap_seconds': self.chunk_overlap,
+        'skip_silence': self.vad_enabled,
+        'worker_nice': self.worker_nice,
+        'worker_io_class': self.worker_io_class,
+        'split_cpus_across_jobs': self.split_cpus,
+        'reserve_ui_core': self.reserve_ui_core,
+        'worker_cpus': self.worker_cpus,
+        'watch_folders': self.watch_folders,
+        'transcript_flush': self.flush_policy,
+        'transcript_cache': self.cache_enabled,
+        'transcript_cache_mb': self.cache_size_mb,
+        'whisper_tuning': self.tuning,
     }
     try:
         os.makedirs(self.settings_file.parent, exist_ok=True)
@@ -55,6 +112,216 @@ def _on_timestamps_toggled(self, switch, _):
     if action:
         action.set_state(GLib.Variant.new_boolean(self.ts_enabled))
 
+def _on_parallel_jobs_changed(self, spin_row, _):
+    self.parallel_jobs = max(1, int(spin_row.get_value()))
+    self.save_settings()
+
+def _on_prefetch_changed(self, spin_row, _):
+    self.prefetch_files = max(0, int(spin_row.get_value()))
+    self.save_settings()
+
+QUEUE_ORDERS = ['listed', 'longest', 'shortest']
+
+def _on_queue_order_changed(self, combo_row, _):
+    self.queue_order = QUEUE_ORDERS[combo_row.get_selected()]
+    self.save_settings()
+
+def _on_chunking_toggled(self, switch, _):
+    self.chunking_enabled = switch.get_active()
+    self.save_settings()
+
+def _on_chunk_minutes_changed(self, spin_row, _):
+    self.chunk_minutes = max(1, int(spin_row.get_value()))
+    self.save_settings()
+
+def _on_chunk_overlap_changed(self, spin_row, _):
+    self.chunk_overlap = max(0, int(spin_row.get_value()))
+    self.save_settings()
+
+def _on_vad_toggled(self, switch, _):
+    self.vad_enabled = switch.get_active()
+    self.save_settings()
+
+def _on_worker_nice_changed(self, spin_row, _):
+    self.worker_nice = min(19, max(0, int(spin_row.get_value())))
+    self.save_settings()
+
+IO_PRIORITIES = ['normal', 'low', 'idle']
+
+def _on_io_class_changed(self, combo_row, _):
+    self.worker_io_class = IO_PRIORITIES[combo_row.get_selected()]
+    self.save_settings()
+
+def _on_split_cpus_toggled(self, switch, _):
+    self.split_cpus = switch.get_active()
+    self.save_settings()
+
+def _on_reserve_ui_core_toggled(self, switch, _):
+    self.reserve_ui_core = switch.get_active()
+    self.save_settings()
+
+def _on_worker_cpus_applied(self, entry_row):
+    text = entry_row.get_text().strip()
+    try:
+        parse_cpus(text)
+    except ValueError:
+        entry_row.add_css_class("error")
+        self._error("CPU list must look like 0-3,6")
+        return
+    entry_row.remove_css_class("error")
+    self.worker_cpus = text
+    self.save_settings()
+
+def _on_add_watch_folder(self, button):
+    dialog = Gtk.FileDialog()
+    dialog.set_title("Select a Folder to Watch")
+    dialog.set_accept_label("Watch")
+    dialog.select_folder(self.window, None, self._on_add_watch_folder_response)
+
+def _on_add_watch_folder_response(self, dialog, result):
+    try:
+        folder = dialog.select_folder_finish(result)
+    except GLib.Error:
+        return
+    path = folder.get_path() if folder else None
+    if path and path not in self.watch_folders:
+        self.watch_folders.append(path)
+        self.save_settings()
+        self._refresh_watch_rows()
+        self._start_watching()
+
+def _on_remove_watch_folder(self, button, path):
+    if path in self.watch_folders:
+        self.watch_folders.remove(path)
+        self.save_settings()
+        self._refresh_watch_rows()
+        self._start_watching()
+
+def _refresh_watch_rows(self):
+    group = getattr(self, 'watch_group', None)
+    if not group:
+        return
+    for row in self.watch_rows:
+        group.remove(row)
+    self.watch_rows = []
+    for path in self.watch_folders or [None]:
+        row = Adw.ActionRow()
+        if path is None:
+            row.set_title("No folders watched")
+        else:
+            row.set_title(os.path.basename(path) or path)
+            row.set_subtitle(_hp(path))
+            remove_btn = Gtk.Button()
+            remove_btn.set_icon_name("user-trash-symbolic")
+            remove_btn.set_valign(Gtk.Align.CENTER)
+            remove_btn.add_css_class("flat")
+            remove_btn.set_tooltip_text("Stop watching")
+            remove_btn.connect("clicked", self._on_remove_watch_folder, path)
+            row.add_suffix(remove_btn)
+        group.add(row)
+        self.watch_rows.append(row)
+
+FLUSH_POLICIES = ['segment', 'interval', 'end']
+
+def _on_flush_policy_changed(self, combo_row, _):
+    self.flush_policy = FLUSH_POLICIES[combo_row.get_selected()]
+    self.save_settings()
+
+def _on_cache_toggled(self, switch, _):
+    self.cache_enabled = switch.get_active()
+    self.save_settings()
+
+def _on_cache_size_changed(self, spin_row, _):
+    self.cache_size_mb = max(1, int(spin_row.get_value()))
+    self.transcript_cache.max_bytes = self.cache_size_mb * 1024 * 1024
+    self.transcript_cache.evict()
+    self.save_settings()
+    self._update_cache_stats()
+
+def _on_clear_cache(self, button):
+    self.transcript_cache.clear()
+    self._update_cache_stats()
+
+def _update_cache_stats(self):
+    row = getattr(self, 'cache_stats_row', None)
+    if not row:
+        return False
+    st = self.transcript_cache.stats()
+    row.set_subtitle(
+        f"{st['hits']} hits · {st['misses']} misses · "
+        f"{st['entries']} transcripts ({st['bytes'] / (1024 * 1024):.1f} MB)"
+    )
+    return False
+
+def _on_autotune_clicked(self, button):
+    core = self._get_model_name()
+    model_path = self._model_target_path(core)
+    if not os.path.isfile(model_path):
+        self._error("Install the model first.")
+        return
+    if not self.bin_path or not os.path.isfile(self.bin_path):
+        self._error("Cannot find 'whisper-cli', run ./build.sh")
+        return
+    src = next((fd['path'] for fd in self.progress_items if os.path.isfile(fd['path'])), None)
+    if not src:
+        self._error("Add an audio file first – its first minute is used for tuning.")
+        return
+    self.is_tuning = True
+    self._tune_cancel = threading.Event()
+    self._set_settings_lock(bool(getattr(self, 'is_transcribing', False)))
+    jobs = max(1, int(self.parallel_jobs))
+    threading.Thread(target=self._autotune_thread, args=(core, model_path, src, jobs),
+                     daemon=True).start()
+
+def _autotune_thread(self, core, model_path, src, jobs):
+    """Find the fastest -t / -p layout for *core*; runs off the main loop."""
+    def _on_trial(n, total, threads, processors, rate):
+        speed = f"{rate:.1f}× real time" if rate else "slower"
+        GLib.idle_add(self._update_autotune_row,
+                      f"{n}/{total}: {threads} threads × {processors} processors – {speed}")
+
+    GLib.idle_add(self._update_autotune_row, "Preparing reference clip…")
+    best = None
+    with tempfile.TemporaryDirectory(prefix="audio-to-text-tune-") as tmp:
+        wav = os.path.join(tmp, "clip.wav")
+        secs = make_clip(src, wav)
+        if secs:
+            best = tune(self.bin_path, model_path, wav, secs, jobs,
+                        on_trial=_on_trial, cancelled=self._tune_cancel.is_set)
+    GLib.idle_add(self._on_autotune_done, core, best, bool(secs))
+
+def _on_autotune_done(self, core, best, clipped):
+    self.is_tuning = False
+    if best:
+        self.tuning[core] = best
+        self.save_settings()
+    elif not self._tune_cancel.is_set():
+        self._error("Tuning failed: " + ("whisper-cli did not run." if clipped
+                                         else "could not read the audio file."))
+    self._set_settings_lock(bool(getattr(self, 'is_transcribing', False)))
+    self._update_autotune_row()
+    return False
+
+def _update_autotune_row(self, text=None):
+    row = getattr(self, 'autotune_row', None)
+    if not row:
+        return False
+    if text is None:
+        best = self.tuning.get(self._get_model_name())
+        text = (f"{best['threads']} threads × {best['processors']} processors for "
+                f"{best['jobs']} job(s) – {best['rate']:g}× real time" if best
+                else "Not tuned – whisper's defaults are used")
+    row.set_subtitle(text)
+    return False
+
+ENGINES = ['cli', 'server']
+
+def _on_engine_changed(self, combo_row, _):
+    self.engine = ENGINES[combo_row.get_selected()]
+    if self.engine != 'server':
+        self._stop_servers()          # free the RAM held by resident models
+    self.save_settings()
+
 def on_settings(self, action, param):
     dlg = Adw.PreferencesDialog()
     dlg.set_title("Settings")
@@ -93,8 +360,34 @@ def on_settings(self, action, param):
     browse_settings_btn.connect("clicked", self._browse_out_settings)
     self.output_settings_row.add_suffix(browse_settings_btn)
     output_group.add(self.output_settings_row)
+
+    flush_row = Adw.ComboRow()
+    flush_row.set_title("Save Progress")
+    flush_row.set_subtitle("How often unfinished transcripts are written to disk")
+    flush_model = Gtk.StringList()
+    flush_model.append("After every segment")
+    flush_model.append("Every few seconds")
+    flush_model.append("Only when finished")
+    flush_row.set_model(flush_model)
+    flush_row.set_selected(FLUSH_POLICIES.index(self.flush_policy) if self.flush_policy in FLUSH_POLICIES else 0)
+    flush_row.connect("notify::selected", self._on_flush_policy_changed)
+    output_group.add(flush_row)
     page.add(output_group)
 
+    self.watch_group = Adw.PreferencesGroup()
+    self.watch_group.set_title("Watched Folders")
+    self.watch_group.set_description("Audio that appears in these folders is transcribed automatically")
+    add_watch_btn = Gtk.Button()
+    add_watch_btn.set_icon_name("list-add-symbolic")
+    add_watch_btn.set_valign(Gtk.Align.CENTER)
+    add_watch_btn.add_css_class("flat")
+    add_watch_btn.set_tooltip_text("Watch a folder")
+    add_watch_btn.connect("clicked", self._on_add_watch_folder)
+    self.watch_group.set_header_suffix(add_watch_btn)
+    self.watch_rows = []
+    self._refresh_watch_rows()
+    page.add(self.watch_group)
+
     model_group = Adw.PreferencesGroup()
     model_group.set_title("AI Model")
     model_group.set_description("Select and manage transcription models")
@@ -115,6 +408,17 @@ def on_settings(self, action, param):
     model_action_row.add_suffix(self.model_btn)
     model_group.add(model_action_row)
     self.model_action_row = model_action_row
+
+    self.autotune_row = Adw.ActionRow()
+    self.autotune_row.set_title("Speed Tuning")
+    self.autotune_btn = Gtk.Button(label="Tune")
+    self.autotune_btn.set_valign(Gtk.Align.CENTER)
+    self.autotune_btn.set_tooltip_text("Time the first minute of a queued file with different "
+                                       "thread layouts; re-run after hardware changes")
+    self.autotune_btn.connect("clicked", self._on_autotune_clicked)
+    self.autotune_row.add_suffix(self.autotune_btn)
+    model_group.add(self.autotune_row)
+    self._update_autotune_row()
     page.add(model_group)
 
     transcription_group = Adw.PreferencesGroup()
@@ -126,14 +430,163 @@ def on_settings(self, action, param):
     timestamps_row.set_active(self.ts_enabled)
     timestamps_row.connect("notify::active", self._on_timestamps_toggled)
     transcription_group.add(timestamps_row)
+
+    # Files transcribed at once; the CPU threads are split between them
+    jobs_row = Adw.SpinRow.new_with_range(1, max(1, os.cpu_count() or 1), 1)
+    jobs_row.set_title("Parallel Jobs")
+    jobs_row.set_subtitle("Files transcribed at the same time (CPU threads are shared)")
+    jobs_row.set_value(self.parallel_jobs)
+    jobs_row.connect("notify::value", self._on_parallel_jobs_changed)
+    transcription_group.add(jobs_row)
+
+    prefetch_row = Adw.SpinRow.new_with_range(0, 16, 1)
+    prefetch_row.set_title("Decode Ahead")
+    prefetch_row.set_subtitle("Files converted to 16 kHz WAV while others are transcribed (0 = off)")
+    prefetch_row.set_value(self.prefetch_files)
+    prefetch_row.connect("notify::value", self._on_prefetch_changed)
+    transcription_group.add(prefetch_row)
+
+    order_row = Adw.ComboRow()
+    order_row.set_title("Queue Order")
+    order_row.set_subtitle("Longest first keeps parallel jobs busy; shortest first finishes more files sooner")
+    order_model = Gtk.StringList()
+    order_model.append("As listed")
+    order_model.append("Longest first")
+    order_model.append("Shortest first")
+    order_row.set_model(order_model)
+    order_row.set_selected(QUEUE_ORDERS.index(self.queue_order) if self.queue_order in QUEUE_ORDERS else 0)
+    order_row.connect("notify::selected", self._on_queue_order_changed)
+    transcription_group.add(order_row)
+
+    engine_row = Adw.ComboRow()
+    engine_row.set_title("Engine")
+    engine_row.set_subtitle("Keeping the model loaded avoids reloading it for every file")
+    engine_model = Gtk.StringList()
+    engine_model.append("Start whisper-cli per file")
+    engine_model.append("Keep model loaded (whisper-server)")
+    engine_row.set_model(engine_model)
+    engine_row.set_selected(ENGINES.index(self.engine) if self.engine in ENGINES else 0)
+    engine_row.connect("notify::selected", self._on_engine_changed)
+    transcription_group.add(engine_row)
     page.add(transcription_group)
 
+    chunking_group = Adw.PreferencesGroup()
+    chunking_group.set_title("Long Recordings")
+    chunking_group.set_description("Cut long or mostly silent files into parts the parallel jobs transcribe side by side")
+    chunking_row = Adw.SwitchRow()
+    chunking_row.set_title("Split Long Recordings")
+    chunking_row.set_subtitle("Files longer than 1.5 parts are cut at the nearest silence")
+    chunking_row.set_active(self.chunking_enabled)
+    chunking_row.connect("notify::active", self._on_chunking_toggled)
+    chunking_group.add(chunking_row)
+
+    chunk_len_row = Adw.SpinRow.new_with_range(1, 120, 1)
+    chunk_len_row.set_title("Part Length (minutes)")
+    chunk_len_row.set_value(self.chunk_minutes)
+    chunk_len_row.connect("notify::value", self._on_chunk_minutes_changed)
+    chunking_group.add(chunk_len_row)
+
+    chunk_overlap_row = Adw.SpinRow.new_with_range(0, 30, 1)
+    chunk_overlap_row.set_title("Part Overlap (seconds)")
+    chunk_overlap_row.set_subtitle("Audio shared by neighbouring parts so no word is cut")
+    chunk_overlap_row.set_value(self.chunk_overlap)
+    chunk_overlap_row.connect("notify::value", self._on_chunk_overlap_changed)
+    chunking_group.add(chunk_overlap_row)
+
+    vad_row = Adw.SwitchRow()
+    vad_row.set_title("Skip Silence")
+    vad_row.set_subtitle("Find the speech first and transcribe only that; silent files finish at once")
+    vad_row.set_active(self.vad_enabled)
+    vad_row.connect("notify::active", self._on_vad_toggled)
+    chunking_group.add(vad_row)
+    page.add(chunking_group)
+
+    cache_group = Adw.PreferencesGroup()
+    cache_group.set_title("Transcript Cache")
+    cache_group.set_description("Reuse transcripts of audio that was already transcribed with the same model")
+    cache_row = Adw.SwitchRow()
+    cache_row.set_title("Reuse Earlier Transcripts")
+    cache_row.set_subtitle("Matches on the audio content, not the file name")
+    cache_row.set_active(self.cache_enabled)
+    cache_row.connect("notify::active", self._on_cache_toggled)
+    cache_group.add(cache_row)
+
+    cache_size_row = Adw.SpinRow.new_with_range(10, 100000, 10)
+    cache_size_row.set_title("Cache Size (MB)")
+    cache_size_row.set_subtitle("Least recently used transcripts are dropped first")
+    cache_size_row.set_value(self.cache_size_mb)
+    cache_size_row.connect("notify::value", self._on_cache_size_changed)
+    cache_group.add(cache_size_row)
+
+    self.cache_stats_row = Adw.ActionRow()
+    self.cache_stats_row.set_title("Usage")
+    clear_cache_btn = Gtk.Button(label="Clear")
+    clear_cache_btn.set_valign(Gtk.Align.CENTER)
+    clear_cache_btn.add_css_class("flat")
+    clear_cache_btn.connect("clicked", self._on_clear_cache)
+    self.cache_stats_row.add_suffix(clear_cache_btn)
+    cache_group.add(self.cache_stats_row)
+    self._update_cache_stats()
+    page.add(cache_group)
+
+    priority_group = Adw.PreferencesGroup()
+    priority_group.set_title("System Load")
+    priority_group.set_description("Keep the desktop and other programs responsive while whisper runs")
+    nice_row = Adw.SpinRow.new_with_range(0, 19, 1)
+    nice_row.set_title("CPU Priority (nice)")
+    nice_row.set_subtitle("0 = normal, 19 = only use otherwise idle CPU time")
+    nice_row.set_value(self.worker_nice)
+    nice_row.connect("notify::value", self._on_worker_nice_changed)
+    priority_group.add(nice_row)
+
+    io_row = Adw.ComboRow()
+    io_row.set_title("Disk Priority")
+    io_model = Gtk.StringList()
+    io_model.append("Normal")
+    io_model.append("Low")
+    io_model.append("Idle")
+    io_row.set_model(io_model)
+    io_row.set_selected(IO_PRIORITIES.index(self.worker_io_class) if self.worker_io_class in IO_PRIORITIES else 0)
+    io_row.connect("notify::selected", self._on_io_class_changed)
+    priority_group.add(io_row)
+
+    split_cpus_row = Adw.SwitchRow()
+    split_cpus_row.set_title("Give Each Job Its Own Cores")
+    split_cpus_row.set_subtitle("Parallel jobs do not compete for the same cores")
+    split_cpus_row.set_active(self.split_cpus)
+    split_cpus_row.connect("notify::active", self._on_split_cpus_toggled)
+    priority_group.add(split_cpus_row)
+
+    reserve_row = Adw.SwitchRow()
+    reserve_row.set_title("Keep a Core for the App")
+    reserve_row.set_subtitle("whisper never runs on the first core")
+    reserve_row.set_active(self.reserve_ui_core)
+    reserve_row.connect("notify::active", self._on_reserve_ui_core_toggled)
+    priority_group.add(reserve_row)
+
+    cpus_row = Adw.EntryRow()
+    cpus_row.set_title("Allowed Cores (e.g. 0-7,12; empty = all)")
+    cpus_row.set_text(self.worker_cpus)
+    cpus_row.set_show_apply_button(True)
+    cpus_row.connect("apply", self._on_worker_cpus_applied)
+    priority_group.add(cpus_row)
+    page.add(priority_group)
+
     self.timestamps_row = timestamps_row
+    self.parallel_jobs_row = jobs_row
+    self.prefetch_row = prefetch_row
+    self.queue_order_row = order_row
+    self.engine_row = engine_row
+    self.chunking_rows = (chunking_row, chunk_len_row, chunk_overlap_row, vad_row)
+    self.priority_rows = (nice_row, io_row, split_cpus_row, reserve_row, cpus_row)
 
     self._refresh_model_menu()
     self._update_model_btn()
 
-    dlg.connect("destroy", lambda d: setattr(self, 'settings_dialog', None))
+    dlg.connect("destroy", lambda d: (setattr(self, 'settings_dialog', None),
+                                      setattr(self, 'cache_stats_row', None),
+                                      setattr(self, 'watch_group', None),
+                                      setattr(self, 'autotune_row', None)))
     self._set_settings_lock(bool(getattr(self, 'is_transcribing', False)))
     dlg.present(self.window)
 
@@ -148,9 +601,20 @@ def _set_settings_lock(self, locked: bool):
         getattr(self, 'model_btn', None),            # Install/Delete button
         getattr(self, 'model_action_row', None),     # << NEW: grey out the whole row
         getattr(self, 'timestamps_row', None),       # Include timestamps
+        getattr(self, 'parallel_jobs_row', None),    # Parallel jobs
+        getattr(self, 'prefetch_row', None),         # Decode ahead
+        getattr(self, 'queue_order_row', None),      # listed / longest / shortest
+        getattr(self, 'engine_row', None),           # cli / resident server
     ):
         if w:
             w.set_sensitive(not locked)
+    # tuning and transcribing would compete for the same cores
+    if getattr(self, 'autotune_btn', None):
+        self.autotune_btn.set_sensitive(not locked and not getattr(self, 'is_tuning', False))
+    if getattr(self, 'model_combo', None) and getattr(self, 'is_tuning', False):
+        self.model_combo.set_sensitive(False)
+    for w in getattr(self, 'chunking_rows', ()) + getattr(self, 'priority_rows', ()):
+        w.set_sensitive(not locked)
 
 def _unlock_settings_now(self):
     """
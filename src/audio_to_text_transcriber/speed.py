@@ -0,0 +1,105 @@
+# speed.py
+"""
+Learned transcription speed.
+
+Every finished run records how many seconds of audio were transcribed
+per second of wall time, per model and whisper thread count.  Those
+figures give an ETA before the first ``progress =`` line arrives, a
+per-file estimate, and a dry-run plan of how long a whole queue takes.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+RECENT_RUNS = 50            # runs averaged per (model, threads)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    model      TEXT    NOT NULL,
+    threads    INTEGER NOT NULL,
+    audio_secs REAL    NOT NULL,
+    wall_secs  REAL    NOT NULL,
+    at         REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (model, threads, at);
+"""
+
+
+def effective_threads(threads: int | None) -> int:
+    """What whisper uses for ``-t``; its own default is min(4, cores)."""
+    return threads or min(4, os.cpu_count() or 1)
+
+
+class SpeedModel:
+    def __init__(self, db_path: str):
+        self._db = sqlite3.connect(db_path, check_same_thread=False,
+                                   isolation_level=None)
+        self._lock = threading.Lock()
+        self._rates = {}                # (model, threads) → rate, until next record
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    def record(self, model: str, threads: int | None, audio_secs: float, wall_secs: float):
+        if audio_secs <= 0 or wall_secs <= 0:
+            return
+        with self._lock:
+            self._db.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                             (model, effective_threads(threads), audio_secs,
+                              wall_secs, time.time()))
+            self._rates.clear()
+
+    def rate(self, model: str, threads: int | None) -> float | None:
+        """
+        Audio seconds per wall second for one run of *model* on *threads*.
+        Falls back to the same model on other thread counts (scaled by the
+        thread ratio, capped at 2×); None when the model never ran.
+        """
+        t = effective_threads(threads)
+        key = (model, t)
+        with self._lock:
+            if key in self._rates:
+                return self._rates[key]
+            exact = self._db.execute(
+                "SELECT SUM(audio_secs), SUM(wall_secs) FROM ("
+                " SELECT audio_secs, wall_secs FROM runs WHERE model = ? AND threads = ?"
+                " ORDER BY at DESC LIMIT ?)", (model, t, RECENT_RUNS)).fetchone()
+            if exact[1]:
+                rate = exact[0] / exact[1]
+            else:
+                other = self._db.execute(
+                    "SELECT SUM(audio_secs), SUM(wall_secs), AVG(threads) FROM ("
+                    " SELECT audio_secs, wall_secs, threads FROM runs WHERE model = ?"
+                    " ORDER BY at DESC LIMIT ?)", (model, RECENT_RUNS)).fetchone()
+                rate = (other[0] / other[1] * min(2.0, max(0.5, t / other[2]))
+                        if other[1] else None)
+            self._rates[key] = rate
+            return rate
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def plan(durations, rate: float | None, jobs: int = 1) -> dict:
+    """
+    Dry-run estimate for a queue.  *durations* are seconds of audio per
+    file and *rate* the learned speed of one job.  With several jobs the
+    queue cannot finish before its longest file, so the estimate is the
+    larger of the even split and that file.
+    """
+    durations = list(durations)
+    audio = sum(durations)
+    est = {
+        "files":       len(durations),
+        "unknown":     sum(1 for d in durations if d <= 0),
+        "audio_secs":  round(audio, 1),
+        "jobs":        jobs,
+        "rate":        round(rate, 2) if rate else None,
+        "expected_secs": None,
+    }
+    if rate:
+        est["expected_secs"] = round(max(audio / (rate * max(1, jobs)),
+                                         max(durations, default=0) / rate), 1)
+    return est
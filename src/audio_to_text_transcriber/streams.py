@@ -0,0 +1,139 @@
+# streams.py
+"""
+Read a whisper-cli process's stdout and stderr from one thread.
+
+Both pipes are drained in large non-blocking reads through ``selectors``,
+decoded incrementally and split on ``\\r`` / ``\\n`` as data arrives.  The
+caller gets a flat stream of events instead of raw text:
+
+    ("segment",  "[00:00:00.000 --> 00:00:02.000]   Hello")
+    ("progress", 42.0)
+
+Segment events are only a live preview; the saved transcript comes from
+whisper-cli's JSON file (see ``segments``).  whisper-cli writes that file
+only when it exits, so while it runs stdout is still the one source of
+finished segments: they feed the row's log and the ``.partial`` file a
+crash leaves behind.  Readers that need no preview (the parts of a split
+file) pass ``segments=False`` and stdout is drained unparsed.
+"""
+import codecs
+import collections
+import os
+import re
+import selectors
+
+SEGMENT  = "segment"
+PROGRESS = "progress"
+
+READ_SIZE = 1 << 16
+STDERR_TAIL = 20            # stderr lines kept for the error message
+
+_NEWLINES = re.compile(r"[\r\n]")
+_PROGRESS = re.compile(r"progress\s*=\s*([\d.]+)%")
+_TS_LINE  = re.compile(r"^\[\d\d:\d\d:\d\d")
+_LOG_PREFIXES = ("whisper_", "system_info", "main:", "whisper_print_timings")
+
+
+def keep_line(line: str, timestamps: bool) -> bool:
+    """Is this stdout line real transcript (and not a whisper log line)?"""
+    if not line.strip():
+        return False
+    if timestamps:
+        # we expect the [hh:mm:ss.xxx --> yy:...] format
+        return bool(_TS_LINE.match(line))
+    # without timestamps: reject lines that *look* like logs
+    return not line.lstrip().startswith(_LOG_PREFIXES)
+
+
+class LineSplitter:
+    """Incremental UTF-8 decoder that cuts text into ``\\r``/``\\n`` lines."""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._tail = ""
+
+    def feed(self, data: bytes) -> list[str]:
+        parts = _NEWLINES.split(self._tail + self._decoder.decode(data))
+        self._tail = parts.pop()
+        return parts
+
+    def close(self) -> list[str]:
+        rest = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        return [rest] if rest else []
+
+
+class ProcessReader:
+    """
+    Multiplexes *proc*'s binary stdout/stderr pipes.  Iterate ``events()``
+    until it finishes; ``stderr_tail`` then holds the last stderr lines.
+    """
+
+    def __init__(self, proc, timestamps: bool = True, segments: bool = True):
+        self.proc = proc
+        self.timestamps = timestamps
+        self.segments = segments
+        self.stderr_tail = collections.deque(maxlen=STDERR_TAIL)
+
+    def events(self, cancelled=None, poll: float = 0.25):
+        """
+        Yield ``(SEGMENT, line)`` and ``(PROGRESS, pct)`` events until both
+        pipes reach EOF.  *cancelled* is polled at least every *poll*
+        seconds; when it returns True the generator stops early.
+        """
+        sel = selectors.DefaultSelector()
+        splitters = {}
+        for pipe in (self.proc.stdout, self.proc.stderr):
+            if pipe is None:
+                continue
+            os.set_blocking(pipe.fileno(), False)
+            sel.register(pipe, selectors.EVENT_READ)
+            splitters[pipe] = LineSplitter()
+        last_pct = None
+        try:
+            while splitters:
+                if cancelled and cancelled():
+                    return
+                for key, _ in sel.select(timeout=poll):
+                    pipe = key.fileobj
+                    try:
+                        data = os.read(pipe.fileno(), READ_SIZE)
+                    except BlockingIOError:
+                        continue
+                    if pipe is self.proc.stdout and not self.segments:
+                        if not data:
+                            splitters.pop(pipe)
+                            sel.unregister(pipe)
+                        continue                # drained, not parsed
+                    if data:
+                        lines = splitters[pipe].feed(data)
+                    else:                       # EOF
+                        lines = splitters.pop(pipe).close()
+                        sel.unregister(pipe)
+                    if pipe is self.proc.stdout:
+                        for line in lines:
+                            if keep_line(line, self.timestamps):
+                                yield SEGMENT, line.rstrip()
+                    else:
+                        pct = self._last_progress(lines)
+                        if pct is not None and pct != last_pct:
+                            last_pct = pct
+                            yield PROGRESS, pct
+        finally:
+            sel.close()
+
+    def _last_progress(self, lines):
+        """Only the newest % of a chunk matters; everything else is log."""
+        pct = None
+        for line in lines:
+            if "progress" in line:
+                m = _PROGRESS.search(line)
+                if m:
+                    pct = float(m.group(1))
+                    continue
+            if line.strip():
+                self.stderr_tail.append(line)
+        return pct
+
+    def error_text(self) -> str:
+        return "\n".join(self.stderr_tail).strip()
@@ -1,18 +1,34 @@
 # transcribe.py
 import gi
+import itertools
+import math
 import os
-import re
+import queue
 import subprocess
 import threading
-import yaml
 import shutil
+import signal
+import tempfile
 import time
-from pathlib import Path
+import traceback
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, GLib, Gio, Gdk, Adw, GObject
 
-from .helpers import human_path as _hp
+from .helpers import human_path as _hp, transcript_dest, fmt_secs, AUDIO_EXTS
+from .helpers import whisper_layout
+from .priority import usable_cpus, partition, command_prefix
+from .transcript_writer import TranscriptWriter, find_partials, recover_partial
+from .streams import ProcessReader, SEGMENT
+from .segments import json_args, read_json, render
+from .chunking import detect_silences, plan_chunks, extract_chunk, stitch, strip_timestamps
+from .vad import speech_spans, plan_speech, MOSTLY_SPEECH
+from .whisper_server import WhisperServer
+from .prefetch import Prefetcher, WAV_BYTES_PER_SEC
+from .speed import plan
+from .watch import FolderWatcher
+from .governor import MemoryGovernor, run_footprint_mb
+from .model import MODEL_SIZE_MB
 
 def on_add_audio(self, _):
     choice_dialog = Adw.AlertDialog(
@@ -38,8 +54,8 @@ def _select_audio_files(self):
     dialog.set_accept_label("Add")
     f = Gtk.FileFilter()
     f.set_name("Audio Files")
-    for ext in ("*.mp3", "*.wav", "*.flac", "*.m4a", "*.ogg", "*.opus"):
-        f.add_pattern(ext)
+    for ext in AUDIO_EXTS:
+        f.add_pattern("*" + ext)
     filters = Gio.ListStore()
     filters.append(f)
     dialog.set_filters(filters)
@@ -55,10 +71,7 @@ def _on_add_files_response(self, dialog, result):
     try:
         files = dialog.open_multiple_finish(result)
         new_paths = self._collect_audio_files(files)
-        for fn in new_paths:
-            if fn not in [item['path'] for item in self.progress_items]:
-                self.audio_store.append(fn)
-                self.add_file_to_list(os.path.basename(fn), fn)
+        self._enqueue_paths(new_paths)
         if new_paths:
             toast = Adw.Toast(title=f"Added {len(new_paths)} file(s)")
             toast.set_timeout(3)
@@ -71,10 +84,7 @@ def _on_add_folders_response(self, dialog, result):
     try:
         folders = dialog.select_multiple_folders_finish(result)
         new_paths = self._collect_audio_files(folders)
-        for fn in new_paths:
-            if fn not in [item['path'] for item in self.progress_items]:
-                self.audio_store.append(fn)
-                self.add_file_to_list(os.path.basename(fn), fn)
+        self._enqueue_paths(new_paths)
         if new_paths:
             toast = Adw.Toast(title=f"Added {len(new_paths)} file(s)")
             toast.set_timeout(3)
@@ -83,14 +93,30 @@ def _on_add_folders_response(self, dialog, result):
     except GLib.Error:
         pass
 
+def _enqueue_paths(self, paths):
+    """Append *paths* to the queue (UI rows + job journal); returns those added."""
+    rows = {}
+    for fn in paths:
+        if fn not in self.progress_items and fn not in rows:
+            rows[fn] = self._new_file_data(fn)
+    self.progress_items.extend(rows.values())      # one items-changed for all of them
+    added = list(rows)
+    self.journal.add(added)
+    # durations / codecs in the background – totals and ETA need them later
+    self.media.probe_async(
+        added, lambda p, info: GLib.idle_add(self._show_media_info, rows[p], info))
+    self._schedule_queue_total()
+    if getattr(self, 'is_transcribing', False):
+        self._join_running_batch(added)
+    return added
+
 def _collect_audio_files(self, files):
-    audio_ext = (".mp3", ".wav", ".flac", ".m4a", ".ogg", ".opus")
     found = []
-    seen = set(self.audio_store.get_string(i) for i in range(self.audio_store.get_n_items()))
-    seen.update(item['path'] for item in self.progress_items)
+    seen = set()
     def _add_if_ok(p):
         path = p.get_path() if isinstance(p, Gio.File) else p
-        if path and path.lower().endswith(audio_ext) and path not in seen:
+        if (path and path.lower().endswith(AUDIO_EXTS)
+                and path not in seen and path not in self.progress_items):
             found.append(path)
             seen.add(path)
     for p in files:
@@ -106,7 +132,7 @@ def _collect_audio_files(self, files):
 def on_remove_audio(self, action, param):
     if not self.progress_items:
         return
-    if self.current_proc and self.current_proc.poll() is None:
+    if self._procs_running():
         dialog = Adw.AlertDialog(
             heading="Confirm Removal of All Files",
             body="A transcription is currently in progress. Do you want to stop the transcription and remove all audio files?"
@@ -122,33 +148,27 @@ def on_remove_audio(self, action, param):
 def _on_remove_all_response(self, dialog, response):
     if response == "remove":
         self.cancel_flag = True
-        if self.current_proc and self.current_proc.poll() is None:
-            try:
-                self.current_proc.terminate()
-                self.current_proc.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self.current_proc.kill()
+        self._stop_all_procs(wait=True)
         self._remove_all_files()
 
 def _remove_all_files(self):
-    for file_data in self.progress_items:
-        self.files_group.remove(file_data['row'])
     self.progress_items.clear()
-    self.audio_store.splice(0, self.audio_store.get_n_items(), [])
+    self.journal.clear()
+    self._schedule_queue_total()
     self._show_no_files_message()
 
 def on_transcribe(self, _):
     if self.trans_btn.get_label() == "Cancel":
         self.cancel_flag = True
-        if self.current_proc:
-            try:
-                self.current_proc.terminate()
-            except:
-                pass
+        self._stop_all_procs()
         self._gui_status("Cancelling...")
         return
 
 
+    if self.is_tuning:
+        self._error("Wait for speed tuning to finish.")
+        return
+
     self._reset_rows_if_needed()
 
     selected_index = self.model_combo.get_selected()
@@ -167,7 +187,7 @@ def on_transcribe(self, _):
         return
 
     # Queue in *visual* order (top‑to‑bottom in the list)
-    files = [item['path'] for item in self.progress_items]
+    files = self.progress_items.paths()
     out_dir = getattr(self, 'output_directory', None) or os.path.expanduser("~/Downloads")
 
     if not files:
@@ -181,8 +201,7 @@ def on_transcribe(self, _):
     conflicting_files = []
     non_conflicting_files = []
     for file_path in files:
-        filename = os.path.basename(file_path)
-        dest = os.path.join(out_dir, os.path.splitext(filename)[0] + "_transcribed.txt")
+        dest = transcript_dest(out_dir, file_path)
         if os.path.isfile(dest) and os.path.getsize(dest) > 0:
             conflicting_files.append(file_path)
         else:
@@ -202,6 +221,34 @@ def on_transcribe(self, _):
     else:
         self._start_transcription(files, model_path, out_dir, core)
 
+def on_plan(self, action, param):
+    """Dry run: how long would the current queue take with these settings?"""
+    if not self.progress_items:
+        self._error("No audio files selected.")
+        return
+    core = self._get_model_name()
+    jobs = max(1, int(getattr(self, 'parallel_jobs', 1)))
+    threads, processors = whisper_layout(jobs, self.tuning.get(core))
+    durations = [fd['media'].duration if fd.get('media') else 0.0
+                 for fd in self.progress_items]
+    est = plan(durations, self.speed.rate(core, threads), jobs)
+
+    lines = [f"{est['files']} file(s) · {fmt_secs(est['audio_secs'])} of audio"]
+    if est['unknown']:
+        lines[0] += f" ({est['unknown']} not measured yet)"
+    lines.append(f"{self._display_name(core)} · {jobs} job(s)"
+                 + (f" × {threads} threads" if threads else "")
+                 + (f" × {processors} processors" if processors > 1 else ""))
+    if est['expected_secs'] is None:
+        lines.append("No speed recorded for this model yet – it is learned "
+                     "from the first transcription.")
+    else:
+        lines.append(f"Learned speed: {est['rate']:g}× real time per job")
+        lines.append(f"Expected time: about {fmt_secs(est['expected_secs'])}")
+    dialog = Adw.AlertDialog(heading="Estimated Time", body="\n".join(lines))
+    dialog.add_response("ok", "OK")
+    dialog.present(self.window)
+
 def _reset_rows_if_needed(self):
     for file_data in self.progress_items:
         default_sub = _hp(os.path.dirname(file_data['path'])) or "Local File"
@@ -210,9 +257,10 @@ def _reset_rows_if_needed(self):
         #   • the previous icon shows a cancelled / error status
         #   • OR the subtitle isn’t the default one any more
         if file_data['status'] in ('error', 'cancelled') \
-           or file_data['row'].get_subtitle() != default_sub:
+           or file_data['subtitle'] != default_sub:
 
             # Clear any old log text
+            file_data['log'].clear()
             if file_data['buffer']:
                 file_data['buffer'].set_text("")
 
@@ -231,10 +279,10 @@ def _on_conflict_response(self, response, conflicting_files, non_conflicting_fil
 
     elif response == "skip":
         for fp in conflicting_files:
-            file_data = next((i for i in self.progress_items if i['path'] == fp), None)
+            file_data = self.progress_items.get(fp)
             if file_data:
-                GLib.idle_add(self.update_file_status, file_data,
-                              'skipped', "Skipped due to existing transcription")
+                self.ui_updates.status(file_data, 'skipped',
+                                       "Skipped due to existing transcription")
         wanted = _ordered_subset(set(non_conflicting_files))
         self._start_transcription(wanted, model_path, out_dir, core)
 
@@ -256,9 +304,9 @@ def _start_transcription(self, files, model_path, out_dir, core):
     # timer id for the GLib timeout; 0 / None means “no timer running”
     self.countdown_source = None
     # ── length‑aware progress bookkeeping ───────────────────────────────
-    self.total_secs       = sum(_audio_seconds(f) for f in files) or 1
+    self.total_secs       = None     # set by _settle_total once durations are known
     self.done_secs        = 0.0      # seconds already fully processed
-    self.cur_file_secs    = 0.0      # duration of the file currently in flight
+    self.inflight_secs    = {}       # path / (path, part) → (duration, pct) in flight
     self.overall_pct      = 0.0
     self.finish_time      = None
 
@@ -267,34 +315,18 @@ def _start_transcription(self, files, model_path, out_dir, core):
     GLib.idle_add(self.add_more_button.set_visible, False)
 
     GLib.idle_add(self.progress_lbl.set_visible, True)
-    GLib.idle_add(self.progress_lbl.set_markup, "<b>Transcribing…</b>")
+    self.ui_updates.overall("<b>Transcribing…</b>")
 
     # kick off the once‑per‑sec countdown
     if self.countdown_source:            # just in case one is still active
         GLib.source_remove(self.countdown_source)
     self.countdown_source = GLib.timeout_add_seconds(1, self._update_eta)
 
+    self.journal.start_batch(files, core, self._whisper_flags(), out_dir)
+
     GLib.idle_add(self.status_lbl.set_label, "Transcription Started")
     threading.Thread(target=self._worker, args=(model_path, files, out_dir, core), daemon=True).start()
 
-# ── util: get duration (seconds) of an audio file ────────────────────────────
-def _audio_seconds(path: str) -> float:
-    """
-    Return length of an audio file in seconds using ffprobe.
-    Return 0 if duration cannot be determined.
-    """
-    try:
-        out = subprocess.check_output(
-            ["ffprobe", "-v", "error", "-show_entries",
-             "format=duration", "-of",
-             "default=nw=1:nk=1", path],
-            text=True,
-            stderr=subprocess.DEVNULL
-        )
-        return max(0.0, float(out.strip()))
-    except Exception:
-        return 0.0
-
 
 def _update_eta(self):
     """Update the bold ETA label once a second."""
@@ -312,188 +344,212 @@ def _update_eta(self):
     m, s   = divmod(rem, 60)
     eta    = f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
 
-    GLib.idle_add(
-        self.progress_lbl.set_markup,
-        f"<b>{int(self.overall_pct)}% (~{eta})</b>"
-    )
+    self.ui_updates.overall(f"<b>{int(self.overall_pct)}% (~{eta})</b>")
     return True                          # keep the timeout running
 
 
-def _worker(self, model_path, files, out_dir, core):
-    if not self.bin_path:
-        self._error("Cannot find 'whisper-cli', run ./build.sh")
-        return
+def _procs_running(self) -> bool:
+    with self._procs_lock:
+        return any(p.poll() is None for p in self.current_procs)
 
-    total = len(files)
-    for idx, file_path in enumerate(files, 1):
-        self._file_start_time = time.time()  
-        if self.cancel_flag:
-            continue
-        filename = os.path.basename(file_path)
-        self._gui_status(f"{idx}/{total} – {filename}")
 
-        file_data = next((item for item in self.progress_items if item['path'] == file_path), None)
-        if not file_data or 'buffer' not in file_data or not file_data['buffer']:
-            GLib.idle_add(self._error, f"Invalid or missing file_data for {filename}")
+def _whisper_pids(self) -> list[int]:
+    with self._procs_lock:
+        return [p.pid for p in self.current_procs if p.poll() is None]
+
+
+def _stop_all_procs(self, wait: bool = False):
+    """Terminate every in-flight whisper-cli process of the pool."""
+    with self._procs_lock:
+        procs = list(self.current_procs)
+    for proc in procs:
+        if proc.poll() is not None:
             continue
+        try:
+            proc.terminate()
+            if wait:
+                proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        except Exception:
+            pass
+
 
-        GLib.idle_add(self.update_file_status, file_data, 'processing', f"Transcribing ({idx}/{total})...")
-
-        # length of this file (seconds) for overall % / ETA
-        self.cur_file_secs = _audio_seconds(file_path)
-
-        cmd = [self.bin_path, "-m", model_path, "-f", file_path, "-pp"]
-        if not self.ts_enabled:
-            cmd.append("-nt")
-
-        # keep the streams separate:
-        #   · stdout  → transcript (plus a few noisy lines we’ll drop)
-        #   · stderr  → progress updates + errors
-        self.current_proc = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            errors='replace'
+def _record_progress(self, key, pct_f):
+    """
+    Update the % of the file (or chunk) *key* and recompute the overall %
+    and finish time.  Called from several stderr watchers at once, so all
+    bookkeeping happens under ``_progress_lock``.  Returns the ETA string.
+    """
+    with self._progress_lock:
+        secs, _ = self.inflight_secs.get(key, (0.0, 0.0))
+        self.inflight_secs[key] = (secs, pct_f)
+        if not self.total_secs:
+            return None
+
+        processed_secs = self.done_secs + sum(
+            d * p / 100.0 for d, p in self.inflight_secs.values()
         )
+        overall_pct = min(100.0, processed_secs / self.total_secs * 100.0)
+        if processed_secs <= 0:
+            return None
 
-        # ── WATCH STDERR FOR PERCENT, LIVE ───────────────────────────
-        def _watch_stderr(proc, row, idx, total):
-            buf      = ""           # rolling buffer holding the current line
-            last_pct = None         # last % we showed, to avoid spam
-
-            while True:
-                ch = proc.stderr.read(1)          # read *one* char at a time
-                if not ch:                        # EOF – done
-                    # process whatever is left in buf once more
-                    _maybe_update(buf, row, idx, total, last_pct)
-                    break
-
-                if ch in ("\r", "\n"):            # line boundary
-                    last_pct = _maybe_update(buf, row, idx, total, last_pct)
-                    buf = ""                      # start fresh
-                else:
-                    buf += ch
+        elapsed   = time.time() - self.job_start_time
+        done_frac = processed_secs / self.total_secs
+        remaining = elapsed / done_frac - elapsed
+        if self._rate:
+            # trust the learned speed early on, the observed one later
+            learned   = (self.total_secs - processed_secs) / (self._rate * self._jobs)
+            remaining = done_frac * remaining + (1 - done_frac) * learned
+        remaining = max(1, int(remaining))
+        self.overall_pct = overall_pct
+        self.finish_time = self.job_start_time + elapsed + remaining
 
-        def _maybe_update(line, row, idx, total, last_pct):
-            m = re.search(r"progress\s*=\s*([\d.]+)%", line)
-            if not m:
-                return last_pct
+    h, remaining = divmod(remaining, 3600)
+    m, s = divmod(remaining, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
 
-            pct_str = m.group(1)
-            if pct_str == last_pct:
-                return last_pct
 
-            pct_f   = float(pct_str)                 # current file %
+# queue lanes: chunks of a file that is already being worked on go first,
+# then files marked urgent, then the rest of the batch
+LANE_CHUNK, LANE_URGENT, LANE_FILE = 0, 1, 2
 
-            # ---------- length‑based progress --------------------------------
-            processed_secs = self.done_secs + self.cur_file_secs * pct_f / 100.0
-            overall_pct    = processed_secs / self.total_secs * 100.0
 
-            elapsed   = time.time() - self.job_start_time
-            remaining = max(1, int(elapsed / (processed_secs / self.total_secs) - elapsed))
-            h, remaining = divmod(remaining, 3600)
-            m, s = divmod(remaining, 60)
-            eta  = f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+def _queue_task(self, pending, lane, task, weight=0.0):
+    pending.put((lane, weight, next(self._task_seq), task))
 
-            GLib.idle_add(
-                row.set_subtitle,
-                f"Transcribing ({idx}/{total}) — {pct_str}%"
-            )
-            self.overall_pct = overall_pct
-            self.finish_time = self.job_start_time + elapsed + remaining
-            GLib.idle_add(
-                self.progress_lbl.set_markup,
-                f"<b>{int(overall_pct)}% (~{eta})</b>"
-            )
-            return pct_str
 
-        threading.Thread(
-            target=_watch_stderr,
-            args=(self.current_proc, file_data['row'], idx, total),
-            daemon=True
-        ).start()
+def _queue_weight(self, path):
+    """
+    Position of *path* inside its lane.  Longest-first packs the parallel
+    jobs so no long file is left running alone at the end; shortest-first
+    finishes the most files soonest.  Only already-probed durations are
+    used – files still unmeasured go last.
+    """
+    order = getattr(self, 'queue_order', 'listed')
+    if order not in ('longest', 'shortest'):
+        return 0.0
+    info = self.media.cached(path)
+    secs = info.duration if info else 0.0
+    if order == 'longest':
+        return -secs
+    return secs or math.inf
 
-        # ── READ stdout and keep only the real transcript ───────────
-        ts_line   = re.compile(r"^\[\d\d:\d\d:\d\d")   # with timestamps
 
-        for line in self.current_proc.stdout:
-            if self.cancel_flag:
-                try:
-                    self.current_proc.terminate()
-                except:
-                    pass
-                GLib.idle_add(self.update_file_status, file_data, 'error', "Cancelled")
-                GLib.idle_add(self.add_log_text, file_data, "Transcription cancelled")
-                break
-
-            # 1. drop completely empty lines
-            if not line.strip():
-                continue
+def _queue_file(self, pending, path):
+    file_data = self.progress_items.get(path)
+    urgent = bool(file_data and file_data['urgent'])
+    self._queue_task(pending, LANE_URGENT if urgent else LANE_FILE,
+                     ('file', self._batch[path], path), self._queue_weight(path))
 
-            # 2. keep only “real” transcript lines
-            keep = False
-            if self.ts_enabled:
-                # we expect the [hh:mm:ss.xxx --> yy:...] format
-                keep = bool(ts_line.match(line))
-            else:
-                # without timestamps: reject lines that *look* like logs
-                keep = not line.lstrip().startswith(("whisper_", "system_info",
-                                                     "main:", "whisper_print_timings"))
 
-            if keep:
-                GLib.idle_add(self.add_log_text, file_data, line.rstrip())
+def _promote_file(self, file_data):
+    """Move a waiting file of the running batch into the urgent lane."""
+    path = file_data['path']
+    with self._progress_lock:
+        if self._pending is None or path not in self._batch or path in self._started:
+            return False
+        # the old entry stays queued and is skipped once the file has run
+        self._queue_task(self._pending, LANE_URGENT, ('file', self._batch[path], path))
+    return True
 
-        self.current_proc.stdout.close()
-        self.current_proc.wait()
 
-        # update counters for length‑aware progress
-        self.done_secs += self.cur_file_secs
-        self.cur_file_secs = 0.0      # reset for next iteration
+def _join_running_batch(self, paths):
+    """Queue files added during a batch into it rather than the next one."""
+    out_dir = getattr(self, 'output_directory', None) or os.path.expanduser("~/Downloads")
+    joined = []
+    with self._progress_lock:
+        if self._pending is None:
+            return
+        for path in paths:
+            dest = transcript_dest(out_dir, path)
+            if path in self._batch or (os.path.isfile(dest) and os.path.getsize(dest) > 0):
+                continue                     # never overwrite without asking
+            self._batch[path] = len(self._batch) + 1
+            self._queue_file(self._pending, path)
+            joined.append(path)
+    if joined:
+        threading.Thread(target=self._grow_total, args=(joined,), daemon=True).start()
+
+
+def _grow_total(self, paths):
+    secs = sum(self.media.duration(p) for p in paths)
+    with self._progress_lock:
+        self._added_secs += secs
+        if self.total_secs:
+            self.total_secs += secs
 
-        if self.cancel_flag:
-            GLib.idle_add(self.update_file_status, file_data, 'error', "Cancelled")
-        else:
-            if self.current_proc.returncode != 0:
-                # read remaining stderr so we can show the error
-                err_msg = self.current_proc.stderr.read().strip()
-                GLib.idle_add(
-                    self.update_file_status,
-                    file_data, 'error',
-                    f"Failed (exit {self.current_proc.returncode})"
-                )
-                GLib.idle_add(
-                    self.add_log_text,
-                    file_data,
-                    f"ERROR: {err_msg or 'process exited with code ' + str(self.current_proc.returncode)}"
-                )
-            else:
-                dest_path = os.path.join(out_dir,
-                                        os.path.splitext(filename)[0] + "_transcribed.txt")
-                buffer    = file_data['buffer']          # local alias – crucial!
-                file_data['transcript_path'] = dest_path 
-
-                def _save(buf=buffer, dest=dest_path):
-                    if buf and buf.get_char_count() > 0:
-                        txt = buf.get_text(buf.get_start_iter(), buf.get_end_iter(), False)
-                        try:
-                            with open(dest, "w", encoding="utf-8") as f:
-                                f.write(txt)
-                        except Exception as e:
-                            print(f"Failed to save {dest}: {e}")
-                        # register in Transcripts pane exactly once
-                        if dest not in (item['path'] for item in self.transcript_items):
-                            GLib.idle_add(self.add_transcript_to_list,
-                                          os.path.basename(dest), dest)
-                    return False                         # stop the idle handler
-
-                GLib.idle_add(_save)
-                GLib.idle_add(self.update_file_status, file_data, 'completed', "Completed successfully")
-                # Allow GC to reclaim memory – the text now lives on disk
-                file_data['buffer'] = None
-                file_data['view']   = None    
 
+def _worker(self, model_path, files, out_dir, core):
+    if not self.bin_path:
+        self._error("Cannot find 'whisper-cli', run ./build.sh")
+        return
+
+    if getattr(self, 'engine', 'cli') == 'server' and not self.server_bin_path:
+        GLib.idle_add(self._error, "Cannot find 'whisper-server', using whisper-cli")
+
+    total = len(files)
+    jobs  = max(1, int(getattr(self, 'parallel_jobs', 1)))
+    if not (getattr(self, 'chunking_enabled', False) or getattr(self, 'vad_enabled', False)):
+        jobs = min(jobs, total)      # extra slots only help with chunks
+    # whisper runs only on these cores (all of them unless limited in Settings)
+    self._cpus = usable_cpus(getattr(self, 'worker_cpus', ''),
+                             getattr(self, 'reserve_ui_core', False))
+    limited = len(self._cpus) < (os.cpu_count() or 1)
+    # only override whisper's own -t default once the cores are shared,
+    # or with the layout the autotuner measured for this many jobs
+    threads, self._processors = whisper_layout(jobs, self.tuning.get(core),
+                                               len(self._cpus) if limited else None)
+    # learned speed → an ETA before the first progress line arrives
+    self._rate, self._jobs = self.speed.rate(core, threads), jobs
+    # hold slots back while memory is short instead of letting the OOM killer decide
+    family = core.split(".", 1)[0].split("-")[0]
+    self._governor = MemoryGovernor(run_footprint_mb(model_path, MODEL_SIZE_MB.get(family, 0)),
+                                    self._whisper_pids)
+    short = self._governor.check()
+    if short:
+        GLib.idle_add(self._error, f"Low memory: {short} – transcription may fail")
+    elif self._governor.capacity(jobs) < jobs:
+        self._gui_status(f"Memory allows {self._governor.capacity(jobs)} of {jobs} "
+                         "parallel jobs for now")
+
+    pending = queue.PriorityQueue()
+    self._task_seq = itertools.count()
+    self._chunk_jobs = {}
+    with self._progress_lock:
+        self._batch = {p: idx for idx, p in enumerate(files, 1)}    # path → number shown
+        self._started = set()
+        self._added_secs = 0.0
+        for file_path in files:
+            self._queue_file(pending, file_path)
+        self._pending = pending              # open for promotions and late additions
+    threading.Thread(target=self._settle_total, args=(files,), daemon=True).start()
+
+    # convert the next few files to 16 kHz WAV while the current ones run,
+    # in the order the workers will take them
+    ahead = int(getattr(self, 'prefetch_files', 0))
+    upcoming = [task[-1] for *_, task in sorted(pending.queue)]
+    self._prefetch = Prefetcher(upcoming, ahead, self._prefetch_size) if ahead > 0 else None
+
+    pool = [
+        threading.Thread(
+            target=self._worker_loop,
+            args=(pending, model_path, core, out_dir, threads, slot),
+            daemon=True,
+        )
+        for slot in range(jobs)
+    ]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    with self._progress_lock:
+        self._pending = None
+
+    if self._prefetch:
+        self._prefetch.close()               # kills ffmpeg, removes temp WAVs
+        self._prefetch = None
+    self._discard_chunk_jobs()
     GLib.idle_add(self._unlock_settings_now)
 
     if self.cancel_flag:
@@ -508,10 +564,713 @@ def _worker(self, model_path, files, out_dir, core):
         self._gui_status("Done")
         GLib.idle_add(self.trans_btn.set_label, "Transcription Complete")
         GLib.idle_add(self.trans_btn.set_visible, False) 
-        GLib.idle_add(self.progress_lbl.set_markup, "<b>Transcription Complete</b>")
+        self.ui_updates.overall("<b>Transcription Complete</b>")
         if self.countdown_source:
             GLib.source_remove(self.countdown_source)
             self.countdown_source = None
         GLib.idle_add(self.trans_btn.set_sensitive, False)
 
 
+def _settle_total(self, files):
+    """
+    Sum the batch's audio length.  Usually every duration is cached by the
+    probe that ran when the files were added; any still in flight are
+    waited for here, off the work path (no % / ETA until then).
+    """
+    durations = [self.media.duration(f) for f in files]
+    est = plan(durations, self._rate, self._jobs)
+    with self._progress_lock:
+        self.total_secs = sum(durations) + self._added_secs or 1
+        if est['expected_secs'] and not self.finish_time:
+            self.finish_time = self.job_start_time + est['expected_secs']
+
+
+def _worker_loop(self, pending, model_path, core, out_dir, threads, slot=0):
+    """
+    One slot of the pool.  Runs until the queue is empty *and* no other
+    slot is still busy – a busy slot may be about to queue chunks.
+    """
+    while True:
+        try:
+            *_, task = pending.get(timeout=0.2)
+        except queue.Empty:
+            with self._progress_lock:        # late additions queue under this lock
+                if pending.unfinished_tasks == 0:
+                    self._pending = None
+                    return
+            continue
+        try:
+            if self.cancel_flag:
+                continue
+            with self._progress_lock:
+                total = len(self._batch)
+                if task[0] == 'file':
+                    if task[2] in self._started:
+                        continue             # left behind when it was promoted
+                    self._started.add(task[2])
+            if not self._admit(slot):
+                continue                     # cancelled while waiting for memory
+            try:
+                if task[0] == 'chunk':
+                    _, idx, file_path, chunk_no = task
+                    self._transcribe_chunk(idx, total, file_path, chunk_no,
+                                           model_path, core, out_dir, threads, slot)
+                else:
+                    _, idx, file_path = task
+                    try:
+                        self._transcribe_file(idx, total, file_path, model_path, core,
+                                              out_dir, threads, slot, pending)
+                    finally:
+                        if self._prefetch:
+                            self._prefetch.release(file_path)
+            except Exception as e:
+                # one broken file must not take the slot (and the rest of the queue) with it
+                self._task_failed(task, e)
+            finally:
+                self._governor.release(slot)
+        finally:
+            pending.task_done()
+
+
+def _task_failed(self, task, exc):
+    """Mark the file of a task that raised as failed; its slot carries on."""
+    traceback.print_exc()
+    file_path = task[2]
+    with self._progress_lock:
+        # the file and all of its parts count as done, or the batch never reaches 100 %
+        for key in [k for k in self.inflight_secs
+                    if k == file_path or (isinstance(k, tuple) and k[0] == file_path)]:
+            secs, _ = self.inflight_secs.pop(key)
+            self.done_secs += secs
+        job = self._chunk_jobs.pop(file_path, None)
+    if job:
+        shutil.rmtree(job['tmpdir'], ignore_errors=True)   # its other parts are skipped
+    file_data = self.progress_items.get(file_path)
+    if file_data:
+        self.ui_updates.status(file_data, 'error', "Failed (internal error)")
+        self.ui_updates.line(file_data, f"ERROR: {exc!r}")
+    GLib.idle_add(self._error, f"{os.path.basename(file_path)}: {exc}")
+
+
+def _admit(self, slot) -> bool:
+    """Wait until memory allows *slot* another whisper run."""
+    srv = self._servers.get(slot)
+    loaded = self._use_server() and srv is not None and srv.alive()
+    return self._governor.admit(
+        slot, 0.0 if loaded else None,       # a resident server already holds its model
+        cancelled=lambda: self.cancel_flag,
+        on_wait=lambda why: self._gui_status(f"Waiting for memory – {why}"),
+    )
+
+
+def _prefetch_size(self, path):
+    """Expected WAV bytes for *path*; None lets whisper read the original."""
+    info = self.media.get(path)
+    if getattr(self, 'vad_enabled', False) or self._should_chunk(info.duration):
+        return None                          # ffmpeg cuts it into parts anyway
+    if (info.codec, info.sample_rate, info.channels) == ("pcm_s16le", 16000, 1):
+        return None                          # already what whisper wants
+    return int(info.duration * WAV_BYTES_PER_SEC)
+
+
+def _transcribe_file(self, idx, total, file_path, model_path, core, out_dir,
+                     threads=None, slot=0, pending=None):
+    filename = os.path.basename(file_path)
+    self._gui_status(f"{idx}/{total} – {filename}")
+
+    file_data = self.progress_items.get(file_path)
+    if not file_data:
+        GLib.idle_add(self._error, f"Invalid or missing file_data for {filename}")
+        return
+
+    self.ui_updates.status(file_data, 'processing', f"Transcribing ({idx}/{total})...")
+
+    # length of this file (seconds) for overall % / ETA; in flight until it
+    # is done, handed on to its parts, or failed (see _task_failed)
+    secs = self.media.duration(file_path)
+    with self._progress_lock:
+        self.inflight_secs[file_path] = (secs, 0.0)
+
+    def _done(finished=True):
+        with self._progress_lock:
+            left, _ = self.inflight_secs.pop(file_path, (0.0, 0.0))
+            if finished:
+                self.done_secs += left
+
+    cache_key = self._cache_key(file_path, core)
+    if cache_key and self._serve_from_cache(file_data, cache_key, out_dir):
+        _done()
+        return
+
+    if pending is not None and getattr(self, 'vad_enabled', False) and secs > 0:
+        if self._split_at_speech(idx, total, file_data, file_path, secs, pending,
+                                 out_dir, cache_key):
+            _done(finished=False)            # its parts and the skipped silence count instead
+            return
+
+    if pending is not None and self._should_chunk(secs):
+        self._split_into_chunks(idx, total, file_data, file_path, secs, pending, cache_key)
+        _done(finished=False)
+        return
+
+    writer = self._open_writer(file_data, out_dir)
+    if writer is None:
+        _done()
+        return
+
+    def _on_status(text, pct=None):
+        self.ui_updates.subtitle(file_data, f"Transcribing ({idx}/{total}) — {text}")
+
+    def _on_line(line):
+        writer.write(line)                                # disk is the source of truth
+        self.ui_updates.line(file_data, line)             # live tail only
+
+    audio = self._prefetch.take(file_path) if self._prefetch else None
+    started = time.monotonic()
+    try:
+        returncode, err_msg, lines = self._run_engine(audio or file_path, file_path, model_path,
+                                                      threads, slot, self.ts_enabled,
+                                                      _on_line, _on_status)
+        if returncode == 0 and not self.cancel_flag:
+            writer.replace(lines)            # the live lines were only a preview
+            self.speed.record(core, threads, secs, time.monotonic() - started)
+    except BaseException:
+        writer.abort()                       # not a crash leftover for find_partials
+        raise
+
+    # update counters for length‑aware progress
+    _done()
+
+    self._finish_file(file_data, writer, returncode, err_msg, cache_key)
+
+
+def _open_writer(self, file_data, out_dir):
+    """Start ``<dest>.partial`` for *file_data*; marks the row failed on error."""
+    dest = transcript_dest(out_dir, file_data['path'])
+    try:
+        return TranscriptWriter(dest, getattr(self, 'flush_policy', 'segment'))
+    except OSError as e:
+        self.ui_updates.status(file_data, 'error', "Cannot write transcript")
+        self.ui_updates.line(file_data, f"ERROR: {e}")
+        return None
+
+
+def _finish_file(self, file_data, writer, returncode, err_msg, cache_key=None,
+                 message="Completed successfully"):
+    """Final status for one queued file; commits its transcript on success."""
+    if self.cancel_flag or returncode != 0:
+        writer.abort()
+
+    if self.cancel_flag:
+        self.ui_updates.status(file_data, 'error', "Cancelled")
+    else:
+        if returncode != 0:
+            # SIGKILL nobody asked for is almost always the OOM killer
+            self.ui_updates.status(file_data, 'error',
+                                   "Killed – out of memory?" if returncode == -signal.SIGKILL
+                                   else f"Failed (exit {returncode})")
+            self.ui_updates.line(
+                file_data,
+                f"ERROR: {err_msg or 'process exited with code ' + str(returncode)}"
+            )
+        else:
+            try:
+                saved = writer.commit()            # fsync + atomic rename
+            except OSError as e:
+                writer.abort()
+                self.ui_updates.status(file_data, 'error', "Failed to save")
+                self.ui_updates.line(file_data, f"ERROR: {e}")
+                return
+            file_data['transcript_path'] = writer.dest
+            if saved and cache_key:
+                try:
+                    self.transcript_cache.store(cache_key, writer.dest)
+                except OSError as e:
+                    print(f"Failed to cache {writer.dest}: {e}")
+            if saved:
+                self._index_transcript(writer.dest)
+                # add_transcript_to_list ignores paths it already shows
+                GLib.idle_add(self.add_transcript_to_list,
+                              os.path.basename(writer.dest), writer.dest)
+            self.ui_updates.status(file_data, 'completed', message)
+            # Allow GC to reclaim memory – the text now lives on disk
+            file_data['log'].clear()
+            file_data['buffer'] = None
+
+
+def _index_transcript(self, dest):
+    """Add a saved transcript to the search index; the transcript is done either way."""
+    try:
+        self.transcript_index.update(dest)
+    except Exception as e:
+        # the monitor / next sync picks it up, or the search falls back to a scan
+        print(f"Failed to index {dest}: {e}")
+
+
+# ── transcript cache: same audio + model + flags → reuse the old result ────
+def _whisper_flags(self) -> list[str]:
+    """Flags that change the transcript text (part of the cache key)."""
+    flags = [] if self.ts_enabled else ["-nt"]
+    if getattr(self, 'vad_enabled', False):
+        flags.append("vad")                  # not a whisper flag: speech-only input
+    return flags
+
+
+def _cache_key(self, file_path, core):
+    if not getattr(self, 'cache_enabled', True):
+        return None
+    try:
+        return self.transcript_cache.key(file_path, core, self._whisper_flags())
+    except OSError:
+        return None
+
+
+def _serve_from_cache(self, file_data, cache_key, out_dir) -> bool:
+    dest = transcript_dest(out_dir, file_data['path'])
+    try:
+        if not self.transcript_cache.restore(cache_key, dest):
+            return False
+    except OSError as e:
+        print(f"Cache restore failed for {dest}: {e}")
+        return False
+    file_data['transcript_path'] = dest
+    self._index_transcript(dest)
+    GLib.idle_add(self.add_transcript_to_list, os.path.basename(dest), dest)
+    self.ui_updates.status(file_data, 'completed', "Completed (from cache)")
+    file_data['log'].clear()
+    file_data['buffer'] = None
+    return True
+
+
+def _recover_partials(self):
+    """Offer to keep the text of transcripts interrupted by a crash."""
+    out_dir  = self.output_directory or os.path.expanduser("~/Downloads")
+    partials = find_partials(out_dir)
+    if partials:
+        dialog = Adw.AlertDialog(
+            heading="Interrupted Transcriptions",
+            body=f"{len(partials)} transcription(s) in {_hp(out_dir)} were interrupted "
+                 "before they finished. Keep the text transcribed so far?"
+        )
+        dialog.add_response("discard", "Discard")
+        dialog.add_response("keep", "Keep Partial Text")
+        dialog.set_response_appearance("keep", Adw.ResponseAppearance.SUGGESTED)
+        dialog.connect("response", lambda d, r: self._on_recover_partials_response(r, partials))
+        dialog.present(self.window)
+    return False                                 # one‑shot idle handler
+
+
+def _on_recover_partials_response(self, response, partials):
+    for partial in partials:
+        try:
+            if response == "keep":
+                recover_partial(partial)
+            else:
+                os.remove(partial)
+        except OSError as e:
+            self._error(f"Could not recover {os.path.basename(partial)}: {e}")
+
+
+# ── job journal: restore a queue interrupted by a crash / app exit ──────────
+def _offer_restore_queue(self):
+    entries = [(p, st) for p, st in self.journal.unfinished() if os.path.isfile(p)]
+    if not entries:
+        self.journal.clear()                 # only finished work was left
+        return False
+    failed = sum(1 for _, st in entries if st in ('error', 'cancelled'))
+    body = f"{len(entries)} file(s) from the last session were not transcribed yet"
+    body += f" ({failed} failed or were cancelled)." if failed else "."
+    dialog = Adw.AlertDialog(heading="Restore Queue", body=body)
+    dialog.add_response("discard", "Discard")
+    dialog.add_response("restore", "Restore")
+    dialog.add_response("continue", "Restore and Continue")
+    dialog.set_response_appearance("continue", Adw.ResponseAppearance.SUGGESTED)
+    dialog.connect("response", lambda d, r: self._on_restore_queue_response(r, entries))
+    dialog.present(self.window)
+    return False                                 # one‑shot idle handler
+
+def _on_restore_queue_response(self, response, entries):
+    if response not in ("restore", "continue"):
+        self.journal.clear()
+        return
+    batch = self.journal.last_batch() or {}
+    # completed work is not restored, so drop it from the journal as well
+    self.journal.clear()
+    self._enqueue_paths(p for p, _ in entries)
+    self.stack.set_visible_child_name("transcribe")
+    if response == "continue":
+        self._resume_batch(batch)
+
+def _resume_batch(self, batch):
+    """Start again with the model / flags / folder the batch was using."""
+    core, out_dir = batch.get('model'), batch.get('output')
+    if core and out_dir and os.path.isdir(out_dir) \
+       and os.path.isfile(self._model_target_path(core)):
+        files = self.progress_items.paths()
+        ts_enabled = "-nt" not in batch.get('flags', [])
+        if ts_enabled != self.ts_enabled:
+            # the batch's choice becomes the setting, as if toggled by hand
+            self.ts_enabled = ts_enabled
+            self.save_settings()
+            action = self.lookup_action("toggle-timestamps")
+            if action:
+                action.set_state(GLib.Variant.new_boolean(self.ts_enabled))
+        self._start_transcription(files, self._model_target_path(core), out_dir, core)
+    else:
+        self.on_transcribe(None)             # fall back to the current settings
+
+
+# ── watched folders: new recordings are queued and started on their own ───
+def _start_watching(self):
+    """(Re)start the folder monitors for the folders in Settings."""
+    if self._watcher:
+        self._watcher.stop()
+        self._watcher = None
+    if self.watch_folders:
+        self._watcher = FolderWatcher(self.watch_folders, self._on_watched_files)
+        self._watcher.start()
+    return False                                 # one‑shot idle handler
+
+def _on_watched_files(self, paths):
+    out_dir = self.output_directory or os.path.expanduser("~/Downloads")
+    # a transcript in the output folder means it was done in an earlier session
+    fresh = []
+    for path in paths:
+        dest = transcript_dest(out_dir, path)
+        if not (os.path.isfile(dest) and os.path.getsize(dest) > 0):
+            fresh.append(path)
+    added = self._enqueue_paths(self._collect_audio_files(fresh))
+    if not added:
+        return
+    toast = Adw.Toast(title=f"{len(added)} new file(s) from watched folders")
+    toast.set_timeout(3)
+    self.toast_overlay.add_toast(toast)
+    with self._progress_lock:
+        # files that joined the running batch are taken care of
+        self._watch_backlog += [p for p in added if p not in self._batch]
+    if self._watch_backlog and not self._watch_retry and self._start_watch_backlog():
+        self._watch_retry = GLib.timeout_add_seconds(1, self._start_watch_backlog)
+
+def _start_watch_backlog(self):
+    """Transcribe watched files that arrived while no batch could take them."""
+    if getattr(self, 'is_transcribing', False) or self.is_tuning:
+        return True                              # ask again once it is over
+    self._watch_retry = 0
+    waiting = {fd['path'] for fd in self.progress_items if fd['status'] == 'waiting'}
+    paths = [p for p in self._watch_backlog if p in waiting]
+    self._watch_backlog = []
+    if not paths:
+        return False
+    core = self._get_model_name()
+    model_path = self._model_target_path(core) if core != "None" else None
+    out_dir = self.output_directory or os.path.expanduser("~/Downloads")
+    if not (model_path and os.path.isfile(model_path) and os.path.isdir(out_dir)):
+        self._gui_status("New files queued – install a model and choose an output folder")
+        return False
+    self.trans_btn.set_visible(True)             # hidden after the last batch finished
+    self.trans_btn.set_sensitive(True)
+    self.reset_btn.set_visible(False)
+    self._start_transcription(paths, model_path, out_dir, core)
+    return False
+
+
+# ── long recordings: split at silences, decode the pieces in parallel ──────
+def _should_chunk(self, secs) -> bool:
+    if not getattr(self, 'chunking_enabled', False):
+        return False
+    return secs > self.chunk_minutes * 60 * 1.5
+
+
+def _split_into_chunks(self, idx, total, file_data, file_path, secs, pending,
+                       cache_key=None):
+    """Plan the chunks of a long file and queue them ahead of other files."""
+    self.ui_updates.subtitle(file_data, f"Finding silences ({idx}/{total})...")
+    chunks = plan_chunks(secs, detect_silences(file_path),
+                         self.chunk_minutes * 60, self.chunk_overlap)
+    self._queue_chunks(idx, file_data, file_path, chunks, pending, cache_key)
+
+
+def _split_at_speech(self, idx, total, file_data, file_path, secs, pending,
+                     out_dir, cache_key=None) -> bool:
+    """
+    Queue only the speech in *file_path*, or finish it at once if it has
+    none.  False when cutting would not save anything and the file should
+    run as usual.
+    """
+    self.ui_updates.subtitle(file_data, f"Finding speech ({idx}/{total})...")
+    long = self._should_chunk(secs)
+    chunks = plan_speech(secs, speech_spans(file_path, secs),
+                         self.chunk_minutes * 60 if long else 0, self.chunk_overlap)
+    speech = sum(c.owned for c in chunks)
+    if chunks and not long and speech > secs * MOSTLY_SPEECH:
+        return False
+
+    with self._progress_lock:
+        self.done_secs += max(0.0, secs - speech)      # the silence is done already
+    if not chunks:
+        # saved (one blank line) and cached like any transcript, so the file
+        # counts as done and is not queued and decoded again
+        writer = self._open_writer(file_data, out_dir)
+        if writer is not None:
+            writer.write("")
+            self._finish_file(file_data, writer, 0, "", cache_key, "No speech found")
+        return True
+    self._queue_chunks(idx, file_data, file_path, chunks, pending, cache_key)
+    return True
+
+
+def _queue_chunks(self, idx, file_data, file_path, chunks, pending, cache_key=None):
+    """Queue the parts of one file ahead of other files."""
+    job = {
+        'file_data': file_data,
+        'chunks':    chunks,
+        'outputs':   [None] * len(chunks),
+        'pct':       [0.0] * len(chunks),
+        'remaining': len(chunks),
+        'error':     None,
+        'tmpdir':    tempfile.mkdtemp(prefix="audio-to-text-chunks-"),
+        'cache_key': cache_key,
+    }
+    with self._progress_lock:
+        self._chunk_jobs[file_path] = job
+        for n, chunk in enumerate(chunks):
+            self.inflight_secs[(file_path, n)] = (chunk.owned, 0.0)
+    for n in range(len(chunks)):
+        self._queue_task(pending, LANE_CHUNK, ('chunk', idx, file_path, n))
+
+
+def _transcribe_chunk(self, idx, total, file_path, n, model_path, core, out_dir,
+                      threads, slot):
+    job = self._chunk_jobs.get(file_path)
+    if job is None:
+        return
+    chunks = job['chunks']
+    chunk  = chunks[n]
+    file_data = job['file_data']
+    lines  = []
+
+    def _on_status(text, pct=None):
+        # one % for the whole file, weighted by how much audio each chunk owns
+        if pct is None:
+            return
+        with self._progress_lock:
+            job['pct'][n] = pct
+            done = sum(c.owned * p for c, p in zip(chunks, job['pct']))
+            file_pct = done / max(1e-6, sum(c.owned for c in chunks))
+        self.ui_updates.subtitle(file_data, f"Transcribing ({idx}/{total}) — {file_pct:.0f}% "
+                                            f"({len(chunks)} parts)")
+
+    wav = os.path.join(job['tmpdir'], f"{n:04d}.wav")
+    try:
+        extract_chunk(file_path, chunk, wav)
+    except (OSError, subprocess.CalledProcessError) as e:
+        returncode, err_msg = 1, f"ffmpeg could not cut part {n + 1}/{len(chunks)}: {e}"
+    else:
+        # always keep timestamps here – they are needed to stitch the parts;
+        # no live preview, the stitched text is shown once all parts are in
+        started = time.monotonic()
+        returncode, err_msg, lines = self._run_engine(wav, (file_path, n), model_path,
+                                                      threads, slot, True, None, _on_status)
+        if returncode == 0 and not self.cancel_flag:
+            self.speed.record(core, threads, chunk.end - chunk.start,
+                              time.monotonic() - started)
+    finally:
+        if os.path.exists(wav):
+            os.remove(wav)
+
+    with self._progress_lock:
+        secs, _ = self.inflight_secs.pop((file_path, n), (0.0, 0.0))
+        self.done_secs += secs
+        if self._chunk_jobs.get(file_path) is not job:
+            return                           # another part failed and dropped the file
+        job['outputs'][n] = lines
+        if returncode != 0 and job['error'] is None:
+            job['error'] = (returncode, err_msg)
+        job['remaining'] -= 1
+        if job['remaining']:
+            return
+        self._chunk_jobs.pop(file_path, None)
+
+    shutil.rmtree(job['tmpdir'], ignore_errors=True)
+    writer = self._open_writer(job['file_data'], out_dir)
+    if writer is None:
+        return
+    returncode, err_msg = job['error'] or (0, "")
+    if not job['error']:
+        try:
+            for line in stitch(chunks, job['outputs'], self.ts_enabled):
+                writer.write(line)
+                self.ui_updates.line(job['file_data'], line)
+        except BaseException:
+            writer.abort()
+            raise
+    self._finish_file(job['file_data'], writer, returncode, err_msg, job['cache_key'])
+
+
+def _discard_chunk_jobs(self):
+    """Clean up split files whose parts never ran (batch cancelled)."""
+    for job in list(self._chunk_jobs.values()):
+        shutil.rmtree(job['tmpdir'], ignore_errors=True)
+        self.ui_updates.status(job['file_data'], 'error', "Cancelled")
+    self._chunk_jobs.clear()
+
+
+# ── engines ─────────────────────────────────────────────────────────────────
+def _run_engine(self, audio_path, key, model_path, threads, slot,
+                timestamps, on_line, on_status):
+    """
+    Transcribe *audio_path* with the configured engine.  A live preview
+    goes to *on_line* (None = no preview), progress to *on_status(text,
+    pct)* and to the overall ETA under *key*.  Returns ``(returncode,
+    error message, transcript lines)``.
+    """
+    if self._use_server():
+        return self._run_server(audio_path, key, model_path, threads, slot,
+                                timestamps, on_line, on_status)
+    return self._run_cli(audio_path, key, model_path, threads, slot,
+                         timestamps, on_line, on_status)
+
+
+def _show_overall(self, eta):
+    if eta:
+        self.ui_updates.overall(f"<b>{int(self.overall_pct)}% (~{eta})</b>")
+
+
+def _launch_prefix(self, slot) -> list[str]:
+    """nice / ionice / taskset in front of *slot*'s whisper command."""
+    cpus = self._cpus
+    if getattr(self, 'split_cpus', False):
+        cpus = partition(cpus, self._jobs, slot)     # each job on its own cores
+    elif len(cpus) >= (os.cpu_count() or 1):
+        cpus = None                                  # no mask needed
+    return command_prefix(getattr(self, 'worker_nice', 0),
+                          getattr(self, 'worker_io_class', 'normal'), cpus)
+
+
+def _run_cli(self, audio_path, key, model_path, threads, slot, timestamps, on_line, on_status):
+    """
+    Spawn one whisper-cli for *audio_path*.  The transcript is rendered
+    from the JSON file it writes on exit; until then stdout feeds the
+    live preview (log and crash-safe ``.partial``), and only when
+    *on_line* asks for one.  Returns (returncode, stderr, lines).
+    """
+    tmpdir = tempfile.mkdtemp(prefix="audio-to-text-json-")
+    prefix = os.path.join(tmpdir, "out")
+    # no -nt: stdout keeps its timestamps so the preview needs no guessing
+    cmd = [*self._launch_prefix(slot), self.bin_path, "-m", model_path, "-f", audio_path,
+           "-pp", *json_args(prefix)]
+    if threads:
+        cmd += ["-t", str(threads)]
+    if self._processors > 1:
+        cmd += ["-p", str(self._processors)]
+
+    # keep the streams separate:
+    #   · stdout  → live preview (segments as they are decoded)
+    #   · stderr  → progress updates + errors
+    # both are drained by one ProcessReader in *this* thread
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=0,
+    )
+    with self._procs_lock:
+        self.current_procs.add(proc)
+
+    reader = ProcessReader(proc, True, segments=on_line is not None)
+    for kind, value in reader.events(cancelled=lambda: self.cancel_flag):
+        if kind == SEGMENT:
+            on_line(value if timestamps else strip_timestamps(value))
+        else:                                    # PROGRESS
+            self._show_overall(self._record_progress(key, value))
+            on_status(f"{value:g}%", value)
+
+    if self.cancel_flag:
+        try:
+            proc.terminate()
+        except:
+            pass
+        if on_line:
+            on_line("Transcription cancelled")
+
+    proc.stdout.close()
+    proc.stderr.close()
+    proc.wait()
+    with self._procs_lock:
+        self.current_procs.discard(proc)
+
+    err_msg, lines = "", []
+    try:
+        if proc.returncode != 0:
+            if not self.cancel_flag:
+                err_msg = reader.error_text()
+        elif not self.cancel_flag:
+            lines = render(read_json(prefix + ".json"), timestamps)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return 1, f"Cannot read whisper-cli's JSON output: {e}", []
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return proc.returncode, err_msg, lines
+
+
+# ── resident engine: whisper-server keeps the model loaded ──────────────────
+def _use_server(self) -> bool:
+    return getattr(self, 'engine', 'cli') == 'server' and bool(self.server_bin_path)
+
+
+def _run_server(self, audio_path, key, model_path, threads, slot,
+                timestamps, on_line, on_status):
+    """
+    Send *audio_path* to this slot's resident whisper-server, starting it
+    (or restarting it after a crash) when needed.  Same contract as
+    ``_run_cli``.
+    """
+    srv = self._servers.get(slot)
+    launch = self._launch_prefix(slot)
+    if (srv is None or srv.model_path != model_path or srv.threads != threads
+            or srv.processors != self._processors or srv.prefix != launch):
+        if srv:
+            srv.stop()
+        srv = WhisperServer(self.server_bin_path, model_path, threads,
+                            processors=self._processors, prefix=launch)
+        self._servers[slot] = srv
+
+    # every process serving this request is registered, so Cancel can kill
+    # it – including one the server restarts after a crash mid-request
+    procs = []
+
+    def _register(proc):
+        procs.append(proc)
+        with self._procs_lock:
+            self.current_procs.add(proc)
+
+    srv.on_start = _register
+    try:
+        if not srv.alive():
+            on_status("loading model…")
+            srv.start()
+        else:
+            _register(srv.proc)
+        on_status("model loaded")
+        lines = srv.transcribe(audio_path, timestamps,
+                               cancelled=lambda: self.cancel_flag)
+    except Exception as e:
+        return (1, "" if self.cancel_flag else str(e), [])
+    finally:
+        srv.on_start = None
+        with self._procs_lock:
+            self.current_procs.difference_update(procs)
+
+    if on_line:
+        for line in lines:
+            on_line(line)
+    self._show_overall(self._record_progress(key, 100.0))
+    on_status("100%", 100.0)
+    return 0, "", lines
+
+
+def _stop_servers(self, *args):
+    """Shut down every resident whisper-server (app exit / engine change)."""
+    for srv in list(self._servers.values()):
+        srv.stop()
+    self._servers.clear()
@@ -0,0 +1,204 @@
+# transcript_index.py
+"""
+Full-text index of the transcripts in the output folder.
+
+The text and file name of every ``*_transcribed.txt`` go into an SQLite
+FTS5 table with the trigram tokenizer, so a search for any substring of
+three or more characters – case-insensitive, like the old file scan – is
+answered from the index instead of reading every transcript.  Each file
+is stored with its size and mtime: ``sync`` re-reads only what changed on
+disk since it was indexed, and ``update`` indexes a single file the moment
+the app writes it.
+
+An output folder only counts as indexed once ``sync`` has run for it in
+this session; until then (and when this SQLite has no FTS5 / trigram)
+``search`` returns None and the caller scans the files itself.
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+
+from .helpers import TRANSCRIPT_SUFFIX
+
+SYNC_BATCH = 200            # files read and written per transaction
+MIN_TRIGRAM = 3             # shorter terms cannot use the trigram index
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id       INTEGER PRIMARY KEY,     -- rowid of its text in transcripts
+    path     TEXT    NOT NULL UNIQUE,
+    dir      TEXT    NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts USING fts5 (name, body, tokenize = 'trigram');
+"""
+
+
+def _stamp(st) -> tuple[int, int]:
+    return st.st_size, st.st_mtime_ns
+
+
+def _read(path) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def _like(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class TranscriptIndex:
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False,
+                                   isolation_level=None)
+        self._lock = threading.Lock()
+        self._synced = set()            # output folders indexed this session
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            try:
+                self._db.executescript(_SCHEMA)
+                self.available = True
+            except sqlite3.OperationalError as e:   # no FTS5 or no trigram tokenizer
+                print(f"Transcript search index unavailable: {e}")
+                self.available = False
+
+    @contextlib.contextmanager
+    def _tx(self):
+        """One locked write transaction (autocommit is on otherwise)."""
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    # ── keeping it current ───────────────────────────────────────
+    def _store(self, db, path, stamp, text):
+        # caller holds the transaction
+        row = db.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+        if row:
+            db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?", (*stamp, row[0]))
+            db.execute("DELETE FROM transcripts WHERE rowid = ?", (row[0],))
+            rowid = row[0]
+        else:
+            rowid = db.execute(
+                "INSERT INTO files (path, dir, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                (path, os.path.dirname(path), *stamp),
+            ).lastrowid
+        db.execute("INSERT INTO transcripts (rowid, name, body) VALUES (?, ?, ?)",
+                   (rowid, os.path.basename(path), text))
+
+    def _drop(self, db, paths):
+        # caller holds the transaction
+        for path in paths:
+            row = db.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+            if row:
+                db.execute("DELETE FROM transcripts WHERE rowid = ?", (row[0],))
+                db.execute("DELETE FROM files WHERE id = ?", (row[0],))
+
+    def update(self, path):
+        """(Re-)index the transcript at *path*, or forget it if it is gone."""
+        if not self.available:
+            return
+        try:
+            stamp = _stamp(os.stat(path))
+        except OSError:
+            with self._tx() as db:
+                self._drop(db, [path])
+            return
+        with self._lock:
+            row = self._db.execute("SELECT size, mtime_ns FROM files WHERE path = ?",
+                                   (path,)).fetchone()
+        if row == stamp:
+            return
+        text = _read(path)
+        if text is None:
+            return
+        with self._tx() as db:
+            self._store(db, path, stamp, text)
+
+    def sync(self, out_dir, cancelled=None) -> bool:
+        """
+        Bring *out_dir*'s entries in line with the files on disk; False
+        when *cancelled()* stopped it first (it resumes where it left off).
+        """
+        if not self.available:
+            return False
+        on_disk = {}
+        try:
+            for entry in os.scandir(out_dir):
+                if entry.name.endswith(TRANSCRIPT_SUFFIX) and entry.is_file():
+                    with contextlib.suppress(OSError):
+                        on_disk[entry.path] = _stamp(entry.stat())
+        except OSError as e:
+            print(f"Cannot index {out_dir}: {e}")
+            return False
+        with self._lock:
+            known = {path: (size, mtime) for path, size, mtime in self._db.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE dir = ?", (out_dir,))}
+
+        gone = [p for p in known if p not in on_disk]
+        if gone:
+            with self._tx() as db:
+                self._drop(db, gone)
+        changed = [p for p, stamp in on_disk.items() if known.get(p) != stamp]
+        for i in range(0, len(changed), SYNC_BATCH):
+            if cancelled and cancelled():
+                return False
+            # read outside the lock, so searches are only held up by the writes
+            texts = [(p, on_disk[p], _read(p)) for p in changed[i:i + SYNC_BATCH]]
+            with self._tx() as db:
+                for path, stamp, text in texts:
+                    if text is not None:
+                        self._store(db, path, stamp, text)
+        self._synced.add(out_dir)
+        return True
+
+    def is_synced(self, out_dir) -> bool:
+        return out_dir in self._synced
+
+    def invalidate(self, out_dir):
+        """Distrust *out_dir* until the next ``sync`` (e.g. its monitor failed)."""
+        self._synced.discard(out_dir)
+
+    # ── queries ──────────────────────────────────────────────────
+    def search(self, out_dir, text: str) -> list[str] | None:
+        """
+        Paths of *out_dir*'s transcripts whose name or text contains
+        *text* (all of them when it is empty); None when the index cannot
+        answer and the files have to be scanned.
+        """
+        if not self.available or out_dir not in self._synced:
+            return None
+        if not text:
+            sql, args = "SELECT path FROM files WHERE dir = ?", (out_dir,)
+        elif len(text) >= MIN_TRIGRAM:
+            phrase = '"' + text.replace('"', '""') + '"'
+            sql = ("SELECT f.path FROM transcripts JOIN files f ON f.id = transcripts.rowid"
+                   " WHERE f.dir = ? AND transcripts MATCH ?")
+            args = (out_dir, phrase)
+        elif text.isascii():
+            # too short for trigrams: LIKE over the stored text, still no file reads
+            sql = ("SELECT f.path FROM transcripts JOIN files f ON f.id = transcripts.rowid"
+                   " WHERE f.dir = ? AND (transcripts.name LIKE ? ESCAPE '\\'"
+                   " OR transcripts.body LIKE ? ESCAPE '\\')")
+            args = (out_dir, _like(text), _like(text))
+        else:
+            return None                 # SQLite's LIKE only folds ASCII
+        with self._lock:
+            return [row[0] for row in self._db.execute(sql, args)]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,107 @@
+# transcript_writer.py
+"""
+Write transcript lines to disk as they arrive.
+
+Lines go to ``<dest>.partial`` and are flushed according to a policy;
+``commit`` fsyncs and atomically renames the file to ``<dest>``.  After a
+crash the ``.partial`` file is still there, so the text up to the last
+flush can be recovered (see ``find_partials``).
+"""
+import os
+import time
+
+from .helpers import TRANSCRIPT_SUFFIX
+
+PARTIAL_SUFFIX = ".partial"
+
+# name → (flush every N lines, flush every N seconds); None = never
+FLUSH_POLICIES = {
+    "segment":  (1, None),
+    "interval": (None, 5.0),
+    "end":      (None, None),
+}
+
+
+class TranscriptWriter:
+    def __init__(self, dest: str, policy: str = "segment"):
+        self.dest    = dest
+        self.partial = dest + PARTIAL_SUFFIX
+        self.lines   = 0
+        self._every_lines, self._every_secs = FLUSH_POLICIES.get(policy, FLUSH_POLICIES["segment"])
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._fh = open(self.partial, "w", encoding="utf-8")
+
+    def write(self, line: str) -> None:
+        self._fh.write(line + "\n")
+        self.lines += 1
+        self._unflushed += 1
+        if self._every_lines and self._unflushed >= self._every_lines:
+            self.flush()
+        elif self._every_secs and time.monotonic() - self._last_flush >= self._every_secs:
+            self.flush()
+
+    def replace(self, lines) -> None:
+        """Swap everything written so far for *lines*, the final transcript."""
+        self._fh.seek(0)
+        self._fh.truncate()
+        self.lines = 0
+        for line in lines:
+            self._fh.write(line + "\n")
+            self.lines += 1
+        self.flush()
+
+    def flush(self) -> None:
+        self._fh.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def commit(self) -> bool:
+        """
+        Make the transcript final.  Returns False (and leaves no file) when
+        nothing was written, mirroring the old "don't save empty" rule.
+        """
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        if not self.lines:
+            os.remove(self.partial)
+            return False
+        os.replace(self.partial, self.dest)
+        return True
+
+    def abort(self) -> None:
+        """Drop the partial file (cancelled or failed run)."""
+        if not self._fh.closed:
+            self._fh.close()
+        try:
+            os.remove(self.partial)
+        except FileNotFoundError:
+            pass
+
+
+def find_partials(out_dir: str) -> list[str]:
+    """``.partial`` transcripts left behind by a crash in *out_dir*."""
+    try:
+        return sorted(
+            e.path for e in os.scandir(out_dir)
+            if e.is_file() and e.name.endswith(TRANSCRIPT_SUFFIX + PARTIAL_SUFFIX)
+        )
+    except OSError:
+        return []
+
+
+def recover_partial(partial: str) -> str:
+    """
+    Promote a leftover partial transcript to a real one without clobbering
+    an existing transcript; returns the path it was saved under.
+    """
+    dest = partial[:-len(PARTIAL_SUFFIX)]
+    if os.path.exists(dest):
+        stem = dest[:-len(TRANSCRIPT_SUFFIX)]
+        n = 1
+        while os.path.exists(f"{stem} (partial {n}){TRANSCRIPT_SUFFIX}"):
+            n += 1
+        dest = f"{stem} (partial {n}){TRANSCRIPT_SUFFIX}"
+    os.replace(partial, dest)
+    return dest
@@ -1,42 +1,46 @@
 
 # ui.py
 import gi
-import os, mmap
-import re
-import subprocess
-import threading
-import yaml
-import shutil
-from pathlib import Path
+import os
+from collections import deque
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
-gi.require_version("GtkSource", "5")
-from gi.repository import Gtk, GLib, Gio, Gdk, Adw, GObject, GtkSource
+from gi.repository import Gtk, GLib, Gio, Gdk, Adw
 
-from .helpers import human_path as _hp
+from .helpers import human_path as _hp, transcript_dest, fmt_secs, whisper_layout
 
 # import time
 # _t0 = lambda: f"{time.perf_counter():.6f}"
 
-_overlay_css_prov = Gtk.CssProvider()
-_overlay_css_prov.load_from_data(b"""
-#overlay_backdrop { background-color: rgba(0,0,0,0.40); }
-#overlay_viewer   { background-image:none; background-color:@window_bg_color; }
-""")
-Gtk.StyleContext.add_provider_for_display(
-    Gdk.Display.get_default(), _overlay_css_prov,
-    Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-)
-
-_viewer_css_prov = Gtk.CssProvider()
-_viewer_css_prov.load_from_data(b"""
-#overlay_viewer { background-image:none; background-color:@window_bg_color; }
-""")
-Gtk.StyleContext.add_provider_for_display(
-    Gdk.Display.get_default(),
-    _viewer_css_prov,
-    Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-)
+# ── loaded on first use: nothing below is needed for the first frame ──────
+_overlay_css_prov = None
+
+def _install_overlay_css():
+    global _overlay_css_prov
+    if _overlay_css_prov:
+        return
+    _overlay_css_prov = Gtk.CssProvider()
+    _overlay_css_prov.load_from_data(b"""
+    #overlay_backdrop { background-color: rgba(0,0,0,0.40); }
+    #overlay_viewer   { background-image:none; background-color:@window_bg_color; }
+    """)
+    Gtk.StyleContext.add_provider_for_display(
+        Gdk.Display.get_default(), _overlay_css_prov,
+        Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+    )
+
+def _gtk_source():
+    """GtkSource is only used by the transcript viewer overlay."""
+    gi.require_version("GtkSource", "5")
+    from gi.repository import GtkSource
+    return GtkSource
+
+def _new_source_buffer(self, text: str = ""):
+    buf = _gtk_source().Buffer()
+    self._ensure_highlight_tag(buf)
+    if text:
+        buf.set_text(text)
+    return buf
 
 def create_view_switcher_ui(self):
     self.stack = Adw.ViewStack()
@@ -76,19 +80,31 @@ def create_view_switcher_ui(self):
     self.trans_btn.connect("clicked", self.on_transcribe)
     transcribe_box.append(self.trans_btn)
 
-    # Files Group
+    # Files Group – title and totals; the rows are in the list view below
     self.files_group = Adw.PreferencesGroup()
     self.files_group.set_title("Audio Files")
     self.files_group.set_description("Review files to be transcribed")
     transcribe_box.append(self.files_group)
 
+    # Only the rows on screen get widgets; they are recycled while scrolling
+    factory = Gtk.SignalListItemFactory()
+    factory.connect("setup", self._on_queue_row_setup)
+    factory.connect("bind", self._on_queue_row_bind)
+    factory.connect("unbind", self._on_queue_row_unbind)
+    self.files_view = Gtk.ListView(model=Gtk.NoSelection(model=self.progress_items),
+                                   factory=factory)
+    self.files_view.add_css_class("card")
+    self.files_view.set_single_click_activate(True)
+    self.files_view.connect("activate", self._on_queue_row_activated)
+
     transcribe_scrolled = Gtk.ScrolledWindow()
-    transcribe_scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+    transcribe_scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
     transcribe_scrolled.set_vexpand(True)
     transcribe_scrolled.set_hexpand(True)
-    transcribe_scrolled.set_child(transcribe_box)
+    transcribe_scrolled.set_child(self.files_view)
+    transcribe_box.append(transcribe_scrolled)
 
-    page = self.stack.add_titled(transcribe_scrolled, "transcribe", "Transcriber")
+    page = self.stack.add_titled(transcribe_box, "transcribe", "Transcriber")
     # Gtk / libadwaita ≤ 1.4
     page.set_icon_name("input-keyboard-symbolic")        # any symbolic name works
 
@@ -96,7 +112,29 @@ def create_view_switcher_ui(self):
     if hasattr(page, "set_icon"):                      # new API, accepts Gio.Icon
         page.set_icon(Gio.ThemedIcon.new("input-keyboard-symbolic"))
 
-    # View Transcripts View
+    # View Transcripts View – an empty page until it is first shown
+    self.transcripts_scrolled = Gtk.ScrolledWindow()
+    self.transcripts_scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+    self.transcripts_scrolled.set_vexpand(True)
+    self.transcripts_scrolled.set_hexpand(True)
+
+    page = self.stack.add_titled(self.transcripts_scrolled, "transcripts", "Transcripts")
+    
+    page.set_icon_name("text-x-generic-symbolic")
+    if hasattr(page, "set_icon"):
+        page.set_icon(Gio.ThemedIcon.new("text-x-generic-symbolic"))
+
+    # View Switcher
+    self.view_switcher = Adw.ViewSwitcher()
+    self.view_switcher.set_stack(self.stack)
+    self.view_switcher.set_policy(Adw.ViewSwitcherPolicy.WIDE)
+
+    # Connect to stack's visible-child signal to update transcripts when switched
+    self.stack.connect("notify::visible-child-name", self._on_view_switched)
+
+def _build_transcripts_pane(self):
+    if self.transcripts_group:
+        return
     transcripts_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
     transcripts_box.set_margin_start(12)
     transcripts_box.set_margin_end(12)
@@ -126,30 +164,22 @@ def create_view_switcher_ui(self):
     self.transcripts_group = Adw.PreferencesGroup()
     self.transcripts_group.set_title("Transcripts")
     self.transcripts_group.set_description("View completed transcripts")
+    # a sorted list box, so search results can be added and removed in place
+    self.transcripts_list = Gtk.ListBox(selection_mode=Gtk.SelectionMode.NONE)
+    self.transcripts_list.add_css_class("boxed-list")
+    self.transcripts_list.set_sort_func(_sort_transcript_rows)
+    self.transcripts_group.add(self.transcripts_list)
     transcripts_box.append(self.transcripts_group)
 
-    transcripts_scrolled = Gtk.ScrolledWindow()
-    transcripts_scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-    transcripts_scrolled.set_vexpand(True)
-    transcripts_scrolled.set_hexpand(True)
-    transcripts_scrolled.set_child(transcripts_box)
-
-    page = self.stack.add_titled(transcripts_scrolled, "transcripts", "Transcripts")
-    
-    page.set_icon_name("text-x-generic-symbolic")
-    if hasattr(page, "set_icon"):
-        page.set_icon(Gio.ThemedIcon.new("text-x-generic-symbolic"))
+    self.transcripts_scrolled.set_child(transcripts_box)
 
-    # View Switcher
-    self.view_switcher = Adw.ViewSwitcher()
-    self.view_switcher.set_stack(self.stack)
-    self.view_switcher.set_policy(Adw.ViewSwitcherPolicy.WIDE)
-
-    # Connect to stack's visible-child signal to update transcripts when switched
-    self.stack.connect("notify::visible-child-name", self._on_view_switched)
+def _sort_transcript_rows(row_a, row_b):
+    a, b = row_a.get_title(), row_b.get_title()
+    return (a > b) - (a < b)
 
 def _on_view_switched(self, stack, param):
     if stack.get_visible_child_name() == "transcripts":
+        self._build_transcripts_pane()
         # kick off a background scan so the UI never blocks
         self._spawn_scan_thread(self.search_entry.get_text().strip())
         # … then move the keyboard focus into the top search box
@@ -167,10 +197,7 @@ def _on_dnd_drop(self, drop_target, value, x, y):
 
     files = value.get_files()
     new_paths = self._collect_audio_files(files)
-    for path in new_paths:
-        if path not in [item['path'] for item in self.progress_items]:
-            self.audio_store.append(path)
-            self.add_file_to_list(os.path.basename(path), path)
+    self._enqueue_paths(new_paths)
     if new_paths:
         toast = Adw.Toast(title=f"Added {len(new_paths)} file(s)")
         toast.set_timeout(3)
@@ -178,16 +205,54 @@ def _on_dnd_drop(self, drop_target, value, x, y):
     self.stack.set_visible_child_name("transcribe")
     return True
 
-def add_file_to_list(self, filename, file_path):
-    if not self.files_group:
-        raise RuntimeError("Files group not initialized.")
-
-    file_row = Adw.ActionRow()
-    file_row.set_title(filename)
-    file_row.set_subtitle(_hp(os.path.dirname(file_path)) or "Local File")
+def _new_file_data(self, file_path):
+    """
+    Queue state of one file.  Row widgets are attached only while it is
+    on screen, and its log is a ring of lines until someone opens it.
+    """
+    return {
+        'widgets': None,                # bound row, see _on_queue_row_bind
+        'subtitle': _hp(os.path.dirname(file_path)) or "Local File",
+        'media': None,
+        'info_tip': None,
+        'urgent': False,
+        'filename': os.path.basename(file_path),
+        'path': file_path,
+        'status': 'waiting',
+        'log': deque(maxlen=LOG_TAIL_LINES),
+        'buffer': None,                 # see _log_buffer
+        'is_viewed': False,
+        'transcript_path': None,
+    }
 
-    progress_widget = Gtk.Image()
-    file_row.add_suffix(progress_widget)
+# ── queue rows: a few recycled widgets for whatever is on screen ───────────
+STATUS_ICONS = {
+    'cancelled': 'process-stop-symbolic',
+    'error':     'dialog-error-symbolic',
+    'skipped':   'dialog-information-symbolic',
+}
+
+def _on_queue_row_setup(self, factory, list_item):
+    row = Adw.ActionRow()
+    row.set_use_markup(False)           # file and folder names are not markup
+
+    # duration, filled in by the background probe (_show_media_info)
+    info_lbl = Gtk.Label()
+    info_lbl.add_css_class("dim-label")
+    row.add_suffix(info_lbl)
+
+    spinner = Gtk.Spinner()
+    row.add_suffix(spinner)
+    icon = Gtk.Image()
+    row.add_suffix(icon)
+
+    urgent_btn = Gtk.ToggleButton()
+    urgent_btn.set_icon_name("go-top-symbolic")
+    urgent_btn.set_valign(Gtk.Align.CENTER)
+    urgent_btn.add_css_class("flat")
+    urgent_btn.set_tooltip_text("Transcribe next")
+    urgent_btn.connect("toggled", lambda b: self._on_urgent_toggled(b, list_item.get_item().data))
+    row.add_suffix(urgent_btn)
 
     remove_btn = Gtk.Button()
     remove_btn.set_icon_name("user-trash-symbolic")
@@ -195,41 +260,72 @@ def add_file_to_list(self, filename, file_path):
     remove_btn.add_css_class("flat")
     remove_btn.add_css_class("destructive-action")
     remove_btn.set_tooltip_text("Remove file")
-    file_row.add_suffix(remove_btn)
-    remove_btn.connect("clicked", self._on_remove_file, file_path)
-
-    output_buffer = GtkSource.Buffer() 
-    self._ensure_highlight_tag(output_buffer)
-    output_view = Gtk.TextView.new_with_buffer(output_buffer)
-    output_view.set_editable(False)
-    output_view.set_monospace(True)
-    output_view.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
-
-    file_data = {
-        'row': file_row,
-        'remove_btn': remove_btn,
-        'icon': progress_widget,
-        'filename': filename,
-        'path': file_path,
-        'status': 'waiting',
-        'buffer': output_buffer,
-        'view': output_view,
-        'is_viewed': False,
-        'transcript_path': None,
-    }
-    self.progress_items.append(file_data)
+    remove_btn.connect("clicked", lambda b: self._on_remove_file(b, list_item.get_item().data['path']))
+    row.add_suffix(remove_btn)
 
-    file_row.set_activatable(True)
-    file_row.connect('activated', lambda r: self._show_file_content(file_data) if file_data['status'] == 'completed' else self.show_file_details(file_data))
-    self.files_group.add(file_row)
-    return file_data
+    row.widgets = {'row': row, 'info_lbl': info_lbl, 'spinner': spinner,
+                   'icon': icon, 'urgent_btn': urgent_btn}
+    list_item.set_child(row)
+
+def _on_queue_row_bind(self, factory, list_item):
+    file_data = list_item.get_item().data
+    row = list_item.get_child()
+    row.set_title(file_data['filename'])
+    file_data['widgets'] = row.widgets
+    self._sync_row(file_data)
+
+def _on_queue_row_unbind(self, factory, list_item):
+    file_data = list_item.get_item().data
+    if file_data['widgets'] is list_item.get_child().widgets:
+        file_data['widgets'] = None
+
+def _on_queue_row_activated(self, list_view, position):
+    entry = self.progress_items.get_item(position)
+    if entry is None:
+        return
+    file_data = entry.data
+    if file_data['status'] == 'completed':
+        self._show_file_content(file_data)
+    else:
+        self.show_file_details(file_data)
+
+def _sync_row(self, file_data):
+    """Show *file_data*'s state on its row, if it has one right now."""
+    w = file_data['widgets']
+    if not w:
+        return
+    status = file_data['status']
+    w['row'].set_subtitle(file_data['subtitle'])
+    w['spinner'].set_visible(status == 'processing')
+    w['spinner'].set_spinning(status == 'processing')
+    icon_name = STATUS_ICONS.get(status)
+    w['icon'].set_from_icon_name(icon_name)
+    w['icon'].set_visible(bool(icon_name))
+    w['urgent_btn'].set_visible(status == 'waiting')
+    w['urgent_btn'].set_active(file_data['urgent'])
+    info = file_data['media']
+    w['info_lbl'].set_label(fmt_secs(info.duration) if info and info.duration else "")
+    w['info_lbl'].set_tooltip_text(file_data['info_tip'])
+
+def set_file_subtitle(self, file_data, text):
+    file_data['subtitle'] = text
+    if file_data['widgets']:
+        file_data['widgets']['row'].set_subtitle(text)
+
+def _on_urgent_toggled(self, button, file_data):
+    if button.get_active() == file_data['urgent']:
+        return                          # a recycled row being bound
+    file_data['urgent'] = button.get_active()
+    # a running batch picks it up next; otherwise the next batch starts with it
+    if file_data['urgent'] and file_data['status'] == 'waiting':
+        self._promote_file(file_data)
 
 def _on_remove_file(self, button, file_path):
-    file_data = next((item for item in self.progress_items if item['path'] == file_path), None)
+    file_data = self.progress_items.get(file_path)
     if not file_data:
         return
 
-    if file_data['status'] == 'processing' and self.current_proc and self.current_proc.poll() is None:
+    if file_data['status'] == 'processing' and self._procs_running():
         dialog = Adw.AlertDialog(
             heading="Confirm File Removal",
             body=f"'{os.path.basename(file_path)}' is being transcribed. Stop transcription and remove it?",
@@ -245,29 +341,55 @@ def _on_remove_file(self, button, file_path):
 def _on_remove_file_response(self, response, file_data, file_path):
     if response == "remove":
         self.cancel_flag = True
-        if self.current_proc and self.current_proc.poll() is None:
-            try:
-                self.current_proc.terminate()
-                self.current_proc.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self.current_proc.kill()
+        self._stop_all_procs(wait=True)
         self._remove_single_file(file_data, file_path)
 
 def _remove_single_file(self, file_data, file_path):
-    self.files_group.remove(file_data['row'])
-    self.progress_items.remove(file_data)
-    for i in range(self.audio_store.get_n_items() - 1, -1, -1):
-        if self.audio_store.get_string(i) == file_path:
-            self.audio_store.splice(i, 1, [])
-            break
+    self.progress_items.remove(file_path)
+    self.journal.remove(file_path)
+    self._schedule_queue_total()
     if not self.progress_items:
         self._show_no_files_message()
 
 def _show_no_files_message(self):
     pass
 
+def _show_media_info(self, file_data, info):
+    file_data['media'] = info
+    tip = info.describe()
+    if info.duration:
+        core = self._get_model_name()
+        jobs = max(1, int(getattr(self, 'parallel_jobs', 1)))
+        rate = self.speed.rate(core, whisper_layout(jobs, self.tuning.get(core))[0])
+        if rate:
+            tip += f"\n≈ {fmt_secs(info.duration / rate)} to transcribe with {self._display_name(core)}"
+    file_data['info_tip'] = tip.strip() or None
+    self._sync_row(file_data)
+    self._schedule_queue_total()
+    return False
+
+def _schedule_queue_total(self):
+    """Refresh the queue total at most a few times a second."""
+    if not getattr(self, '_queue_total_source', None):
+        self._queue_total_source = GLib.timeout_add(250, self._update_queue_total)
+
+def _update_queue_total(self):
+    self._queue_total_source = None
+    known = [fd['media'].duration for fd in self.progress_items if fd.get('media')]
+    if not self.progress_items:
+        text = "Review files to be transcribed"
+    else:
+        text = f"{len(self.progress_items)} file(s)"
+        if known:
+            text += f" · {fmt_secs(sum(known))} of audio"
+        if len(known) < len(self.progress_items):
+            text += f" (measuring {len(self.progress_items) - len(known)}…)"
+    self.files_group.set_description(text)
+    return False
+
 def show_file_details(self, file_data):
-    return
+    if file_data['log'] or file_data['buffer']:
+        self._show_text_buffer_window(file_data['filename'], self._log_buffer(file_data))
 
 # ui.py  – replace the whole function
 
@@ -280,6 +402,8 @@ def _show_text_buffer_window(self, title: str,
     closed so repeated opens do not accumulate RAM or signal handlers.
     """
     overlay_root: Gtk.Overlay = self.content_overlay
+    GtkSource = _gtk_source()
+    _install_overlay_css()
 
     # ── 1.   tear down any previous viewer/backdrop first ──────────────
     for attr in ("_textbuf_overlay", "_backdrop_overlay"):
@@ -525,22 +649,16 @@ def _show_file_content(self, file_data):
             # derive it from the original audio filename
             out_dir = getattr(self, 'output_directory',
                               os.path.expanduser("~/Downloads"))
-            base = os.path.splitext(os.path.basename(file_data['path']))[0] + "_transcribed.txt"
-            dest = os.path.join(out_dir, base)
+            dest = transcript_dest(out_dir, file_data['path'])
 
         if not os.path.isfile(dest):
             self._error("No transcription content available.")
             return
 
         # rebuild a fresh buffer from disk
-        import gi
-        gi.require_version("GtkSource", "5")
-        from gi.repository import GtkSource
-        buf = GtkSource.Buffer()
-        self._ensure_highlight_tag(buf)
         try:
             with open(dest, "r", encoding="utf-8") as fh:
-                buf.set_text(fh.read())
+                buf = self._new_source_buffer(fh.read())
             file_data['buffer'] = buf      # cache for next time
         except Exception as e:
             self._error(f"Failed to load transcript: {e}")
@@ -622,39 +740,33 @@ def create_output_widget(self, data):
     return scrolled
 
 def update_file_status(self, file_data, status, message=""):
-    row, old_icon, remove_btn = file_data['row'], file_data['icon'], file_data['remove_btn']
-
-    if old_icon and old_icon.get_parent():
-        row.remove(old_icon)
-
-    if status == 'processing':
-        new_icon = Gtk.Spinner()
-        new_icon.set_spinning(True)
-    else:
-        icon_name = {
-            'waiting':   None,
-            'completed': None,
-            'cancelled': 'process-stop-symbolic',
-            'error':     'dialog-error-symbolic',
-            'skipped':   'dialog-information-symbolic',
-        }.get(status, None)          # ← default is also None
-        new_icon = Gtk.Image.new_from_icon_name(icon_name) if icon_name else Gtk.Image()
-
-    if remove_btn.get_parent():
-        row.remove(remove_btn)
-    row.add_suffix(new_icon)
-    row.add_suffix(remove_btn)
-
-    file_data['icon'] = new_icon
     file_data['status'] = status
+    self.journal.set_status(file_data['path'], status)
     # NB: during processing we overwrite the subtitle live from _worker,
     # so here we only set an initial value or the final result.
-    row.set_subtitle(message or status.title())
+    file_data['subtitle'] = message or status.title()
+    self._sync_row(file_data)
+
+# The per-file log is only a live tail; the transcript itself is
+# streamed to disk by the worker (see transcript_writer.py).
+LOG_TAIL_LINES = 500
+
+def _log_buffer(self, file_data):
+    """The text buffer of *file_data*'s log, made from its ring on first use."""
+    if file_data['buffer'] is None:
+        log = file_data['log']
+        file_data['buffer'] = self._new_source_buffer("\n".join(log) + "\n" if log else "")
+    return file_data['buffer']
 
 def add_log_text(self, file_data, text):
-    if file_data['buffer']:
-        end_iter = file_data['buffer'].get_end_iter()
-        file_data['buffer'].insert(end_iter, text + "\n")
+    file_data['log'].extend(text.split("\n"))
+    buf = file_data['buffer']               # only once the log was opened
+    if buf:
+        buf.insert(buf.get_end_iter(), text + "\n")
+        extra = buf.get_line_count() - 1 - LOG_TAIL_LINES
+        if extra > 0:
+            _, cut = buf.get_iter_at_line(extra)
+            buf.delete(buf.get_start_iter(), cut)
 
 def on_about(self, action, param):
     about = Adw.AboutWindow(
@@ -791,6 +903,7 @@ def _build_ui(self):
     menu = Gio.Menu()
     menu.append("Timestamps", "app.toggle-timestamps")
     menu.append("Clear All Audio", "app.remove-all-audio")
+    menu.append("Estimate Time", "app.plan")
     menu.append("Settings", "app.settings")
     menu.append("About", "app.about")
     menu_button.set_menu_model(menu)
@@ -798,6 +911,7 @@ def _build_ui(self):
     self.create_action("about", self.on_about)
     self.create_action("settings", self.on_settings)
     self.create_action("remove-all-audio", self.on_remove_audio)
+    self.create_action("plan", self.on_plan)
     toggle_timestamps_action = Gio.SimpleAction.new_stateful(
         "toggle-timestamps", None, GLib.Variant.new_boolean(self.ts_enabled)
     )
@@ -866,9 +980,10 @@ def _on_browse_out_response(self, dialog, result):
                 self.output_value_label.set_label(_hp(self.output_directory))
 
             # ── NEW: refresh Transcripts pane right away ────────────────
-            scan_text = self.search_entry.get_text().strip() if self.search_entry else ""
-            # this spawns the background scan thread and rebuilds rows
-            self._spawn_scan_thread(scan_text)
+            # (not built yet → it scans the new folder when first shown)
+            if self.search_entry:
+                # this spawns the background scan thread and rebuilds rows
+                self._spawn_scan_thread(self.search_entry.get_text().strip())
     except GLib.Error:
         pass
 
@@ -877,7 +992,7 @@ def _setup_dnd(self):
     list_target = Gtk.DropTarget.new(type=Gdk.FileList,
                                      actions=Gdk.DragAction.COPY)
     list_target.connect("drop", self._on_dnd_drop)
-    self.files_group.add_controller(list_target)
+    self.files_view.add_controller(list_target)
 
     # (b) NEW: accept drops anywhere on the window
     win_target = Gtk.DropTarget.new(type=Gdk.FileList,
@@ -0,0 +1,98 @@
+# updates.py
+"""
+Coalesced UI updates from worker threads.
+
+A fast model on short files prints hundreds of lines and progress steps
+a second.  Instead of one ``GLib.idle_add`` per line and per percent,
+workers post into ``UiUpdates`` and a single main-loop callback per
+frame applies whatever is pending: each row's new log lines as one
+buffer insert, its latest status and subtitle, and the latest overall
+progress text.  Older values that were overwritten within a frame are
+never drawn.
+"""
+import threading
+
+from gi.repository import GLib
+
+FRAME_MS = 16               # ~60 Hz
+
+
+class UiUpdates:
+    def __init__(self, add_lines, set_status, set_subtitle, set_overall):
+        """
+        The appliers run on the main loop: *add_lines(file_data, text)*
+        with newline-joined lines, *set_status(file_data, status, message)*,
+        *set_subtitle(file_data, text)* and *set_overall(markup)*.
+        """
+        self._add_lines = add_lines
+        self._set_status = set_status
+        self._set_subtitle = set_subtitle
+        self._set_overall = set_overall
+        self._lock = threading.Lock()
+        self._rows = {}                 # id(file_data) → [file_data, lines, status, subtitle]
+        self._overall = None
+        self._scheduled = False
+        self.posted = 0                 # updates handed in …
+        self.frames = 0                 # … and main-loop callbacks that applied them
+
+    # ── workers ──────────────────────────────────────────────────
+    def line(self, file_data, text):
+        with self._lock:
+            self._row(file_data)[1].append(text)
+            self._post()
+
+    def subtitle(self, file_data, text):
+        with self._lock:
+            self._row(file_data)[3] = text
+            self._post()
+
+    def status(self, file_data, status, message=""):
+        with self._lock:
+            row = self._row(file_data)
+            row[2] = (status, message)
+            row[3] = None               # the status message replaces older progress
+            self._post()
+
+    def overall(self, markup):
+        with self._lock:
+            self._overall = markup
+            self._post()
+
+    def take_stats(self) -> tuple[int, int]:
+        """``(posted, frames)`` since the last call."""
+        with self._lock:
+            stats = (self.posted, self.frames)
+            self.posted = self.frames = 0
+        return stats
+
+    # ── main loop ────────────────────────────────────────────────
+    def _row(self, file_data):
+        # caller holds self._lock
+        row = self._rows.get(id(file_data))
+        if row is None:
+            row = self._rows[id(file_data)] = [file_data, [], None, None]
+        return row
+
+    def _post(self):
+        # caller holds self._lock
+        self.posted += 1
+        if not self._scheduled:
+            self._scheduled = True
+            GLib.timeout_add(FRAME_MS, self._flush)
+
+    def _flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, {}
+            overall, self._overall = self._overall, None
+            self._scheduled = False
+            self.frames += 1
+        for file_data, lines, status, subtitle in rows.values():
+            if lines:
+                self._add_lines(file_data, "\n".join(lines))
+            if status:
+                self._set_status(file_data, *status)
+            if subtitle is not None:
+                self._set_subtitle(file_data, subtitle)
+        if overall is not None:
+            self._set_overall(overall)
+        return False
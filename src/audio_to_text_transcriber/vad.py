@@ -0,0 +1,134 @@
+# vad.py
+"""
+Voice-activity pre-pass: find where a recording has speech so silence
+is never sent to whisper.
+
+With NumPy installed the audio is decoded once to 16 kHz mono PCM and
+classified in 30 ms frames by energy and zero-crossing rate, a block of
+frames at a time.  The threshold follows the recording's own noise
+floor, so a fan or tape hiss does not count as speech.  Without NumPy,
+ffmpeg's silencedetect at the fixed level used for chunking gives the
+same spans, a little coarser.
+
+``plan_speech`` turns the spans into ``chunking.Chunk``s, so speech is
+transcribed and stitched back onto the original timeline exactly like
+the parts of a split long recording.
+"""
+import subprocess
+
+from .chunking import Chunk, SILENCE_DB, SILENCE_MIN, detect_silences, plan_chunks
+
+try:
+    import numpy as np
+except ImportError:                 # optional – fall back to ffmpeg
+    np = None
+
+RATE          = 16000
+FRAME         = 480         # samples per frame (30 ms)
+BLOCK_FRAMES  = 2000        # frames decoded and classified at a time (60 s)
+FLOOR_PCT     = 10          # percentile of frame energy taken as the noise floor
+MARGIN_DB     = 10          # speech is this much louder than the floor …
+MIN_DB        = -50         # … but never quieter than this
+MAX_DB        = SILENCE_DB  # … and anything louder than this always counts
+FRICATIVE_DB  = 6           # s / f / sh: quieter, but many zero crossings
+FRICATIVE_ZCR = 0.25
+PAD           = 0.3         # seconds kept around every span
+MIN_GAP       = 3.0         # shorter pauses are transcribed, not cut out
+MIN_SPEECH    = 0.25        # shorter isolated sounds (clicks) are dropped
+MOSTLY_SPEECH = 0.9         # above this share, cutting saves nothing
+
+
+def speech_spans(path: str, duration: float = 0.0) -> list[tuple[float, float]]:
+    """
+    ``(start, end)`` seconds of every run of speech in *path*, in order.
+    When the audio cannot be analysed the whole file counts as speech.
+    """
+    spans = _numpy_spans(path) if np is not None else None
+    if spans is None:
+        spans = _ffmpeg_spans(path, duration)
+    return spans
+
+
+def _numpy_spans(path):
+    try:
+        proc = subprocess.Popen(
+            ["ffmpeg", "-nostdin", "-v", "error", "-i", path,
+             "-ac", "1", "-ar", str(RATE), "-f", "s16le", "-"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+    # per-frame features only; the samples of one block at a time
+    levels, crossings = [], []
+    block = FRAME * 2 * BLOCK_FRAMES
+    rest = b""
+    with proc:
+        while True:
+            data = proc.stdout.read(block)
+            if not data:
+                break
+            data = rest + data
+            usable = len(data) - len(data) % (FRAME * 2)
+            rest = data[usable:]
+            if not usable:
+                continue
+            frames = np.frombuffer(data[:usable], dtype="<i2").reshape(-1, FRAME)
+            x = frames.astype(np.float32) / 32768.0
+            levels.append(10 * np.log10(np.mean(x * x, axis=1) + 1e-10))
+            crossings.append(np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1)
+                             / FRAME)
+    if proc.returncode != 0 or not levels:
+        return None
+
+    db, zcr = np.concatenate(levels), np.concatenate(crossings)
+    threshold = min(max(np.percentile(db, FLOOR_PCT) + MARGIN_DB, MIN_DB), MAX_DB)
+    speech = (db > threshold) | ((db > threshold - FRICATIVE_DB) & (zcr > FRICATIVE_ZCR))
+
+    # rising / falling edges of the speech mask → runs
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+    secs = FRAME / RATE
+    return [(float(a) * secs, float(b) * secs) for a, b in zip(edges[::2], edges[1::2])]
+
+
+def _ffmpeg_spans(path, duration):
+    silences = detect_silences(path, SILENCE_DB, SILENCE_MIN, duration)
+    end = duration or float("inf")
+    spans, pos = [], 0.0
+    for s, e in silences:
+        if s > pos:
+            spans.append((pos, s))
+        pos = max(pos, e)
+    if pos < end:
+        spans.append((pos, end))
+    return spans
+
+
+def plan_speech(duration: float, spans, chunk_secs: float = 0.0,
+                overlap: float = 0.0) -> list[Chunk]:
+    """
+    Chunks covering the speech in *spans*: pauses shorter than
+    ``MIN_GAP`` are kept, lone sounds shorter than ``MIN_SPEECH`` are
+    dropped and every piece is padded by ``PAD``.  With *chunk_secs*, a
+    long stretch of speech is split further like any long recording,
+    preferring its pauses as cut points.  No chunks means no speech.
+    """
+    end_of_file = duration or float("inf")
+    merged = []                             # [start, end, pauses inside]
+    for s, e in spans:
+        if merged and s - merged[-1][1] < MIN_GAP:
+            merged[-1][2].append((merged[-1][1], s))
+            merged[-1][1] = e
+        else:
+            merged.append([s, e, []])
+
+    chunks = []
+    for s, e, pauses in merged:
+        if e - s < MIN_SPEECH:
+            continue
+        start, end = max(0.0, s - PAD), min(end_of_file, e + PAD)
+        pauses = [(a - start, b - start) for a, b in pauses]
+        for c in plan_chunks(end - start, pauses, chunk_secs, overlap):
+            chunks.append(Chunk(start + c.start, start + c.end,
+                                start + c.keep_from, start + c.keep_to))
+    return chunks
@@ -6,28 +6,30 @@ import os, mmap
 import re
 import subprocess
 import threading
-import yaml
-import shutil
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
-gi.require_version("GtkSource", "5")
-from gi.repository import Gtk, GLib, Gio, Gdk, Adw, GObject, GtkSource
+from gi.repository import Gtk, GLib, Gio, Adw
 
-from .helpers import human_path as _hp
+from .helpers import human_path as _hp, TRANSCRIPT_SUFFIX
+
+# reading transcripts mostly waits on the disk, so a few more threads than cores
+SCAN_WORKERS    = min(8, max(4, 2 * (os.cpu_count() or 1)))
+SCAN_BATCH_SECS = 0.1       # matches found are shown at most this often
 
 def add_transcript_to_list(self, filename, file_path):
     # ‼️  Ignore duplicates completely
-    if file_path in self.transcript_paths:
+    if file_path in self.transcript_items:
         return
 
     # If the “no transcripts” placeholder is showing, remove it
     if self.no_transcripts_row and self.no_transcripts_row.get_parent():
-        self.transcripts_group.remove(self.no_transcripts_row)
+        self.transcripts_list.remove(self.no_transcripts_row)
         self.no_transcripts_row = None
 
-    if not self.transcripts_group:
-        raise RuntimeError("Transcripts group not initialized.")
+    if self.transcripts_list is None:
+        return              # pane not built yet – its first scan finds the file
 
     transcript_row = Adw.ActionRow()
     transcript_row.set_title(filename)
@@ -49,23 +51,20 @@ def add_transcript_to_list(self, filename, file_path):
         'view':   None,
         'is_viewed': False
     }
-    self.transcript_items.append(transcript_data)
-    self.transcript_paths.add(file_path)
+    self.transcript_items[file_path] = transcript_data
 
     transcript_row.set_activatable(True)
     transcript_row.connect('activated', lambda r: self._show_transcript_content(transcript_data))
-    self.transcripts_group.add(transcript_row)
+    self.transcripts_list.append(transcript_row)      # kept in name order by its sort func
     return transcript_data
 
 def _show_transcript_content(self, transcript_data):
     # Always build a *new* buffer so nothing lingers in memory
-    buf = GtkSource.Buffer()
-    self._ensure_highlight_tag(buf)
     try:
         with open(transcript_data['path'], 'r', encoding='utf-8') as fh:
-            buf.set_text(fh.read())
+            buf = self._new_source_buffer(fh.read())
     except Exception as e:
-        buf.set_text(f"Error loading transcript: {e}")
+        buf = self._new_source_buffer(f"Error loading transcript: {e}")
 
     # # Show it (garbage‑collects automatically when the overlay closes)
     # self._show_text_buffer_window(transcript_data['filename'], buf)
@@ -171,6 +170,7 @@ def on_search_changed(self, entry: Gtk.SearchEntry):
 def _spawn_scan_thread(self, search_text):
     if self._scan_thread and self._scan_thread.is_alive():
         self._scan_cancel.set()         # tell old one to stop
+    self._sync_transcript_index(self.output_directory or os.path.expanduser("~/Downloads"))
     self._scan_cancel = threading.Event()
     self._scan_thread = threading.Thread(
         target=self._update_transcripts_list,
@@ -179,85 +179,159 @@ def _spawn_scan_thread(self, search_text):
     )
     self._scan_thread.start()
 
+# ── search index: kept current by a monitor on the output folder ──────────
+def _sync_transcript_index(self, out_dir):
+    """Watch *out_dir* and index it in the background, once per session."""
+    index = self.transcript_index
+    if not index.available:
+        return
+    if self._index_monitor and self._index_monitor[0] != out_dir:
+        # output folder was changed: the old one goes unwatched from now on
+        old_dir, monitor = self._index_monitor
+        monitor.cancel()
+        index.invalidate(old_dir)
+        self._index_monitor = None
+    if self._index_monitor is None:
+        try:
+            monitor = Gio.File.new_for_path(out_dir).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except GLib.Error as e:
+            # without a monitor, changes on disk would go unnoticed – keep scanning
+            print(f"Cannot watch {out_dir}: {e.message}")
+            return
+        monitor.connect("changed", self._on_output_dir_changed)
+        self._index_monitor = (out_dir, monitor)
+    if index.is_synced(out_dir) or (self._index_sync and self._index_sync.is_alive()):
+        return
+    self._index_sync = threading.Thread(target=index.sync, args=(out_dir,), daemon=True)
+    self._index_sync.start()
+
+def _on_output_dir_changed(self, _monitor, file, other_file, event):
+    for f in (file, other_file):
+        path = f.get_path() if f else None
+        if path and path.endswith(TRANSCRIPT_SUFFIX):
+            self._index_pending.add(path)
+    if self._index_pending and not self._index_flush:
+        self._index_flush = GLib.timeout_add(500, self._flush_index_updates)
+
+def _flush_index_updates(self):
+    paths, self._index_pending = self._index_pending, set()
+    self._index_flush = 0
+    index = self.transcript_index
+    threading.Thread(target=lambda: [index.update(p) for p in sorted(paths)],
+                     daemon=True).start()
+    return False
+
 def _update_transcripts_list(
         self,
         search_text: str,
         cancel_evt: threading.Event      # ← new
     ):
     """
-    Build *matches* quickly and memory‑efficiently.
+    Answer from the search index when it is current for the output
+    folder, otherwise scan the files (see _scan_transcripts).
+    """
+    out_dir = self.output_directory or os.path.expanduser("~/Downloads")
+    try:
+        matches = self.transcript_index.search(out_dir, search_text)
+    except Exception as e:
+        print(f"Search index failed, scanning instead: {e}")
+        matches = None
+    if matches is None:
+        self._scan_transcripts(out_dir, search_text, cancel_evt)
+    elif not cancel_evt.is_set():
+        GLib.idle_add(self._show_transcript_matches, cancel_evt, matches, matches)
+
+def _scan_transcripts(self, out_dir, search_text, cancel_evt):
+    """
+    Find the transcripts whose name or text contains *search_text*
+    (case-insensitive) and stream them to _show_transcript_matches.
 
     • No recursion – all “*_transcribed.txt” files live directly in the
       output directory.
-    • If search_text is empty → keep every transcript.
-    • Otherwise:
-        1.  Keep the file immediately if its **name** contains the term.
-        2.  Fallback: stream‑scan the file in 8‑KB chunks (no full read).
+    • Name hits (everything, for an empty search) are shown at once.
+    • The other files are mmap-scanned by a thread pool; matches go to
+      the UI every SCAN_BATCH_SECS as they turn up.
+    • Setting *cancel_evt* stops the scan: files not read yet are
+      skipped and nothing more reaches the UI.
     """
-    out_dir = self.output_directory or os.path.expanduser("~/Downloads")
-    matches: list[str] = []
     hay = search_text.lower() if search_text else ""
-    hay_bytes  = hay.encode()
-
+    pattern = re.compile(re.escape(hay.encode()), re.IGNORECASE)
+    found, batch = [], []
+    last_push = time.monotonic()
+
+    def _push(done=False):
+        nonlocal batch, last_push
+        if batch or done:
+            GLib.idle_add(self._show_transcript_matches, cancel_evt, batch,
+                          found if done else None)
+        batch, last_push = [], time.monotonic()
+
+    def _contains(path):
+        if cancel_evt.is_set():
+            return False
+        try:
+            with open(path, "rb", 0) as fh, \
+                 mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pattern.search(mm) is not None
+        except (OSError, ValueError):
+            # unreadable (or empty – mmap refuses those) file → silently skip
+            return False
+
+    to_read = []
     try:
         for entry in os.scandir(out_dir):
-            if cancel_evt.is_set(): return   
-            if not entry.name.endswith("_transcribed.txt"):
+            if not entry.name.endswith(TRANSCRIPT_SUFFIX):
                 continue
-
-            # ① empty search → accept all
-            if not hay:
-                matches.append(entry.path)
-                continue
-
-            # ② filename hit → accept
             if hay in entry.name.lower():
-                matches.append(entry.path)
-                continue
-
-            # ③ slow path: stream‑scan file contents
-            try:
-                with open(entry.path, "rb", 0) as fh, \
-                     mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                    # Compile once per scan and re‑use for every file
-                    if '_ci_pat' not in locals():
-                        import re
-                        _ci_pat = re.compile(re.escape(hay_bytes), re.IGNORECASE)
-
-                    if _ci_pat.search(mm):           # ← case‑insensitive
-                        matches.append(entry.path)
-            except OSError:
-                # unreadable file → silently skip
-                pass
-
-    except Exception as e:
+                found.append(entry.path)
+                batch.append(entry.path)
+            else:
+                to_read.append(entry.path)
+    except OSError as e:
         GLib.idle_add(self._error, f"Failed to scan transcripts: {e}")
         return
+    _push()
 
-    # Push UI update onto the main loop
-    GLib.idle_add(self._rebuild_transcript_rows, matches)
-
-
-def _rebuild_transcript_rows(self, matches: list[str]):
-    # 1. Remove rows we previously inserted
-    for t in self.transcript_items:
-        if t['row'].get_parent():
-            self.transcripts_group.remove(t['row'])
-    self.transcript_items.clear()
-    self.transcript_paths.clear()
+    pool = ThreadPoolExecutor(SCAN_WORKERS, thread_name_prefix="transcript-scan")
+    try:
+        futures = {pool.submit(_contains, path): path for path in to_read}
+        for future in as_completed(futures):
+            if cancel_evt.is_set():
+                return
+            if future.result():
+                found.append(futures[future])
+                batch.append(futures[future])
+            if batch and time.monotonic() - last_push >= SCAN_BATCH_SECS:
+                _push()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    if not cancel_evt.is_set():
+        _push(done=True)
+
+
+def _show_transcript_matches(self, scan, paths, final):
+    """
+    Add the rows for *paths* found by *scan*; once it is done, *final*
+    holds all its matches and rows for anything else are removed.  Rows
+    that still match stay where they are, so the list is updated in
+    place rather than rebuilt.
+    """
+    if scan is not self._scan_cancel or scan.is_set():
+        return False                     # a newer search took over
+    for path in paths:
+        self.add_transcript_to_list(os.path.basename(path), path)
+    if final is None:
+        return False
 
-    if self.no_transcripts_row and self.no_transcripts_row.get_parent():
-        self.transcripts_group.remove(self.no_transcripts_row)
-    self.no_transcripts_row = None
+    keep = set(final)
+    for path in [p for p in self.transcript_items if p not in keep]:
+        self.transcripts_list.remove(self.transcript_items.pop(path)['row'])
 
-    # 2. Show placeholder or rebuild rows
-    if not matches:
+    if not self.transcript_items and not self.no_transcripts_row:
         self.no_transcripts_row = Adw.ActionRow()
         self.no_transcripts_row.set_title("No transcripts found")
         out_dir = self.output_directory or os.path.expanduser("~/Downloads")
         self.no_transcripts_row.set_subtitle(f"No \"_transcribed.txt\" files in {_hp(out_dir)}")
-        self.transcripts_group.add(self.no_transcripts_row)
-        return
-
-    for path in sorted(matches):
-        self.add_transcript_to_list(os.path.basename(path), path)
+        self.transcripts_list.append(self.no_transcripts_row)
+    return False
@@ -0,0 +1,124 @@
+# watch.py
+"""
+Watched input folders.
+
+Every folder (and each of its subfolders) gets a ``Gio.FileMonitor``,
+so the app hears about new files through inotify instead of rescanning
+the tree.  A recorder may still be writing when a file first appears;
+it is only handed on once its size and modification time have not
+changed for ``SETTLE_SECS``.  Hidden files (``.name.part`` and the like,
+which copy tools rename when they are done) are ignored until renamed.
+"""
+import os
+import time
+
+from gi.repository import Gio, GLib
+
+from .helpers import AUDIO_EXTS
+
+SETTLE_SECS = 2.0           # unchanged this long = finished writing
+POLL_MS     = 500
+
+_ARRIVED = {Gio.FileMonitorEvent.CREATED, Gio.FileMonitorEvent.CHANGED,
+            Gio.FileMonitorEvent.CHANGES_DONE_HINT, Gio.FileMonitorEvent.MOVED_IN}
+_GONE    = {Gio.FileMonitorEvent.DELETED, Gio.FileMonitorEvent.MOVED_OUT}
+
+
+def _is_audio(path: str) -> bool:
+    name = os.path.basename(path)
+    return not name.startswith(".") and name.lower().endswith(AUDIO_EXTS)
+
+
+class FolderWatcher:
+    def __init__(self, folders, on_ready):
+        """*on_ready(paths)* runs on the main loop with files that settled."""
+        self.folders = [f for f in folders if os.path.isdir(f)]
+        self._on_ready = on_ready
+        self._monitors = {}             # directory → Gio.FileMonitor
+        self._settling = {}             # path → ((size, mtime), unchanged since)
+        self._poll = 0
+
+    def start(self):
+        """Watch every folder; audio already in them is reported too."""
+        for folder in self.folders:
+            self._add_tree(folder)
+
+    def stop(self):
+        for monitor in self._monitors.values():
+            monitor.cancel()
+        self._monitors.clear()
+        self._settling.clear()
+        if self._poll:
+            GLib.source_remove(self._poll)
+            self._poll = 0
+
+    # ── inotify ──────────────────────────────────────────────────
+    def _add_tree(self, top):
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            self._watch_dir(root)
+            for name in files:
+                self._track(os.path.join(root, name))
+
+    def _watch_dir(self, path):
+        if path in self._monitors:
+            return
+        try:
+            monitor = Gio.File.new_for_path(path).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except GLib.Error as e:
+            print(f"Cannot watch {path}: {e.message}")
+            return
+        monitor.connect("changed", self._on_changed)
+        self._monitors[path] = monitor
+
+    def _on_changed(self, _monitor, file, other_file, event):
+        if event == Gio.FileMonitorEvent.RENAMED:
+            self._forget(file.get_path())
+            file, event = other_file, Gio.FileMonitorEvent.MOVED_IN
+        path = file.get_path() if file else None
+        if not path:
+            return
+        if event in _GONE:
+            self._forget(path)
+        elif event in _ARRIVED:
+            if os.path.isdir(path):
+                if event in (Gio.FileMonitorEvent.CREATED, Gio.FileMonitorEvent.MOVED_IN):
+                    self._add_tree(path)    # files may have landed before its monitor
+            else:
+                self._track(path)
+
+    def _forget(self, path):
+        self._settling.pop(path, None)
+        monitor = self._monitors.pop(path, None)
+        if monitor:
+            monitor.cancel()
+
+    # ── settling ─────────────────────────────────────────────────
+    def _track(self, path):
+        if not _is_audio(path):
+            return
+        self._settling[path] = (None, time.monotonic())
+        if not self._poll:
+            self._poll = GLib.timeout_add(POLL_MS, self._check)
+
+    def _check(self):
+        now, ready = time.monotonic(), []
+        for path, (seen, since) in list(self._settling.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._settling[path]
+                continue
+            state = (st.st_size, st.st_mtime_ns)
+            if state != seen:
+                self._settling[path] = (state, now)
+            elif st.st_size and now - since >= SETTLE_SECS:
+                del self._settling[path]
+                ready.append(path)
+        if ready:
+            self._on_ready(sorted(ready))
+        if not self._settling:
+            self._poll = 0
+            return False
+        return True
@@ -0,0 +1,172 @@
+# whisper_server.py
+"""
+Resident whisper.cpp engine.
+
+``whisper-cli`` re-reads the whole ggml model for every file.  The
+``whisper-server`` example that is built alongside it keeps the model in
+memory and answers ``POST /inference`` requests, so we start one per
+model (per worker slot) and feed it files over a loopback HTTP socket.
+"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+import uuid
+
+from .segments import Segment, render
+
+READY_TIMEOUT = 120      # seconds – large models take a while to load
+CHUNK = 1 << 16
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def format_segments(segments, timestamps: bool = True) -> list[str]:
+    """Render ``verbose_json`` segments as whisper-cli stdout lines."""
+    return render((Segment(s["start"], s["end"], s.get("text") or "") for s in segments),
+                  timestamps)
+
+
+class WhisperServerError(RuntimeError):
+    pass
+
+
+class WhisperServer:
+    """
+    One long-lived ``whisper-server`` process with the model preloaded.
+
+    ``transcribe`` is safe to call repeatedly; if the process has died
+    (crash, OOM, user cancel) it is started again transparently and the
+    request is retried once.  *on_start(proc)*, when set, is called with
+    every process the server launches, before the model has loaded.
+    """
+
+    def __init__(self, bin_path, model_path, threads=None, host="127.0.0.1", processors=1,
+                 prefix=(), on_start=None):
+        self.bin_path   = bin_path
+        self.model_path = model_path
+        self.threads    = threads
+        self.processors = processors
+        self.prefix     = list(prefix)      # nice / ionice / taskset
+        self.on_start   = on_start
+        self.host       = host
+        self.port       = None
+        self.proc       = None
+        self._lock      = threading.Lock()
+
+    # ── lifecycle ────────────────────────────────────────────────
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        self.stop()
+        self.port = _free_port()
+        cmd = [*self.prefix, self.bin_path, "-m", self.model_path,
+               "--host", self.host, "--port", str(self.port), "--convert"]
+        if self.threads:
+            cmd += ["-t", str(self.threads)]
+        if self.processors > 1:
+            cmd += ["-p", str(self.processors)]
+        self.proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        if self.on_start:
+            self.on_start(self.proc)
+        self._wait_ready()
+
+    def _wait_ready(self):
+        deadline = time.time() + READY_TIMEOUT
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                raise WhisperServerError(
+                    f"whisper-server exited during start-up (code {self.proc.returncode})")
+            try:
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=1)
+                conn.request("GET", "/")
+                ok = conn.getresponse().status < 500
+                conn.close()
+                if ok:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.1)
+        self.stop()
+        raise WhisperServerError("whisper-server did not become ready in time")
+
+    def stop(self):
+        proc, self.proc = self.proc, None
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    # ── requests ─────────────────────────────────────────────────
+    def transcribe(self, audio_path, timestamps=True, cancelled=None) -> list[str]:
+        """
+        Return the transcript of *audio_path* as whisper-cli style lines.
+        *cancelled* is polled before an automatic restart so a process
+        killed on purpose is not brought straight back.
+        """
+        with self._lock:
+            for attempt in (1, 2):
+                if not self.alive():
+                    self.start()
+                try:
+                    result = self._post_inference(audio_path)
+                    return format_segments(result.get("segments", []), timestamps)
+                except (OSError, http.client.HTTPException, ValueError):
+                    # connection dropped → the server most likely crashed
+                    if attempt == 2 or self.alive() or (cancelled and cancelled()):
+                        raise
+        return []
+
+    def _post_inference(self, audio_path) -> dict:
+        boundary = uuid.uuid4().hex
+        name = os.path.basename(audio_path).replace('"', "_")
+        head = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="response_format"\r\n\r\n'
+            "verbose_json\r\n"
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        size = len(head) + os.path.getsize(audio_path) + len(tail)
+
+        def _body():
+            yield head
+            with open(audio_path, "rb") as fh:
+                while chunk := fh.read(CHUNK):
+                    yield chunk
+            yield tail
+
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=None)
+        try:
+            conn.request("POST", "/inference", body=_body(), headers={
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Content-Length": str(size),
+            })
+            resp = conn.getresponse()
+            data = resp.read()
+        finally:
+            conn.close()
+        if resp.status != 200:
+            raise WhisperServerError(
+                f"whisper-server returned HTTP {resp.status}: {data[:200]!r}")
+        result = json.loads(data)
+        if "error" in result:
+            raise WhisperServerError(str(result["error"]))
+        return result